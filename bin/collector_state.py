@@ -0,0 +1,235 @@
+"""
+MediaMTX Monitor - collector measurement state.
+
+Keeps previous counters, timestamps, EWMA values, and lifecycle state in the
+collector process between cycles. Redis is the checkpoint that survives a
+restart: unknown keys are rehydrated with one planned read, and changed state is
+written back on a configurable cadence instead of every cycle.
+
+Responsibilities:
+- Serve state keys from memory with Redis-compatible expiry semantics.
+- Rehydrate unknown planned keys from one MGET result.
+- Provide the small get/set/delete/pipeline interface used by metric modules.
+- Queue dirty state and short-history samples for one write pipeline.
+- Queue history windows for one batch summary per cycle.
+- Queue closed rollup buckets for the same write pipeline.
+
+Does not:
+- Build Redis keys, calculate metrics, or serialize history samples.
+- Decide when a checkpoint is due; the collector owns that cadence.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_TTL_SECONDS = 300
+
+
+class ConnectionStateCache:
+    """In-process measurement state with deferred Redis checkpoints."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        default_ttl: int = DEFAULT_STATE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._redis = redis_client
+        self._default_ttl = default_ttl
+        self._clock = clock
+        # key -> (value, absolute expiry); ``None`` values are known-absent keys.
+        self._entries: dict[str, tuple[Any, Optional[float]]] = {}
+        self._dirty: set[str] = set()
+        self.miss_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, key: str, now: float) -> Optional[tuple[Any, Optional[float]]]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= now:
+            del self._entries[key]
+            self._dirty.discard(key)
+            return None
+        return entry
+
+    def unknown_keys(self, keys: Iterable[str]) -> list[str]:
+        """Return keys that must be rehydrated from Redis before use."""
+        now = self._clock()
+        return [key for key in keys if self._entry(key, now) is None]
+
+    def load(self, keys: Sequence[str], values: Sequence[Any]) -> None:
+        """Accept the ordered result of one MGET for unknown state keys."""
+        # MGET carries no TTL, so rehydrated values are re-read after the
+        # default state lifetime instead of being kept forever.
+        expires_at = self._clock() + self._default_ttl
+        for key, value in zip(keys, values):
+            self._entries[key] = (value, expires_at)
+            self._dirty.discard(key)
+
+    def get(self, key: str) -> Any:
+        now = self._clock()
+        entry = self._entry(key, now)
+        if entry is None:
+            # Unplanned keys stay correct at the cost of one extra round trip.
+            self.miss_count += 1
+            logger.debug("Unplanned collector state read: %s", key)
+            entry = (self._redis.get(key), now + self._default_ttl)
+            self._entries[key] = entry
+        return entry[0]
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> None:
+        # Redis returns decoded strings, so later reads from memory do too.
+        expires_at = self._clock() + ex if ex is not None else None
+        self._entries[key] = (str(value), expires_at)
+        self._dirty.add(key)
+
+    def delete(self, *keys: str) -> int:
+        # Deleted keys stay known-absent until the checkpoint has removed them
+        # from Redis, then ``purge_expired()`` drops them like ended state.
+        expires_at = self._clock() + self._default_ttl
+        for key in keys:
+            self._entries[key] = (None, expires_at)
+            self._dirty.add(key)
+        return len(keys)
+
+    def pipeline(self) -> "_StatePipeline":
+        return _StatePipeline(self)
+
+    def purge_expired(self) -> int:
+        """Drop expired entries so ended connections do not accumulate."""
+        now = self._clock()
+        expired = [
+            key
+            for key, (_value, expires_at) in self._entries.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+            self._dirty.discard(key)
+        return len(expired)
+
+    def checkpoint_into(self, pipeline: Any) -> list[str]:
+        """Queue dirty state on a pipeline and return the covered keys.
+
+        Values keep their remaining lifetime, so Redis expires a checkpointed
+        key no later than the in-process copy would.
+        """
+        now = self._clock()
+        deletes: list[str] = []
+        checkpointed: list[str] = []
+        for key in sorted(self._dirty):
+            entry = self._entry(key, now)
+            if entry is None:
+                continue
+            value, expires_at = entry
+            checkpointed.append(key)
+            if value is None:
+                deletes.append(key)
+                continue
+            ttl = None
+            if expires_at is not None:
+                ttl = max(1, math.ceil(expires_at - now))
+            pipeline.set(key, value, ex=ttl)
+        if deletes:
+            pipeline.delete(*deletes)
+        self._dirty.clear()
+        return checkpointed
+
+    def mark_dirty(self, keys: Iterable[str]) -> None:
+        """Re-queue keys whose checkpoint could not be written."""
+        self._dirty.update(key for key in keys if key in self._entries)
+
+
+class CycleState:
+    """Measurement state of one collector cycle backed by the state cache."""
+
+    def __init__(
+        self, redis_client: Any, cache: Optional[ConnectionStateCache] = None
+    ) -> None:
+        self.cache = cache if cache is not None else ConnectionStateCache(redis_client)
+        self.history_samples: list[tuple[str, dict[str, Any]]] = []
+        self.window_summaries: list[
+            tuple[dict[str, Any], list[Any], float, Optional[Callable[[], None]]]
+        ] = []
+        self.rollup_records: list[tuple[str, Any, dict[str, Any]]] = []
+        self._miss_count_at_start = self.cache.miss_count
+
+    @property
+    def miss_count(self) -> int:
+        """Unplanned state reads that happened during this cycle."""
+        return self.cache.miss_count - self._miss_count_at_start
+
+    def unknown_keys(self, keys: Iterable[str]) -> list[str]:
+        return self.cache.unknown_keys(keys)
+
+    def load(self, keys: Sequence[str], values: Sequence[Any]) -> None:
+        self.cache.load(keys, values)
+
+    def get(self, key: str) -> Any:
+        return self.cache.get(key)
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> None:
+        self.cache.set(key, value, ex=ex)
+
+    def delete(self, *keys: str) -> int:
+        return self.cache.delete(*keys)
+
+    def pipeline(self) -> "_StatePipeline":
+        return self.cache.pipeline()
+
+    def queue_history_sample(self, key: str, sample: dict[str, Any]) -> None:
+        """Defer one short-history append until the cycle write pipeline."""
+        self.history_samples.append((key, sample))
+
+    def queue_window_summary(
+        self,
+        connection: dict[str, Any],
+        samples: list[Any],
+        timestamp: float,
+        on_window_metrics: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Defer one window summary so the cycle can summarize them as a batch."""
+        self.window_summaries.append(
+            (connection, samples, timestamp, on_window_metrics)
+        )
+
+    def queue_rollup_record(
+        self, connection_key: str, tier: Any, record: dict[str, Any]
+    ) -> None:
+        """Defer one closed rollup bucket until the cycle write pipeline."""
+        self.rollup_records.append((connection_key, tier, record))
+
+
+class _StatePipeline:
+    """Apply the pipeline calls used by metric modules to the state cache."""
+
+    def __init__(self, cache: ConnectionStateCache) -> None:
+        self._cache = cache
+        self._operations: list[tuple[str, Any, Optional[int]]] = []
+
+    def set(
+        self, key: str, value: Any, ex: Optional[int] = None
+    ) -> "_StatePipeline":
+        self._operations.append((key, value, ex))
+        return self
+
+    def execute(self) -> list[bool]:
+        for key, value, ttl in self._operations:
+            self._cache.set(key, value, ex=ttl)
+        results = [True] * len(self._operations)
+        self._operations.clear()
+        return results
+
+
+def unique_keys(keys: Iterable[str]) -> list[str]:
+    """Return keys once each while preserving their planned order."""
+    return list(dict.fromkeys(keys))
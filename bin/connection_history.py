@@ -4,12 +4,20 @@ MediaMTX Monitor - short connection history.
 Builds compact samples from normalized publisher and reader connections.
 History is live-only and intentionally limited to about one minute; it neither
 defines the current snapshot nor infers reconnects or connection lifecycle.
+The windows of all connections of a cycle can be summarized as one batch,
+vectorized with NumPy when it is installed.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field as dataclass_field
 import math
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # Optional speedup; the pure-Python summarizer is always used.
+    numpy = None
 
 
 HISTORY_RETENTION_SECONDS = 65
@@ -29,6 +37,9 @@ _PROTOCOL_COUNTERS_FIELD = "protocol_counter_deltas"
 _JITTER_FIELD = "jitter_ms"
 
 _WINDOW_SECONDS = (10, 60)
+# Below this many connections the per-array overhead outweighs vectorizing.
+VECTORIZED_MIN_CONNECTIONS = 16
+_PLAIN_NUMBER_TYPES = {int, float, type(None)}
 
 
 def build_history_sample(
@@ -77,20 +88,28 @@ def _numeric_values(
 ) -> list[float]:
     values = []
     for sample in samples:
-        value = sample.get(field)
-        if isinstance(value, (int, float)) and not isinstance(value, bool):
-            number = float(value)
-            if math.isfinite(number):
-                values.append(number)
+        number = _number(sample.get(field))
+        if number is not None:
+            values.append(number)
     return values
 
 
-def _percentile(values: list[float], percentile: float) -> float:
-    """Return a linearly interpolated percentile for one or more values."""
-    ordered = sorted(values)
+def _number(value: Any) -> float | None:
+    if value is None:
+        return None
+    if type(value) is float:
+        return value if math.isfinite(value) else None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+        if math.isfinite(number):
+            return number
+    return None
+
+
+def _interpolate(ordered: list[float], fraction: float) -> float:
     if len(ordered) == 1:
         return ordered[0]
-    position = (len(ordered) - 1) * percentile
+    position = (len(ordered) - 1) * fraction
     lower = math.floor(position)
     upper = math.ceil(position)
     if lower == upper:
@@ -98,49 +117,185 @@ def _percentile(values: list[float], percentile: float) -> float:
     return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
 
 
+def percentile(values: list[float], fraction: float) -> float:
+    """Return a linearly interpolated percentile for one or more values."""
+    return _interpolate(sorted(values), fraction)
+
+
+def _p50_p95(values: list[float]) -> tuple[float, float]:
+    # One sort serves both percentiles.
+    ordered = sorted(values)
+    return _interpolate(ordered, 0.50), _interpolate(ordered, 0.95)
+
+
+@dataclass
+class WindowStats:
+    """Unrounded statistics of one summary window, in output order.
+
+    ``timing`` is ``(sample_count, p50, p95)``; ``jitter`` additionally carries
+    the newest value: ``(sample_count, current, p50, p95)``.
+    """
+
+    timing: Optional[tuple[int, float, float]] = None
+    events: dict[str, float] = dataclass_field(default_factory=dict)
+    frame_discard: Optional[float] = None
+    jitter: Optional[tuple[int, float, float, float]] = None
+    protocol_counters: dict[str, float] = dataclass_field(default_factory=dict)
+
+
+class _Window:
+    """Running values and sums of one summary window."""
+
+    __slots__ = (
+        "timing",
+        "events",
+        "frame_discard",
+        "jitter",
+        "counter_names",
+        "counters",
+    )
+
+    def __init__(self) -> None:
+        self.timing: list[float] = []
+        self.events: dict[str, float] = {}
+        self.frame_discard: float | None = None
+        self.jitter: list[float] = []
+        # Filled in sample order so iteration order matches a per-window set.
+        self.counter_names: set[str] = set()
+        self.counters: dict[str, float] = {}
+
+    def stats(self) -> WindowStats:
+        stats = WindowStats(
+            events={
+                field: self.events[field]
+                for field in _SRT_EVENT_FIELDS
+                if field in self.events
+            },
+            frame_discard=self.frame_discard,
+            protocol_counters=_ordered_counters(
+                self.counter_names, self.counters
+            ),
+        )
+        if self.timing:
+            stats.timing = (len(self.timing), *_p50_p95(self.timing))
+        if self.jitter:
+            stats.jitter = (
+                len(self.jitter), self.jitter[-1], *_p50_p95(self.jitter)
+            )
+        return stats
+
+
+def _ordered_counters(
+    names: set[str], counters: Mapping[str, float]
+) -> dict[str, float]:
+    return {name: counters[name] for name in names if name in counters}
+
+
+def _add_counters(sample: Mapping[str, Any], windows: list[_Window]) -> None:
+    counters = sample.get(_PROTOCOL_COUNTERS_FIELD, {}) or {}
+    for name in counters:
+        number = _number(counters.get(name))
+        for window in windows:
+            window.counter_names.add(name)
+            if number is not None:
+                window.counters[name] = window.counters.get(name, 0) + number
+
+
+def _add_sample(sample: Mapping[str, Any], windows: list[_Window]) -> None:
+    """Add one sample to every window it falls into, parsing each value once."""
+    number = _number(sample.get("transport_rtt_ms"))
+    if number is not None:
+        for window in windows:
+            window.timing.append(number)
+    for field in _SRT_EVENT_FIELDS:
+        number = _number(sample.get(field))
+        if number is not None:
+            for window in windows:
+                window.events[field] = window.events.get(field, 0) + number
+    number = _number(sample.get(_FRAME_DISCARD_FIELD))
+    if number is not None:
+        for window in windows:
+            window.frame_discard = (window.frame_discard or 0) + number
+    number = _number(sample.get(_JITTER_FIELD))
+    if number is not None:
+        for window in windows:
+            window.jitter.append(number)
+    _add_counters(sample, windows)
+
+
+def _window_targets(
+    sample: Mapping[str, Any],
+    windows: list[tuple[float, _Window]],
+    timestamp: float,
+) -> list[_Window]:
+    sample_timestamp = sample.get("timestamp")
+    if (
+        not isinstance(sample_timestamp, (int, float))
+        or sample_timestamp > timestamp
+    ):
+        return []
+    return [window for oldest, window in windows if sample_timestamp > oldest]
+
+
 def summarize_history(
     samples: list[Mapping[str, Any]], timestamp: float
 ) -> dict[str, Any]:
-    """Calculate optional 10- and 60-second timing and event summaries."""
-    timing_field = None
-    if any(sample.get("transport_rtt_ms") is not None for sample in samples):
-        timing_field = "transport_rtt_ms"
+    """Calculate optional 10- and 60-second timing and event summaries.
 
+    Samples are visited once; each window keeps running sums and collects the
+    values of its percentile fields, which are sorted once per field.
+    """
+    windows = [(timestamp - seconds, _Window()) for seconds in _WINDOW_SECONDS]
+    for sample in samples:
+        targets = _window_targets(sample, windows, timestamp)
+        if targets:
+            _add_sample(sample, targets)
+    return compose_summary([window.stats() for _oldest, window in windows])
+
+
+def compose_summary(stats: Sequence[WindowStats]) -> dict[str, Any]:
+    """Build the rounded ``window_metrics`` from the 10- and 60-second stats."""
     timing = {}
     events = {}
-    for seconds in _WINDOW_SECONDS:
+    frame_discard = {}
+    jitter = {}
+    protocol_counters = {}
+    for seconds, window in zip(_WINDOW_SECONDS, stats):
         window_name = f"{seconds}s"
-        window = [
-            sample
-            for sample in samples
-            if isinstance(sample.get("timestamp"), (int, float))
-            and sample["timestamp"] > timestamp - seconds
-            and sample["timestamp"] <= timestamp
-        ]
-
-        if timing_field is not None:
-            values = _numeric_values(window, timing_field)
-            if values:
-                p50 = round(_percentile(values, 0.50), 2)
-                p95 = round(_percentile(values, 0.95), 2)
-                timing[window_name] = {
-                    "sample_count": len(values),
-                    "p50_ms": p50,
-                    "p95_ms": p95,
-                    "variation_ms": round(p95 - p50, 2),
-                }
-
-        event_window = {}
-        for field in _SRT_EVENT_FIELDS:
-            values = _numeric_values(window, field)
-            if values:
-                event_window[field] = round(sum(values), 2)
-        if event_window:
-            events[window_name] = event_window
+        if window.timing is not None:
+            count, p50, p95 = window.timing
+            p50, p95 = round(p50, 2), round(p95, 2)
+            timing[window_name] = {
+                "sample_count": count,
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "variation_ms": round(p95 - p50, 2),
+            }
+        if window.events:
+            events[window_name] = {
+                field: round(value, 2) for field, value in window.events.items()
+            }
+        if window.frame_discard is not None:
+            frame_discard[window_name] = int(window.frame_discard)
+        if window.jitter is not None:
+            count, current, p50, p95 = window.jitter
+            p50, p95 = round(p50, 2), round(p95, 2)
+            jitter[window_name] = {
+                "sample_count": count,
+                "current_ms": round(current, 2),
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "variation_ms": round(p95 - p50, 2),
+            }
+        if window.protocol_counters:
+            protocol_counters[window_name] = {
+                name: int(value)
+                for name, value in window.protocol_counters.items()
+            }
 
     summary: dict[str, Any] = {}
     if timing:
-        summary["timing_source"] = timing_field
+        summary["timing_source"] = "transport_rtt_ms"
         summary["timing"] = timing
         if "10s" in timing and "60s" in timing:
             summary["p50_delta_ms"] = round(
@@ -148,60 +303,8 @@ def summarize_history(
             )
     if events:
         summary["events"] = events
-
-    frame_discard = {}
-    for seconds in _WINDOW_SECONDS:
-        values = _numeric_values(
-            [
-                sample
-                for sample in samples
-                if isinstance(sample.get("timestamp"), (int, float))
-                and sample["timestamp"] > timestamp - seconds
-                and sample["timestamp"] <= timestamp
-            ],
-            _FRAME_DISCARD_FIELD,
-        )
-        if values:
-            frame_discard[f"{seconds}s"] = int(sum(values))
     if frame_discard:
         summary["frame_discard"] = frame_discard
-
-    jitter = {}
-    protocol_counters = {}
-    for seconds in _WINDOW_SECONDS:
-        window_name = f"{seconds}s"
-        window = [
-            sample for sample in samples
-            if isinstance(sample.get("timestamp"), (int, float))
-            and sample["timestamp"] > timestamp - seconds
-            and sample["timestamp"] <= timestamp
-        ]
-        jitter_values = _numeric_values(window, _JITTER_FIELD)
-        if jitter_values:
-            p50 = round(_percentile(jitter_values, 0.50), 2)
-            p95 = round(_percentile(jitter_values, 0.95), 2)
-            jitter[window_name] = {
-                "sample_count": len(jitter_values),
-                "current_ms": round(jitter_values[-1], 2),
-                "p50_ms": p50,
-                "p95_ms": p95,
-                "variation_ms": round(p95 - p50, 2),
-            }
-        names = {
-            name
-            for sample in window
-            for name in (sample.get(_PROTOCOL_COUNTERS_FIELD, {}) or {})
-        }
-        values_by_name = {}
-        for name in names:
-            values = _numeric_values(
-                [sample.get(_PROTOCOL_COUNTERS_FIELD, {}) or {} for sample in window],
-                name,
-            )
-            if values:
-                values_by_name[name] = int(sum(values))
-        if values_by_name:
-            protocol_counters[window_name] = values_by_name
     if jitter:
         summary["jitter"] = jitter
     if protocol_counters:
@@ -209,6 +312,151 @@ def summarize_history(
     return summary
 
 
+def summarize_histories(
+    histories: Sequence[tuple[Sequence[Mapping[str, Any]], float]],
+    *,
+    vectorized: Optional[bool] = None,
+) -> list[dict[str, Any]]:
+    """Summarize many ``(samples, timestamp)`` histories, one result each.
+
+    With NumPy installed, batches of at least ``VECTORIZED_MIN_CONNECTIONS``
+    are reduced on stacked per-field arrays with connection offsets. Results
+    are identical to ``summarize_history()``, which serves as the fallback.
+    """
+    if vectorized is None:
+        vectorized = len(histories) >= VECTORIZED_MIN_CONNECTIONS
+    if numpy is None or not vectorized:
+        return [
+            summarize_history(list(samples), timestamp)
+            for samples, timestamp in histories
+        ]
+    return _summarize_stacked(histories)
+
+
+def _summarize_stacked(
+    histories: Sequence[tuple[Sequence[Mapping[str, Any]], float]],
+) -> list[dict[str, Any]]:
+    rows: list[Mapping[str, Any]] = []
+    row_connections: list[int] = []
+    row_timestamps: list[float] = []
+    for index, (samples, _timestamp) in enumerate(histories):
+        for sample in samples:
+            sample_timestamp = sample.get("timestamp")
+            if isinstance(sample_timestamp, (int, float)):
+                rows.append(sample)
+                row_connections.append(index)
+                row_timestamps.append(sample_timestamp)
+
+    count = len(histories)
+    # Rows are grouped by connection in sample order, so per-connection
+    # bincount sums add values in the same order as the pure-Python path.
+    connections = numpy.asarray(row_connections, dtype=numpy.intp)
+    sample_timestamps = numpy.asarray(row_timestamps, dtype=numpy.float64)
+    now = numpy.asarray(
+        [timestamp for _samples, timestamp in histories], dtype=numpy.float64
+    )[connections]
+    masks = [
+        (sample_timestamps > now - seconds) & (sample_timestamps <= now)
+        for seconds in _WINDOW_SECONDS
+    ]
+    stats = [[WindowStats() for _ in _WINDOW_SECONDS] for _ in range(count)]
+
+    def column(field: str) -> Any:
+        raw = [row.get(field) for row in rows]
+        if not set(map(type, raw)) <= _PLAIN_NUMBER_TYPES:
+            raw = [_number(value) for value in raw]
+        values = numpy.array(raw, dtype=numpy.float64)
+        # Missing and non-finite values are both NaN, i.e. not a sample value.
+        values[~numpy.isfinite(values)] = numpy.nan
+        return values
+
+    timing = column("transport_rtt_ms")
+    jitter = column(_JITTER_FIELD)
+    sums = {
+        field: column(field) for field in (*_SRT_EVENT_FIELDS, _FRAME_DISCARD_FIELD)
+    }
+    for position, mask in enumerate(masks):
+        for index, size, p50, p95, _last in _segment_percentiles(
+            connections, timing, mask, count
+        ):
+            stats[index][position].timing = (size, p50, p95)
+        for index, size, p50, p95, last in _segment_percentiles(
+            connections, jitter, mask, count
+        ):
+            stats[index][position].jitter = (size, last, p50, p95)
+        for field, values in sums.items():
+            for index, total in _segment_sums(connections, values, mask, count):
+                if field == _FRAME_DISCARD_FIELD:
+                    stats[index][position].frame_discard = total
+                else:
+                    stats[index][position].events[field] = total
+
+    # Counter names are free-form, so they keep the per-sample Python path.
+    counter_windows: dict[int, list[_Window]] = {}
+    window_flags = numpy.stack(masks, axis=1).tolist() if rows else []
+    for row, index, flags in zip(rows, row_connections, window_flags):
+        if not row.get(_PROTOCOL_COUNTERS_FIELD):
+            continue
+        windows = counter_windows.setdefault(
+            index, [_Window() for _ in _WINDOW_SECONDS]
+        )
+        _add_counters(row, [
+            window for window, flag in zip(windows, flags) if flag
+        ])
+    for index, windows in counter_windows.items():
+        for position, window in enumerate(windows):
+            stats[index][position].protocol_counters = _ordered_counters(
+                window.counter_names, window.counters
+            )
+    return [compose_summary(connection_stats) for connection_stats in stats]
+
+
+def _segment_sums(
+    connections: Any, values: Any, mask: Any, count: int
+) -> list[tuple[int, float]]:
+    present = mask & ~numpy.isnan(values)
+    sizes = numpy.bincount(connections[present], minlength=count)
+    totals = numpy.bincount(
+        connections[present], weights=values[present], minlength=count
+    )
+    indexes = numpy.flatnonzero(sizes)
+    return list(zip(indexes.tolist(), totals[indexes].tolist()))
+
+
+def _segment_percentiles(
+    connections: Any, values: Any, mask: Any, count: int
+) -> list[tuple[int, int, float, float, float]]:
+    """Return ``(connection, count, p50, p95, newest)`` per connection."""
+    present = mask & ~numpy.isnan(values)
+    selected = values[present]
+    owners = connections[present]
+    sizes = numpy.bincount(owners, minlength=count)
+    indexes = numpy.flatnonzero(sizes)
+    if not len(indexes):
+        return []
+    ordered = selected[numpy.lexsort((selected, owners))]
+    starts = (numpy.cumsum(sizes) - sizes)[indexes]
+    lengths = sizes[indexes]
+    percentiles = []
+    for fraction in (0.50, 0.95):
+        position = (lengths - 1) * fraction
+        lower = numpy.floor(position)
+        upper = numpy.ceil(position)
+        low = ordered[starts + lower.astype(numpy.intp)]
+        high = ordered[starts + upper.astype(numpy.intp)]
+        percentiles.append(numpy.where(
+            lower == upper, low, low + (high - low) * (position - lower)
+        ))
+    newest = selected[starts + lengths - 1]
+    return list(zip(
+        indexes.tolist(),
+        lengths.tolist(),
+        percentiles[0].tolist(),
+        percentiles[1].tolist(),
+        newest.tolist(),
+    ))
+
+
 def rate_history(
     samples: list[Mapping[str, Any]], direction: str
 ) -> list[dict[str, Any]]:
@@ -6,10 +6,14 @@ does not infer disconnects that happened between collector polls.
 
 from __future__ import annotations
 
-import json
 import re
 from typing import Any, Mapping, Optional
 
+try:
+    from . import json_codec
+except ImportError:
+    import json_codec
+
 
 LIFECYCLE_WINDOW_SECONDS = 60
 LIFECYCLE_TTL_SECONDS = 120
@@ -82,7 +86,7 @@ def observe_connection_groups(
 
     redis_client.set(
         key,
-        json.dumps({"groups": next_groups}, separators=(",", ":"), sort_keys=True),
+        json_codec.dumps({"groups": next_groups}, sort_keys=True),
         ex=ttl,
     )
     return results
@@ -92,9 +96,9 @@ def _read_state(payload: Any) -> dict[str, Any]:
     if payload is None:
         return {}
     try:
-        value = json.loads(payload)
+        value = json_codec.loads(payload)
         return value if isinstance(value, dict) else {}
-    except (TypeError, json.JSONDecodeError):
+    except json_codec.DecodeError:
         return {}
 
 
@@ -40,6 +40,11 @@ def counter_delta(
     return None
 
 
+def counter_state_keys(base_key: str, fields: Mapping[str, str]) -> list[str]:
+    """Return the state keys read by ``counter_deltas`` for one field mapping."""
+    return [f"{base_key}:{native_name}" for native_name in fields.values()]
+
+
 def counter_deltas(
     redis_client: Any,
     *,
@@ -50,10 +55,11 @@ def counter_deltas(
 ) -> dict[str, int]:
     """Return available interval deltas keyed by normalized metric name."""
     deltas: dict[str, int] = {}
-    for metric_name, native_name in fields.items():
+    keys = counter_state_keys(base_key, fields)
+    for (metric_name, native_name), key in zip(fields.items(), keys):
         delta = counter_delta(
             redis_client,
-            key=f"{base_key}:{native_name}",
+            key=key,
             value=details.get(native_name),
             ttl=ttl,
         )
@@ -0,0 +1,86 @@
+"""
+MediaMTX Monitor - collector cycle instrumentation.
+
+Keeps the timing metrics of recent collector cycles in a bounded in-process
+window so collector saturation is visible before snapshots become stale.
+
+Responsibilities:
+- Record the metrics of each finished cycle and missed scheduler intervals.
+- Summarize every metric as p50, p95, max, and last value over the window.
+
+Does not:
+- Measure cycles, schedule the collector, or perform Redis I/O.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import time
+from typing import Any, Callable, Mapping
+
+try:
+    from .connection_history import percentile
+except ImportError:
+    from connection_history import percentile
+
+
+DEFAULT_WINDOW_CYCLES = 300
+
+
+class CycleMetricsWindow:
+    """Rolling window over the metrics of the most recent collector cycles."""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_WINDOW_CYCLES,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._cycles: deque[dict[str, float]] = deque(maxlen=max(1, size))
+        # Missed intervals per recorded cycle, aligned with ``_cycles``.
+        self._missed: deque[int] = deque(maxlen=max(1, size))
+        self._clock = clock
+        self.cycle_count = 0
+        self.missed_interval_count = 0
+
+    def __len__(self) -> int:
+        return len(self._cycles)
+
+    def record(self, metrics: Mapping[str, float]) -> None:
+        """Add the metrics of one finished cycle."""
+        self._cycles.append({
+            name: float(value)
+            for name, value in metrics.items()
+            if isinstance(value, (int, float))
+        })
+        self._missed.append(0)
+        self.cycle_count += 1
+
+    def record_missed(self, count: int) -> None:
+        """Attribute scheduler intervals skipped after the last cycle to it."""
+        if count <= 0:
+            return
+        self.missed_interval_count += count
+        if self._missed:
+            self._missed[-1] += count
+
+    def summary(self) -> dict[str, Any]:
+        """Return window statistics per metric and the missed-interval counts."""
+        names = sorted({name for cycle in self._cycles for name in cycle})
+        metrics = {}
+        for name in names:
+            values = [cycle[name] for cycle in self._cycles if name in cycle]
+            metrics[name] = {
+                "p50": round(percentile(values, 0.50), 2),
+                "p95": round(percentile(values, 0.95), 2),
+                "max": round(max(values), 2),
+                "last": round(values[-1], 2),
+            }
+        return {
+            "updated_at": self._clock(),
+            "window_cycles": len(self._cycles),
+            "cycles_total": self.cycle_count,
+            "missed_intervals": sum(self._missed),
+            "missed_intervals_total": self.missed_interval_count,
+            "metrics": metrics,
+        }
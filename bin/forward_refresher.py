@@ -0,0 +1,171 @@
+"""
+MediaMTX Monitor - background forward-destination refresh.
+
+Keeps the forward destinations of visible paths current outside the 1 Hz
+collector cycle. The collector only reports the visible paths with a small
+change fingerprint and reads the last known destinations without blocking.
+
+Responsibilities:
+- Poll new and changed paths promptly and at most once per minimum interval.
+- Revalidate unchanged paths on a slow cadence spread across the window.
+- Limit concurrent forward-list requests and drop paths that disappeared.
+
+Does not:
+- Call the Control API directly; the collector injects the fetch function.
+- Interpret forward destinations or decide the collector failure policy.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import math
+import threading
+import time
+import zlib
+from typing import Any, Callable, Hashable, Mapping, MutableMapping, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_UNSEEN = object()
+
+
+class ForwardDestinationRefresher:
+    """Refresh forward destinations per path with bounded concurrency."""
+
+    def __init__(
+        self,
+        fetch_destinations: Callable[[str], list[Any]],
+        destinations: MutableMapping[str, list[Any]],
+        *,
+        workers: int = 4,
+        min_interval_seconds: float = 5.0,
+        revalidate_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch_destinations
+        self.destinations = destinations
+        self._workers = max(1, workers)
+        self._min_interval = min_interval_seconds
+        self._revalidate = max(revalidate_seconds, min_interval_seconds, 1.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fingerprints: dict[str, Hashable] = {}
+        self._due: dict[str, float] = {}
+        self._last_poll: dict[str, float] = {}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def observe(self, paths: Mapping[str, Hashable]) -> None:
+        """Accept the visible paths of one cycle with their change fingerprints."""
+        with self._lock:
+            now = self._clock()
+            for name in [name for name in self._fingerprints if name not in paths]:
+                self._forget(name)
+            changed = False
+            for name, fingerprint in paths.items():
+                previous = self._fingerprints.get(name, _UNSEEN)
+                if previous == fingerprint:
+                    continue
+                self._fingerprints[name] = fingerprint
+                due = now
+                if previous is not _UNSEEN and name in self._last_poll:
+                    # A flapping path is not polled more often than the
+                    # configured minimum interval.
+                    due = max(now, self._last_poll[name] + self._min_interval)
+                self._due[name] = min(self._due.get(name, math.inf), due)
+                changed = True
+        if changed:
+            self._wake.set()
+
+    def refresh_due(self) -> int:
+        """Poll every path that is due now and return the number of requests."""
+        with self._lock:
+            now = self._clock()
+            due = sorted(name for name, at in self._due.items() if at <= now)
+            for name in due:
+                self._due[name] = math.inf
+        if not due:
+            return 0
+
+        if len(due) == 1 or self._workers == 1:
+            results = [self._fetch(name) for name in due]
+        else:
+            results = list(self._pool().map(self._fetch, due))
+
+        with self._lock:
+            polled_at = self._clock()
+            for name, items in zip(due, results):
+                if name not in self._fingerprints:
+                    continue
+                self.destinations[name] = items
+                self._last_poll[name] = polled_at
+                self._due[name] = min(
+                    self._due[name], self._next_revalidation(name, polled_at)
+                )
+        return len(due)
+
+    def seconds_until_due(self) -> float:
+        """Return how long the background loop may sleep before work is due."""
+        with self._lock:
+            next_due = min(self._due.values(), default=math.inf)
+            return min(max(0.0, next_due - self._clock()), self._revalidate)
+
+    def start(self) -> None:
+        """Start the background refresh loop once."""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="forward-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background loop and its request workers."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.refresh_due()
+            except Exception:
+                logger.exception("Forward-Ziele konnten nicht aktualisiert werden.")
+            self._wake.wait(self.seconds_until_due())
+            self._wake.clear()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="forward-fetch"
+            )
+        return self._executor
+
+    def _next_revalidation(self, name: str, now: float) -> float:
+        # Each path owns a stable phase in the window, so revalidations of many
+        # unchanged paths are spread out instead of arriving in one burst.
+        phase = (zlib.crc32(name.encode("utf-8")) % 1000) / 1000 * self._revalidate
+        wait = (phase - now) % self._revalidate
+        if wait < self._min_interval:
+            wait += self._revalidate
+        return now + wait
+
+    def _forget(self, name: str) -> None:
+        self._fingerprints.pop(name, None)
+        self._due.pop(name, None)
+        self._last_poll.pop(name, None)
+        self.destinations.pop(name, None)
@@ -0,0 +1,166 @@
+"""
+MediaMTX Monitor - in-process connection history buffers.
+
+Holds the recent history samples of every live connection in a fixed-capacity
+ring, keyed by its ``connection_history_key``. The collector produced each of
+these samples itself, so window summaries are served from memory; Redis keeps a
+mirror for restarts and ``/api/history`` consumers.
+
+Responsibilities:
+- Append samples in timestamp order and evict samples outside the read span.
+- Return a window with the same content as the equivalent Redis score read.
+- Seed rings from Redis after a restart or a structural path change.
+
+Does not:
+- Perform Redis I/O, build samples, or summarize windows.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+
+class HistoryRing:
+    """Fixed-capacity, timestamp-ordered samples of one connection.
+
+    Timestamps live in a parallel ``array('d')`` so eviction and range checks
+    do not touch the sample dicts. When the ring is full the oldest sample is
+    overwritten.
+    """
+
+    __slots__ = ("_samples", "_timestamps", "_start", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        capacity = max(1, capacity)
+        self._samples: list[Optional[Mapping[str, Any]]] = [None] * capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        capacity = len(self._samples)
+        for offset in range(self._count):
+            yield self._samples[(self._start + offset) % capacity]
+
+    def _slot(self, offset: int) -> int:
+        return (self._start + offset) % len(self._samples)
+
+    def append(self, sample: Mapping[str, Any], timestamp: float) -> None:
+        """Add a sample; an identical newest sample is replaced, not repeated."""
+        if self._count:
+            newest = self._slot(self._count - 1)
+            if timestamp < self._timestamps[newest]:
+                # A clock step back: keep score order like the sorted set.
+                self._rebuild([*self, sample])
+                return
+            # Sorted-set members are unique, and equal samples share a timestamp.
+            if self._samples[newest] == sample:
+                return
+        if self._count == len(self._samples):
+            self._start = self._slot(1)
+            self._count -= 1
+        slot = self._slot(self._count)
+        self._samples[slot] = sample
+        self._timestamps[slot] = timestamp
+        self._count += 1
+
+    def evict_before(self, oldest: float) -> None:
+        """Drop samples older than ``oldest`` from the head of the ring."""
+        while self._count and self._timestamps[self._start] < oldest:
+            self._samples[self._start] = None
+            self._start = self._slot(1)
+            self._count -= 1
+
+    def window(
+        self, from_timestamp: float, to_timestamp: float
+    ) -> list[Mapping[str, Any]]:
+        """Return samples scored in the inclusive range, oldest first."""
+        if not self._count:
+            return []
+        oldest = self._timestamps[self._start]
+        newest = self._timestamps[self._slot(self._count - 1)]
+        if from_timestamp <= oldest and newest <= to_timestamp:
+            return list(self)
+        return [
+            sample
+            for sample, timestamp in zip(self, self._ordered_timestamps())
+            if from_timestamp <= timestamp <= to_timestamp
+        ]
+
+    def _ordered_timestamps(self) -> Iterator[float]:
+        for offset in range(self._count):
+            yield self._timestamps[self._slot(offset)]
+
+    def _rebuild(self, samples: list[Mapping[str, Any]]) -> None:
+        ordered = sorted(samples, key=_sample_timestamp)
+        capacity = len(self._samples)
+        self._samples = [None] * capacity
+        self._start = 0
+        self._count = 0
+        for sample in ordered[-capacity:]:
+            self.append(sample, _sample_timestamp(sample))
+
+
+class HistoryBuffers:
+    """Ring buffers of all live connections, keyed by their history key."""
+
+    def __init__(self, *, capacity: int, span_seconds: float) -> None:
+        self.capacity = max(1, capacity)
+        self.span_seconds = span_seconds
+        self._rings: dict[str, HistoryRing] = {}
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rings
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    def seed(self, key: str, samples: Iterable[Mapping[str, Any]]) -> None:
+        """Replace a ring with samples read from Redis in score order."""
+        ring = HistoryRing(self.capacity)
+        for sample in samples:
+            ring.append(sample, _sample_timestamp(sample))
+        self._rings[key] = ring
+
+    def append(
+        self, key: str, sample: Mapping[str, Any], timestamp: float
+    ) -> Optional[list[Mapping[str, Any]]]:
+        """Append a sample and return the read-span window ending with it.
+
+        Returns ``None`` for connections without a ring: their earlier samples
+        are unknown, and a window of only the new sample would silently shrink.
+        """
+        ring = self._rings.get(key)
+        if ring is None:
+            return None
+        oldest = timestamp - self.span_seconds
+        ring.evict_before(oldest)
+        ring.append(sample, timestamp)
+        return ring.window(oldest, timestamp)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._rings.pop(key, None)
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Keep only the rings of ``keys``; ended connections drop out."""
+        live = set(keys)
+        for key in [key for key in self._rings if key not in live]:
+            del self._rings[key]
+
+
+def history_capacity(span_seconds: float, interval_seconds: float) -> int:
+    """Return a ring capacity for one span at the cycle interval.
+
+    Twice the nominal sample count leaves room for cycles that run closer
+    together after a late one.
+    """
+    return 2 * (int(span_seconds // max(interval_seconds, 1)) + 1)
+
+
+def _sample_timestamp(sample: Mapping[str, Any]) -> float:
+    return float(sample.get("timestamp", 0.0))
@@ -0,0 +1,217 @@
+"""
+MediaMTX Monitor - tiered connection rollups.
+
+Downsamples the compact history samples of each connection into closed 10 s
+and 1 min buckets with min, max, sum, and count per numeric field. Buckets are
+built incrementally: samples feed the open 10 s bucket, and each closed 10 s
+bucket is merged into the open 1 min bucket, so raw samples are never rescanned.
+
+Responsibilities:
+- Keep the open buckets of every live connection in the collector process.
+- Return closed buckets as compact records when time moves past them or the
+  connection ends.
+- Merge and expand stored records for API consumers, including the mean.
+
+Does not:
+- Perform Redis I/O, build Redis keys, or interpret metric semantics.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+from typing import Any, Iterable, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class RollupTier:
+    """One rollup resolution and how long its closed buckets are kept."""
+
+    name: str
+    bucket_seconds: int
+    retention_seconds: int
+
+
+# Each tier is fed by the closed buckets of the tier before it.
+ROLLUP_TIERS = (
+    RollupTier("10s", 10, 3600),
+    RollupTier("1m", 60, 86400),
+)
+
+
+class _Bucket:
+    __slots__ = ("start", "fields")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        # field -> [min, max, sum, count]
+        self.fields: dict[str, list[float]] = {}
+
+    def add(self, field: str, value: float) -> None:
+        aggregate = self.fields.get(field)
+        if aggregate is None:
+            self.fields[field] = [value, value, value, 1]
+            return
+        aggregate[0] = min(aggregate[0], value)
+        aggregate[1] = max(aggregate[1], value)
+        aggregate[2] += value
+        aggregate[3] += 1
+
+    def merge(self, fields: Mapping[str, list[float]]) -> None:
+        for field, (minimum, maximum, total, count) in fields.items():
+            aggregate = self.fields.get(field)
+            if aggregate is None:
+                self.fields[field] = [minimum, maximum, total, count]
+                continue
+            aggregate[0] = min(aggregate[0], minimum)
+            aggregate[1] = max(aggregate[1], maximum)
+            aggregate[2] += total
+            aggregate[3] += count
+
+    def record(self) -> dict[str, Any]:
+        return {
+            "start": self.start,
+            "fields": {field: list(values) for field, values in self.fields.items()},
+        }
+
+
+def _bucket_start(timestamp: float, seconds: int) -> float:
+    return float(math.floor(timestamp / seconds) * seconds)
+
+
+def _sample_values(sample: Mapping[str, Any]) -> Iterable[tuple[str, float]]:
+    for field, value in sample.items():
+        if field == "timestamp" or isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            yield field, float(value)
+
+
+class ConnectionRollup:
+    """Open buckets of one connection across all tiers."""
+
+    __slots__ = ("_tiers", "_open")
+
+    def __init__(self, tiers: tuple[RollupTier, ...] = ROLLUP_TIERS) -> None:
+        self._tiers = tiers
+        self._open: list[Optional[_Bucket]] = [None] * len(tiers)
+
+    def add(
+        self, sample: Mapping[str, Any], timestamp: float
+    ) -> list[tuple[RollupTier, dict[str, Any]]]:
+        """Add one sample and return the buckets it closed, finest tier first."""
+        closed: list[tuple[RollupTier, dict[str, Any]]] = []
+        start = _bucket_start(timestamp, self._tiers[0].bucket_seconds)
+        bucket = self._open[0]
+        # A clock step back keeps filling the open bucket instead of reopening
+        # one that may already be stored.
+        if bucket is not None and start > bucket.start:
+            closed.extend(self._close(0))
+            bucket = None
+        if bucket is None:
+            bucket = self._open[0] = _Bucket(start)
+        for field, value in _sample_values(sample):
+            bucket.add(field, value)
+        return closed
+
+    def close(self) -> list[tuple[RollupTier, dict[str, Any]]]:
+        """Close every open bucket, e.g. when the connection has ended."""
+        closed = []
+        for level in range(len(self._tiers)):
+            closed.extend(self._close(level))
+        return closed
+
+    def _close(self, level: int) -> list[tuple[RollupTier, dict[str, Any]]]:
+        bucket = self._open[level]
+        if bucket is None:
+            return []
+        self._open[level] = None
+        tier = self._tiers[level]
+        closed = [(tier, bucket.record())] if bucket.fields else []
+        if level + 1 >= len(self._tiers):
+            return closed
+        parent_tier = self._tiers[level + 1]
+        parent_start = _bucket_start(bucket.start, parent_tier.bucket_seconds)
+        parent = self._open[level + 1]
+        if parent is not None and parent_start > parent.start:
+            closed.extend(self._close(level + 1))
+            parent = None
+        if parent is None:
+            parent = self._open[level + 1] = _Bucket(parent_start)
+        parent.merge(bucket.fields)
+        # The last child of a parent closes it without waiting for the next one.
+        if (
+            bucket.start + tier.bucket_seconds
+            >= parent.start + parent_tier.bucket_seconds
+        ):
+            closed.extend(self._close(level + 1))
+        return closed
+
+
+class HistoryRollups:
+    """Connection rollups keyed by measurement identity.
+
+    Connections not updated since the previous ``close_unseen()`` are treated
+    as ended, and their open buckets are closed.
+    """
+
+    def __init__(self, tiers: tuple[RollupTier, ...] = ROLLUP_TIERS) -> None:
+        self._tiers = tiers
+        self._rollups: dict[str, ConnectionRollup] = {}
+        self._seen: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._rollups)
+
+    def add(
+        self, key: str, sample: Mapping[str, Any], timestamp: float
+    ) -> list[tuple[RollupTier, dict[str, Any]]]:
+        rollup = self._rollups.get(key)
+        if rollup is None:
+            rollup = self._rollups[key] = ConnectionRollup(self._tiers)
+        self._seen.add(key)
+        return rollup.add(sample, timestamp)
+
+    def close_unseen(self) -> list[tuple[str, RollupTier, dict[str, Any]]]:
+        """Close rollups of connections missing from the cycle just finished."""
+        closed = []
+        for key in [key for key in self._rollups if key not in self._seen]:
+            for tier, record in self._rollups.pop(key).close():
+                closed.append((key, tier, record))
+        self._seen = set()
+        return closed
+
+
+def expand_rollups(records: Iterable[Mapping[str, Any]]) -> list[dict[str, Any]]:
+    """Merge records sharing a bucket start and add the mean of every field.
+
+    A quick reconnect under the same identity stores the same bucket twice,
+    each with part of its samples.
+    """
+    merged: dict[float, _Bucket] = {}
+    for record in records:
+        start = record.get("start")
+        fields = record.get("fields")
+        if not isinstance(start, (int, float)) or not isinstance(fields, dict):
+            continue
+        bucket = merged.get(start)
+        if bucket is None:
+            bucket = merged[start] = _Bucket(start)
+        bucket.merge(fields)
+    return [
+        {
+            "start": start,
+            "fields": {
+                field: {
+                    "min": minimum,
+                    "max": maximum,
+                    "mean": round(total / count, 4),
+                    "sum": round(total, 4),
+                    "count": int(count),
+                }
+                for field, (minimum, maximum, total, count)
+                in merged[start].fields.items()
+            },
+        }
+        for start in sorted(merged)
+    ]
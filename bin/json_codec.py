@@ -0,0 +1,117 @@
+"""
+MediaMTX Monitor - JSON codec selection.
+
+Encodes and decodes JSON with orjson or msgspec when one of them is installed
+and falls back to the standard library otherwise, so Redis payloads, API
+responses, and diagnostic files share one serializer.
+
+Responsibilities:
+- Select the fastest installed backend once at import time.
+- Produce compact UTF-8 JSON text, optionally with sorted keys or indentation.
+- Report undecodable payloads as one backend-independent exception type.
+
+Does not:
+- Perform Redis or file I/O, or define payload shapes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib codec is always available.
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional speedup; the stdlib codec is always available.
+    msgspec = None
+
+
+class DecodeError(ValueError):
+    """Raised when a payload is not valid JSON, whichever backend is active."""
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """One JSON backend: ``encode(value, sort_keys, indent)`` and ``decode``."""
+
+    name: str
+    encode: Callable[[Any, bool, bool], str]
+    decode: Callable[[Any], Any]
+    decode_errors: tuple[type[BaseException], ...]
+
+
+def _stdlib_encode(value: Any, sort_keys: bool, indent: bool) -> str:
+    if indent:
+        return json.dumps(value, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    return json.dumps(
+        value, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False
+    )
+
+
+STDLIB_CODEC = JSONCodec(
+    "stdlib", _stdlib_encode, json.loads, (json.JSONDecodeError, TypeError)
+)
+CODECS = {"stdlib": STDLIB_CODEC}
+
+if msgspec is not None:
+
+    def _msgspec_encode(value: Any, sort_keys: bool, indent: bool) -> str:
+        payload = msgspec.json.encode(value, order="sorted" if sort_keys else None)
+        if indent:
+            payload = msgspec.json.format(payload, indent=2)
+        return payload.decode("utf-8")
+
+    CODECS["msgspec"] = JSONCodec(
+        "msgspec",
+        _msgspec_encode,
+        msgspec.json.decode,
+        (msgspec.DecodeError, TypeError),
+    )
+
+if orjson is not None:
+
+    def _orjson_encode(value: Any, sort_keys: bool, indent: bool) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, option=option).decode("utf-8")
+
+    CODECS["orjson"] = JSONCodec(
+        "orjson", _orjson_encode, orjson.loads, (orjson.JSONDecodeError, TypeError)
+    )
+
+_PREFERENCE = ("orjson", "msgspec", "stdlib")
+_active = next(CODECS[name] for name in _PREFERENCE if name in CODECS)
+
+
+def select_codec(name: str) -> JSONCodec:
+    """Activate an installed backend by name, e.g. ``stdlib`` for comparisons."""
+    global _active
+    if name not in CODECS:
+        raise ValueError(f"JSON-Codec nicht verfügbar: {name}")
+    _active = CODECS[name]
+    return _active
+
+
+def codec_name() -> str:
+    return _active.name
+
+
+def dumps(value: Any, *, sort_keys: bool = False, indent: bool = False) -> str:
+    """Encode ``value`` as compact JSON text, or indented by two spaces."""
+    return _active.encode(value, sort_keys, indent)
+
+
+def loads(payload: Any) -> Any:
+    """Decode JSON text or bytes, raising ``DecodeError`` for invalid input."""
+    try:
+        return _active.decode(payload)
+    except _active.decode_errors as exc:
+        raise DecodeError(str(exc)) from exc
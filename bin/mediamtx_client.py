@@ -6,6 +6,7 @@ Provides the technical HTTP boundary for reading raw MediaMTX JSON data.
 Responsibilities:
 - Build Control API URLs and execute GET requests with a fixed timeout.
 - Translate transport, HTTP, and JSON decoding failures into client errors.
+- Offer an awaitable variant with identical errors for the asyncio collector.
 
 Does not:
 - Interpret streams, protocols, metrics, health, or persistence.
@@ -13,6 +14,7 @@ Does not:
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Mapping, Optional
 
 import requests
@@ -63,11 +65,16 @@ class MediaMTXClient:
         self,
         endpoint: str,
         params: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
     ) -> Any:
-        """Return decoded JSON or raise a technical client error."""
+        """Return decoded JSON or raise a technical client error.
+
+        ``timeout`` shortens the configured timeout for this request only.
+        """
         url = self.build_url(endpoint)
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
         try:
-            response = self._session.get(url, params=params, timeout=self.timeout)
+            response = self._session.get(url, params=params, timeout=timeout)
             response.raise_for_status()
         except requests.HTTPError as exc:
             status_code = exc.response.status_code if exc.response is not None else 0
@@ -79,3 +86,30 @@ class MediaMTXClient:
             return response.json()
         except (ValueError, requests.RequestException) as exc:
             raise MediaMTXDecodeError(f"Invalid JSON from {url}: {exc}") from exc
+
+
+class AsyncMediaMTXClient:
+    """Await Control API reads without blocking the collector event loop.
+
+    Requests are delegated to a ``MediaMTXClient`` in worker threads, so URLs,
+    timeouts, and raised error classes are identical in both runtimes.
+    """
+
+    def __init__(self, client: MediaMTXClient) -> None:
+        self._client = client
+        self.base_url = client.base_url
+
+    def build_url(self, endpoint: str) -> str:
+        """Combine the configured base URL with a Control API endpoint."""
+        return self._client.build_url(endpoint)
+
+    async def get_json(
+        self,
+        endpoint: str,
+        params: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Return decoded JSON or raise a technical client error."""
+        return await asyncio.to_thread(
+            self._client.get_json, endpoint, params, timeout
+        )
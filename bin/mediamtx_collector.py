@@ -5,6 +5,8 @@ MediaMTX Monitor - stream collection orchestrator.
 Polls raw MediaMTX data through the client boundary, normalizes paths and
 connections, enriches protocol and calculated metrics, updates short history
 and lifecycle state, and writes the current snapshot with its collection time.
+With ``collector.nodes`` one process polls several MediaMTX nodes, each with its
+own client, poll cache, Redis key prefix, and cycle timing.
 
 Does not implement Control API transport, Redis key construction, the monitoring
 API or frontend, or local host-system monitoring.
@@ -13,13 +15,18 @@ API or frontend, or local host-system monitoring.
 from __future__ import annotations
 
 import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-import json
+from functools import partial
 import logging
+import signal
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 try:
     from redis.exceptions import RedisError
@@ -28,22 +35,35 @@ except ImportError:  # Unit tests load product modules without runtime dependenc
         pass
 
 try:
+    from . import json_codec
     from .bitrate import calc_bitrate
-    from .counter_metrics import counter_delta, counter_deltas
+    from .collector_state import ConnectionStateCache, CycleState, unique_keys
+    from .cycle_metrics import CycleMetricsWindow
+    from .counter_metrics import (
+        counter_delta,
+        counter_deltas,
+        counter_state_keys,
+    )
     from .connection_history import (
         HISTORY_RETENTION_SECONDS,
         HISTORY_TTL_SECONDS,
         average_rate,
         build_history_sample,
-        jitter_history,
-        rate_history,
-        summarize_history,
+        summarize_histories,
     )
     from .connection_lifecycle import (
         observe_connection_groups,
         remote_host,
     )
-    from .mediamtx_client import MediaMTXClient, MediaMTXError, MediaMTXHTTPError
+    from .forward_refresher import ForwardDestinationRefresher
+    from .history_buffer import HistoryBuffers, history_capacity
+    from .history_rollup import HistoryRollups
+    from .mediamtx_client import (
+        AsyncMediaMTXClient,
+        MediaMTXClient,
+        MediaMTXError,
+        MediaMTXHTTPError,
+    )
     from .mediamtx_model import (
         DETAIL_ENDPOINTS,
         HLS_MUXER_ENDPOINT,
@@ -58,9 +78,12 @@ try:
         resolve_monitoring_config,
     )
     from .redis_keys import (
+        COLLECTOR_METRICS_KEY,
+        bitrate_state_keys,
         connection_counter_key,
         connection_lifecycle_key,
         connection_history_key,
+        connection_rollup_key,
         hls_muxer_metric_key,
         path_metric_key,
         publisher_connection_key,
@@ -68,31 +91,56 @@ try:
         reader_connection_key,
         reader_srt_health_key,
         rtmp_frame_discard_key,
+        stream_snapshot_channel_key,
+        stream_snapshot_delta_key,
         stream_snapshot_freshness_key,
+        stream_snapshot_index_key,
+        stream_snapshot_paths_key,
+        stream_snapshot_sequence_key,
+    )
+    from .redis_store import (
+        AsyncNamespacedRedis,
+        AsyncRedisStore,
+        NamespacedRedis,
+        RedisStore,
     )
-    from .redis_store import NamespacedRedis, RedisStore
     from .protocol_metrics import (
         RTMP_CONNECTION_TYPES,
         build_common_metrics,
         build_protocol_metrics,
         counter_fields,
     )
-    from .srt_metrics import build_srt_health
-    from .stream_normalizer import connection_identity, normalize_stream
+    from .snapshot_delta import diff_snapshots, index_paths, is_empty_delta
+    from .srt_metrics import build_srt_health, srt_state_keys
+    from .stream_normalizer import (
+        build_track_model,
+        connection_identity,
+        normalize_stream,
+        path_fingerprint,
+    )
 except ImportError:
+    import json_codec
     from bitrate import calc_bitrate
-    from counter_metrics import counter_delta, counter_deltas
+    from collector_state import ConnectionStateCache, CycleState, unique_keys
+    from cycle_metrics import CycleMetricsWindow
+    from counter_metrics import counter_delta, counter_deltas, counter_state_keys
     from connection_history import (
         HISTORY_RETENTION_SECONDS,
         HISTORY_TTL_SECONDS,
         average_rate,
         build_history_sample,
-        jitter_history,
-        rate_history,
-        summarize_history,
+        summarize_histories,
     )
     from connection_lifecycle import observe_connection_groups, remote_host
-    from mediamtx_client import MediaMTXClient, MediaMTXError, MediaMTXHTTPError
+    from forward_refresher import ForwardDestinationRefresher
+    from history_buffer import HistoryBuffers, history_capacity
+    from history_rollup import HistoryRollups
+    from mediamtx_client import (
+        AsyncMediaMTXClient,
+        MediaMTXClient,
+        MediaMTXError,
+        MediaMTXHTTPError,
+    )
     from mediamtx_model import (
         DETAIL_ENDPOINTS,
         HLS_MUXER_ENDPOINT,
@@ -107,9 +155,12 @@ except ImportError:
         resolve_monitoring_config,
     )
     from redis_keys import (
+        COLLECTOR_METRICS_KEY,
+        bitrate_state_keys,
         connection_counter_key,
         connection_lifecycle_key,
         connection_history_key,
+        connection_rollup_key,
         hls_muxer_metric_key,
         path_metric_key,
         publisher_connection_key,
@@ -117,17 +168,33 @@ except ImportError:
         reader_connection_key,
         reader_srt_health_key,
         rtmp_frame_discard_key,
+        stream_snapshot_channel_key,
+        stream_snapshot_delta_key,
         stream_snapshot_freshness_key,
+        stream_snapshot_index_key,
+        stream_snapshot_paths_key,
+        stream_snapshot_sequence_key,
+    )
+    from redis_store import (
+        AsyncNamespacedRedis,
+        AsyncRedisStore,
+        NamespacedRedis,
+        RedisStore,
     )
-    from redis_store import NamespacedRedis, RedisStore
     from protocol_metrics import (
         RTMP_CONNECTION_TYPES,
         build_common_metrics,
         build_protocol_metrics,
         counter_fields,
     )
-    from srt_metrics import build_srt_health
-    from stream_normalizer import connection_identity, normalize_stream
+    from snapshot_delta import diff_snapshots, index_paths, is_empty_delta
+    from srt_metrics import build_srt_health, srt_state_keys
+    from stream_normalizer import (
+        build_track_model,
+        connection_identity,
+        normalize_stream,
+        path_fingerprint,
+    )
 
 
 config = resolve_monitoring_config({})
@@ -149,6 +216,24 @@ IGNORE_LOOPBACK = BITRATE_CFG["ignore_loopback"]
 r = None
 snapshot_store = None
 mediamtx_client = None
+async_redis = None
+async_snapshot_store = None
+async_mediamtx_client = None
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+# Samples older than this are not needed for the 10 s and 60 s windows.
+HISTORY_READ_SECONDS = 60
+# Publishers charted in the dashboard: RTMP rate, RTSP/WebRTC native jitter.
+TREND_CONNECTION_TYPES = RTMP_CONNECTION_TYPES | {
+    "rtspSession", "rtspsSession", "webRTCSession",
+}
+
+
+@dataclass
+class PathStructure:
+    """Structure-derived data reused while a path fingerprint stays unchanged."""
+
+    fingerprint: tuple[Any, ...]
+    track_model: tuple[list[str], Dict[str, Any]]
 
 
 @dataclass
@@ -157,20 +242,103 @@ class PollCache:
 
     mediamtx_version: Optional[str] = None
     next_version_refresh: float = 0.0
-    next_forward_refresh: float = 0.0
     next_output_write: float = 0.0
+    next_state_checkpoint: float = 0.0
+    next_metrics_publish: float = 0.0
+    state_cache: Optional[ConnectionStateCache] = None
+    cycle_metrics: Optional[CycleMetricsWindow] = None
     forward_destinations: Dict[str, Any] = field(default_factory=dict)
+    forward_refresher: Optional[ForwardDestinationRefresher] = None
     lifecycle_roles_by_path: Dict[str, set[tuple[str, str]]] = field(
         default_factory=dict
     )
     lifecycle_keys_seen: set[str] = field(default_factory=set)
+    path_structures: Dict[str, PathStructure] = field(default_factory=dict)
+    history_buffers: Optional[HistoryBuffers] = None
+    history_rollups: HistoryRollups = field(default_factory=HistoryRollups)
+    snapshot_seq: Optional[int] = None
+    # Paths of the last published snapshot; ``None`` makes the next delta a reset.
+    published_paths: Optional[Dict[str, Any]] = None
+    # Encoded JSON text of every published path, reused while it is unchanged.
+    published_texts: Dict[str, str] = field(default_factory=dict)
 
 
 poll_cache = PollCache()
 
+
+@dataclass
+class CollectorNode:
+    """Clients and in-process caches of one MediaMTX node in fleet mode.
+
+    Single-node mode keeps the same attributes as module globals; ``_node()``
+    returns whichever of the two the running cycle is bound to.
+    """
+
+    node_id: str
+    api_base_url: str
+    interval_seconds: int
+    output_json_path: str
+    r: Any = None
+    snapshot_store: Any = None
+    mediamtx_client: Any = None
+    async_redis: Any = None
+    async_snapshot_store: Any = None
+    async_mediamtx_client: Any = None
+    poll_cache: PollCache = field(default_factory=PollCache)
+    _fetch_executor: Optional[ThreadPoolExecutor] = field(
+        default=None, repr=False
+    )
+
+
+collector_nodes: list[CollectorNode] = []
+_current_node: ContextVar[Optional[CollectorNode]] = ContextVar(
+    "collector_node", default=None
+)
+
+
+def _node() -> Any:
+    """Return the fleet node bound to this cycle, else the module-level node."""
+    node = _current_node.get()
+    return sys.modules[__name__] if node is None else node
+
+
+def _bind_node(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind the current node to ``function`` for calls from worker threads.
+
+    Worker threads do not inherit the caller's context, so detail and forward
+    fetches would otherwise reach the module-level client.
+    """
+    node = _current_node.get()
+    if node is None:
+        return function
+
+    def bound(*args: Any) -> Any:
+        return _run_in_node(node, function, *args)
+
+    return bound
+
+
+def _node_id() -> str:
+    node = _current_node.get()
+    return config["node"]["id"] if node is None else node.node_id
+
+
+def _output_json_path() -> str:
+    node = _current_node.get()
+    return JSON_OUTPUT_PATH if node is None else node.output_json_path
+
+
+def node_output_json_path(output_json_path: str, node_id: str) -> str:
+    """Return the per-node JSON file, e.g. ``streams.edge-01.json``."""
+    path = Path(output_json_path)
+    return str(path.with_name(f"{path.stem}.{node_id}{path.suffix}"))
+
+
 def reset_poll_cache() -> None:
     """Reset slow-path state, primarily for runtime reconfiguration and tests."""
     global poll_cache
+    if poll_cache.forward_refresher is not None:
+        poll_cache.forward_refresher.stop(timeout=1.0)
     poll_cache = PollCache()
 
 
@@ -200,7 +368,11 @@ def configure_runtime(raw_config: Dict[str, Any]) -> None:
     ]
     BITRATE_TTL = BITRATE_CFG["ttl"]
     IGNORE_LOOPBACK = BITRATE_CFG["ignore_loopback"]
+    shutdown_fetch_executor()
     reset_poll_cache()
+    for node in collector_nodes:
+        _run_in_node(node, _release_node)
+    collector_nodes.clear()
 
 
 def initialize_runtime(config_path: Path | str = DEFAULT_CONFIG_PATH) -> None:
@@ -218,7 +390,14 @@ def initialize_runtime(config_path: Path | str = DEFAULT_CONFIG_PATH) -> None:
         raw_redis = redis.Redis(
             host=REDIS_HOST, port=REDIS_PORT, decode_responses=True
         )
-        r = NamespacedRedis(raw_redis, REDIS_CFG["namespace"], config["node"]["id"])
+        # Fleet nodes share one connection pool; only the key prefix differs.
+        node_ids = [config["node"]["id"]]
+        node_ids += [node_cfg["id"] for node_cfg in COLLECTOR_CFG["nodes"]]
+        node_redis = {
+            node_id: NamespacedRedis(raw_redis, REDIS_CFG["namespace"], node_id)
+            for node_id in node_ids
+        }
+        r = node_redis[config["node"]["id"]]
         r.ping()
         snapshot_store = RedisStore(r)
         logging.info("🔌 Verbindung zu Redis hergestellt.")
@@ -226,6 +405,49 @@ def initialize_runtime(config_path: Path | str = DEFAULT_CONFIG_PATH) -> None:
         logging.error(f"❌ Verbindung zu Redis fehlgeschlagen: {exc}")
         sys.exit(1)
     mediamtx_client = MediaMTXClient(API_BASE)
+    collector_nodes[:] = [
+        _build_collector_node(node_redis[node_cfg["id"]], node_cfg)
+        for node_cfg in COLLECTOR_CFG["nodes"]
+    ]
+
+
+def _build_collector_node(
+    node_redis: NamespacedRedis, node_cfg: Dict[str, Any]
+) -> CollectorNode:
+    return CollectorNode(
+        node_id=node_cfg["id"],
+        api_base_url=node_cfg["api_base_url"],
+        interval_seconds=node_cfg["interval_seconds"],
+        output_json_path=node_output_json_path(JSON_OUTPUT_PATH, node_cfg["id"]),
+        r=node_redis,
+        snapshot_store=RedisStore(node_redis),
+        mediamtx_client=MediaMTXClient(node_cfg["api_base_url"]),
+    )
+
+
+def _runtime_nodes() -> list[Optional[CollectorNode]]:
+    """Return the fleet nodes, or ``[None]`` for the module-level node."""
+    return list(collector_nodes) or [None]
+
+
+def _run_in_node(
+    node: Optional[CollectorNode], function: Callable[..., Any], *args: Any
+) -> Any:
+    token = _current_node.set(node)
+    try:
+        return function(*args)
+    finally:
+        _current_node.reset(token)
+
+
+def _node_interval() -> int:
+    node = _current_node.get()
+    return INTERVAL if node is None else node.interval_seconds
+
+
+def _start_offset(index: int, count: int) -> float:
+    """Spread the first cycle of fleet nodes across one interval."""
+    return _node_interval() * (1 + index / count)
 
 
 def fetch(
@@ -233,30 +455,178 @@ def fetch(
     params: Optional[Dict[str, str]] = None,
     *,
     required: bool = False,
+    timeout: Optional[float] = None,
 ) -> Dict[str, Any]:
     """Fetch one MediaMTX endpoint under the collector failure policy.
 
     Optional requests degrade to an empty item list. Required current-state
     requests propagate failures so they cannot replace the snapshot with empty
-    or partially stale data.
+    or partially stale data. ``timeout`` caps the client timeout.
     """
-    url = mediamtx_client.build_url(endpoint)
+    client = _node().mediamtx_client
+    url = client.build_url(endpoint)
     try:
-        data = mediamtx_client.get_json(endpoint, params=params)
+        data = client.get_json(endpoint, params=params, timeout=timeout)
         if isinstance(data, dict):
             return data
         return {"items": []}
     except MediaMTXError as e:
-        if (
-            endpoint in OPTIONAL_SECURE_ENDPOINTS
-            and isinstance(e, MediaMTXHTTPError)
-            and e.status_code == 404
-        ):
-            return {"items": []}
-        if required:
-            raise
-        logging.warning(f"⚠️ API-Fehler {url}: {e}")
+        return _fetch_failure(url, endpoint, e, required=required)
+
+
+async def fetch_async(
+    endpoint: str,
+    params: Optional[Dict[str, str]] = None,
+    *,
+    required: bool = False,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Awaitable ``fetch()`` for the asyncio runtime with the same policy."""
+    client = _node().async_mediamtx_client
+    url = client.build_url(endpoint)
+    try:
+        data = await client.get_json(endpoint, params=params, timeout=timeout)
+        if isinstance(data, dict):
+            return data
+        return {"items": []}
+    except MediaMTXError as e:
+        return _fetch_failure(url, endpoint, e, required=required)
+
+
+def _fetch_failure(
+    url: str, endpoint: str, error: MediaMTXError, *, required: bool
+) -> Dict[str, Any]:
+    if (
+        endpoint in OPTIONAL_SECURE_ENDPOINTS
+        and isinstance(error, MediaMTXHTTPError)
+        and error.status_code == 404
+    ):
+        return {"items": []}
+    if required:
+        raise error
+    logging.warning(f"⚠️ API-Fehler {url}: {error}")
+    return {"items": []}
+
+
+def _log_fetch_deadline(url: str) -> None:
+    logging.warning(f"⚠️ API-Timeout {url}: Zyklus-Deadline überschritten")
+
+
+def _detail_fetch_executor() -> ThreadPoolExecutor:
+    node = _node()
+    if node._fetch_executor is None:
+        node._fetch_executor = ThreadPoolExecutor(
+            max_workers=COLLECTOR_CFG["detail_fetch_workers"],
+            thread_name_prefix="mediamtx-fetch",
+        )
+    return node._fetch_executor
+
+
+def shutdown_fetch_executor() -> None:
+    """Stop detail fetch workers without waiting for late requests."""
+    node = _node()
+    if node._fetch_executor is not None:
+        node._fetch_executor.shutdown(wait=False, cancel_futures=True)
+        node._fetch_executor = None
+
+
+def _fetch_before(deadline: float, endpoint: str) -> Dict[str, Any]:
+    """``fetch()`` whose request cannot outlast the cycle ``deadline``.
+
+    Abandoned requests would otherwise hold a detail worker for the full
+    client timeout and delay the fetches of the following cycles.
+    """
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
         return {"items": []}
+    return fetch(endpoint, timeout=remaining)
+
+
+def fetch_all(endpoints: list[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch optional endpoints concurrently under one per-cycle deadline.
+
+    Every endpoint keeps the optional ``fetch()`` policy. An endpoint that has
+    not answered when the deadline expires degrades to an empty item list, so
+    one slow list cannot hold back the snapshot. Request timeouts end at the
+    same deadline, so late requests release their worker.
+    """
+    if len(endpoints) <= 1 or COLLECTOR_CFG["detail_fetch_workers"] <= 1:
+        return {endpoint: fetch(endpoint) for endpoint in endpoints}
+    executor = _detail_fetch_executor()
+    node_fetch = _bind_node(_fetch_before)
+    deadline_seconds = COLLECTOR_CFG["detail_fetch_deadline_seconds"]
+    deadline = time.monotonic() + deadline_seconds
+    futures = {
+        endpoint: executor.submit(node_fetch, deadline, endpoint)
+        for endpoint in endpoints
+    }
+    done, _pending = wait(futures.values(), timeout=deadline_seconds)
+    results = {}
+    for endpoint, future in futures.items():
+        if future in done:
+            results[endpoint] = future.result()
+            continue
+        future.cancel()
+        _log_fetch_deadline(_node().mediamtx_client.build_url(endpoint))
+        results[endpoint] = {"items": []}
+    return results
+
+
+async def fetch_all_async(endpoints: list[str]) -> Dict[str, Dict[str, Any]]:
+    """Awaitable ``fetch_all()``: one task per endpoint, same cycle deadline."""
+    if not endpoints:
+        return {}
+    deadline_seconds = COLLECTOR_CFG["detail_fetch_deadline_seconds"]
+    # Cancelling a task leaves its worker thread running; the request timeout
+    # ends it at the deadline instead.
+    tasks = {
+        endpoint: asyncio.create_task(
+            fetch_async(endpoint, timeout=deadline_seconds)
+        )
+        for endpoint in endpoints
+    }
+    done, _pending = await asyncio.wait(tasks.values(), timeout=deadline_seconds)
+    results = {}
+    for endpoint, task in tasks.items():
+        if task in done:
+            results[endpoint] = task.result()
+            continue
+        task.cancel()
+        _log_fetch_deadline(_node().async_mediamtx_client.build_url(endpoint))
+        results[endpoint] = {"items": []}
+    return results
+
+
+def _fetch_forward_destinations(path_name: str) -> list[Any]:
+    return fetch(
+        "/v3/paths/forward/list", params={"path": path_name}
+    ).get("items", [])
+
+
+def _forward_fingerprint(path: Dict[str, Any]) -> tuple[Any, ...]:
+    """Return the path fields whose change triggers a forward-list refresh."""
+    source = path.get("source", {}) or {}
+    return (
+        path.get("confName"),
+        path.get("ready"),
+        path.get("readyTime"),
+        source.get("type"),
+        source.get("id"),
+    )
+
+
+def _forward_refresher() -> ForwardDestinationRefresher:
+    """Return the forward-destination refresher of this process."""
+    cache = _node().poll_cache
+    if cache.forward_refresher is None:
+        cache.forward_refresher = ForwardDestinationRefresher(
+            _bind_node(_fetch_forward_destinations),
+            cache.forward_destinations,
+            workers=COLLECTOR_CFG["forward_fetch_workers"],
+            min_interval_seconds=COLLECTOR_CFG["forward_refresh_seconds"],
+            revalidate_seconds=COLLECTOR_CFG["forward_revalidate_seconds"],
+        )
+    return cache.forward_refresher
 
 
 def is_loopback(remote: str) -> bool:
@@ -280,60 +650,416 @@ def first_available(mapping: Dict[str, Any], *field_names: str) -> Any:
     return None
 
 
+def _is_ignored_reader(reader: Dict[str, Any]) -> bool:
+    """Return whether a reader is excluded by the loopback filter."""
+    return IGNORE_LOOPBACK and is_loopback(
+        reader.get("details", {}).get("remoteAddr", "")
+    )
+
+
+def _path_state_key(name: str, source: Dict[str, Any]) -> str:
+    """Scope Path counter state to the currently attached source."""
+    return path_metric_key(
+        name,
+        f"{source.get('type')}:{source.get('id')}"
+        if source.get("type") and source.get("id") else None,
+    )
+
+
+def _srt_health_key(
+    name: str, connection: Dict[str, Any], direction: str
+) -> str:
+    key_builder = (
+        publisher_srt_health_key if direction == "publisher"
+        else reader_srt_health_key
+    )
+    return key_builder(name, connection["type"], connection_identity(connection))
+
+
+def _connection_state_keys(
+    name: str,
+    connection: Dict[str, Any],
+    *,
+    direction: str,
+    connection_key: str,
+) -> list[str]:
+    """Return every measurement state key enrichment may read for a connection."""
+    connection_type = connection.get("type")
+    keys = list(bitrate_state_keys(connection_key))
+    if connection_type == "srtConn":
+        keys.extend(srt_state_keys(
+            _srt_health_key(name, connection, direction), direction
+        ))
+    elif connection_type in RTMP_CONNECTION_TYPES and direction == "reader":
+        keys.append(rtmp_frame_discard_key(connection_key))
+    else:
+        keys.extend(counter_state_keys(
+            connection_counter_key(connection_key),
+            counter_fields(connection_type, direction),
+        ))
+    return keys
+
+
+def _lifecycle_roles(entry: Dict[str, Any]) -> set[tuple[str, str]]:
+    """Return the RTMP roles of one Path that participate in lifecycle state."""
+    roles: set[tuple[str, str]] = set()
+    if entry["source"].get("type") in RTMP_CONNECTION_TYPES:
+        roles.add(("publisher", entry["source"]["type"]))
+    for reader in entry["readers"]:
+        if reader.get("type") in RTMP_CONNECTION_TYPES:
+            roles.add(("reader", reader["type"]))
+    return roles
+
+
+def _plan_cycle_state(
+    entries: list[tuple[Dict[str, Any], Dict[str, Any]]],
+    hls_muxers: Dict[str, Any],
+) -> tuple[list[str], Dict[str, list[str]]]:
+    """Plan all state keys and the history keys of each path for one snapshot.
+
+    Enrichment stays correct for keys missing from the plan, but every such key
+    costs an additional Redis round trip.
+    """
+    state_keys: list[str] = []
+    history_keys_by_path: Dict[str, list[str]] = {}
+    for path, entry in entries:
+        name = entry["name"]
+        history_keys = history_keys_by_path.setdefault(name, [])
+        source = entry["source"]
+        path_state_key = _path_state_key(name, source)
+        state_keys.append(f"{path_state_key}:inboundFramesInError")
+        history_keys.append(connection_history_key(path_state_key))
+
+        hls_muxer = hls_muxers.get(name)
+        if hls_muxer:
+            muxer_state_key = hls_muxer_metric_key(name, hls_muxer.get("created"))
+            state_keys.append(f"{muxer_state_key}:outboundFramesDiscarded")
+            history_keys.append(connection_history_key(muxer_state_key))
+
+        pub_key = publisher_connection_key(
+            name, source["type"], connection_identity(source)
+        )
+        state_keys.extend(_connection_state_keys(
+            name, source, direction="publisher", connection_key=pub_key
+        ))
+        if source["type"]:
+            history_keys.append(connection_history_key(pub_key))
+
+        for reader in entry["readers"]:
+            if _is_ignored_reader(reader):
+                continue
+            rd_key = reader_connection_key(
+                name, reader["type"], connection_identity(reader)
+            )
+            state_keys.extend(_connection_state_keys(
+                name, reader, direction="reader", connection_key=rd_key
+            ))
+            history_keys.append(connection_history_key(rd_key))
+
+        known_roles = _node().poll_cache.lifecycle_roles_by_path.get(name, set())
+        for role, connection_type in known_roles | _lifecycle_roles(entry):
+            state_keys.append(
+                connection_lifecycle_key(name, role, connection_type)
+            )
+    return unique_keys(state_keys), history_keys_by_path
+
+
+def _history_buffers() -> HistoryBuffers:
+    """Return the in-process history rings of this node, created on first use."""
+    cache = _node().poll_cache
+    if cache.history_buffers is None:
+        cache.history_buffers = HistoryBuffers(
+            capacity=history_capacity(HISTORY_READ_SECONDS, _node_interval()),
+            span_seconds=HISTORY_READ_SECONDS,
+        )
+    return cache.history_buffers
+
+
+def _carry_history_windows(
+    history_keys_by_path: Dict[str, list[str]], changed_paths: set[str]
+) -> list[str]:
+    """Keep the in-process history rings of unchanged paths.
+
+    Returns the history keys that still have to be read from Redis: keys of new
+    or structurally changed paths and keys without a ring.
+    """
+    buffers = _history_buffers()
+    read_keys: list[str] = []
+    for name, history_keys in history_keys_by_path.items():
+        if name in changed_paths:
+            buffers.discard(history_keys)
+        read_keys.extend(key for key in history_keys if key not in buffers)
+    return unique_keys(read_keys)
+
+
+def _retain_history_windows(history_keys_by_path: Dict[str, list[str]]) -> None:
+    """Keep this cycle's rings for the next one; ended connections drop out."""
+    _history_buffers().retain(
+        key
+        for history_keys in history_keys_by_path.values()
+        for key in history_keys
+    )
+
+
+def _close_ended_rollups(state: CycleState) -> None:
+    """Queue the open rollup buckets of connections missing from this cycle."""
+    for key, tier, record in _node().poll_cache.history_rollups.close_unseen():
+        state.queue_rollup_record(key, tier, record)
+
+
+def _seed_history_windows(histories: Dict[str, list[Dict[str, Any]]]) -> None:
+    buffers = _history_buffers()
+    for key, samples in histories.items():
+        buffers.seed(key, samples)
+
+
+def _connection_state_cache() -> ConnectionStateCache:
+    """Return the process-wide measurement state, created on first use."""
+    node = _node()
+    if node.poll_cache.state_cache is None:
+        node.poll_cache.state_cache = ConnectionStateCache(
+            node.r, default_ttl=BITRATE_TTL
+        )
+    return node.poll_cache.state_cache
+
+
+def _preload_cycle_state(
+    state: CycleState,
+    state_keys: list[str],
+    history_keys: list[str],
+    timestamp: float,
+) -> None:
+    """Rehydrate unknown state and read histories in one round trip.
+
+    Failures fall back to per-key reads during enrichment.
+    """
+    state_keys = state.unknown_keys(state_keys)
+    try:
+        values, histories = _node().snapshot_store.read_cycle_state(
+            state_keys,
+            history_keys,
+            from_timestamp=timestamp - HISTORY_READ_SECONDS,
+            to_timestamp=timestamp,
+        )
+    except (RedisError, ConnectionError, TimeoutError) as exc:
+        logging.warning("Messzustand konnte nicht gelesen werden: %s", exc)
+        return
+    state.load(state_keys, values)
+    _seed_history_windows(histories)
+
+
+def _queue_state_checkpoint(
+    pipeline: Any, state: CycleState, timestamp: float
+) -> list[str]:
+    cache = _node().poll_cache
+    if timestamp < cache.next_state_checkpoint:
+        return []
+    cache.next_state_checkpoint = (
+        timestamp + COLLECTOR_CFG["state_checkpoint_seconds"]
+    )
+    return state.cache.checkpoint_into(pipeline)
+
+
+def _queue_history_samples(
+    store: Any, pipeline: Any, state: CycleState, timestamp: float
+) -> list[str]:
+    """Queue this cycle's samples last, reading back windows the cycle lacked.
+
+    Connections whose history could not be preloaded get their window from the
+    same round trip, so the next cycle carries it instead of reading it again.
+    """
+    buffers = _history_buffers()
+    return store.queue_history_samples(
+        pipeline,
+        state.history_samples,
+        timestamp=timestamp,
+        retention_seconds=HISTORY_RETENTION_SECONDS,
+        ttl_seconds=HISTORY_TTL_SECONDS,
+        read_keys=[
+            key for key, _sample in state.history_samples if key not in buffers
+        ],
+        read_from=timestamp - HISTORY_READ_SECONDS,
+    )
+
+
+def _queue_rollup_records(store: Any, pipeline: Any, state: CycleState) -> None:
+    for connection_key, tier, record in state.rollup_records:
+        store.queue_rollup_record(
+            pipeline,
+            connection_rollup_key(connection_key, tier.name),
+            record,
+            retention_seconds=tier.retention_seconds,
+        )
+
+
+def _retain_read_windows(store: Any, read_keys: list[str], results: Any) -> None:
+    _seed_history_windows(store.decode_history_windows(read_keys, results))
+
+
+def _flush_cycle_state(state: CycleState, timestamp: float) -> None:
+    """Write history samples and due checkpoints or metrics in one pipeline."""
+    node = _node()
+    checkpointed: list[str] = []
+    try:
+        pipeline = node.r.pipeline()
+        checkpointed = _queue_state_checkpoint(pipeline, state, timestamp)
+        # Due cycle metrics ride along instead of costing their own round trip.
+        metrics_summary = _due_cycle_metrics(timestamp)
+        if metrics_summary is not None:
+            node.snapshot_store.queue_snapshot(
+                pipeline, COLLECTOR_METRICS_KEY, metrics_summary
+            )
+        _queue_rollup_records(node.snapshot_store, pipeline, state)
+        read_keys = _queue_history_samples(
+            node.snapshot_store, pipeline, state, timestamp
+        )
+        if (
+            checkpointed
+            or state.history_samples
+            or state.rollup_records
+            or metrics_summary
+        ):
+            _retain_read_windows(
+                node.snapshot_store, read_keys, pipeline.execute()
+            )
+    except (RedisError, ConnectionError, TimeoutError, TypeError, ValueError) as exc:
+        state.cache.mark_dirty(checkpointed)
+        logging.warning("Messzustand konnte nicht geschrieben werden: %s", exc)
+    finally:
+        state.history_samples.clear()
+        state.rollup_records.clear()
+
+
+async def _preload_cycle_state_async(
+    state: CycleState,
+    state_keys: list[str],
+    history_keys: list[str],
+    timestamp: float,
+) -> None:
+    """Awaitable ``_preload_cycle_state()`` for the asyncio runtime."""
+    state_keys = state.unknown_keys(state_keys)
+    try:
+        values, histories = await _node().async_snapshot_store.read_cycle_state(
+            state_keys,
+            history_keys,
+            from_timestamp=timestamp - HISTORY_READ_SECONDS,
+            to_timestamp=timestamp,
+        )
+    except (RedisError, ConnectionError, TimeoutError) as exc:
+        logging.warning("Messzustand konnte nicht gelesen werden: %s", exc)
+        return
+    state.load(state_keys, values)
+    _seed_history_windows(histories)
+
+
+async def _flush_cycle_state_async(state: CycleState, timestamp: float) -> None:
+    """Awaitable ``_flush_cycle_state()`` for the asyncio runtime."""
+    node = _node()
+    checkpointed: list[str] = []
+    try:
+        pipeline = node.async_redis.pipeline()
+        checkpointed = _queue_state_checkpoint(pipeline, state, timestamp)
+        # Due cycle metrics ride along instead of costing their own round trip.
+        metrics_summary = _due_cycle_metrics(timestamp)
+        if metrics_summary is not None:
+            node.async_snapshot_store.queue_snapshot(
+                pipeline, COLLECTOR_METRICS_KEY, metrics_summary
+            )
+        _queue_rollup_records(node.async_snapshot_store, pipeline, state)
+        read_keys = _queue_history_samples(
+            node.async_snapshot_store, pipeline, state, timestamp
+        )
+        if (
+            checkpointed
+            or state.history_samples
+            or state.rollup_records
+            or metrics_summary
+        ):
+            _retain_read_windows(
+                node.async_snapshot_store, read_keys, await pipeline.execute()
+            )
+    except (RedisError, ConnectionError, TimeoutError, TypeError, ValueError) as exc:
+        state.cache.mark_dirty(checkpointed)
+        logging.warning("Messzustand konnte nicht geschrieben werden: %s", exc)
+    finally:
+        state.history_samples.clear()
+        state.rollup_records.clear()
+
+
+def checkpoint_connection_state() -> None:
+    """Write pending in-process measurement state, e.g. before shutdown."""
+    node = _node()
+    state_cache = node.poll_cache.state_cache
+    if state_cache is None or node.r is None:
+        return
+    checkpointed: list[str] = []
+    try:
+        pipeline = node.r.pipeline()
+        checkpointed = state_cache.checkpoint_into(pipeline)
+        if checkpointed:
+            pipeline.execute()
+    except (RedisError, ConnectionError, TimeoutError, TypeError, ValueError) as exc:
+        state_cache.mark_dirty(checkpointed)
+        logging.warning("Messzustand-Checkpoint fehlgeschlagen: %s", exc)
+        return
+    if checkpointed:
+        logging.info(
+            "💾 %d Messzustands-Keys nach Redis gesichert.", len(checkpointed)
+        )
+
+
 def _update_connection_history(
     connection: Dict[str, Any],
     *,
-    history_key: str,
+    state: CycleState,
+    connection_key: str,
     direction: str,
     timestamp: float,
-    include_rate_history: bool = False,
-    include_jitter_history: bool = False,
+    history_id: Optional[str] = None,
     rate_average_seconds: Optional[int] = None,
+    on_window_metrics: Optional[Callable[[], None]] = None,
 ) -> None:
-    """Persist optional live history without breaking the current snapshot."""
+    """Queue live history, its window summary, and closed rollup buckets.
+
+    Trend points are not embedded; ``history_id`` names the connection for
+    ``/api/history`` so clients fetch them only for connections they show.
+    ``on_window_metrics`` runs once the batch summary attached window metrics.
+    """
     sample = build_history_sample(
         connection,
         direction,
         timestamp,
     )
-    try:
-        snapshot_store.append_history_sample(
-            history_key,
-            sample,
-            timestamp=timestamp,
-            retention_seconds=HISTORY_RETENTION_SECONDS,
-            ttl_seconds=HISTORY_TTL_SECONDS,
-        )
-        samples = snapshot_store.read_history(
-            history_key,
-            from_timestamp=timestamp - 60,
-            to_timestamp=timestamp,
+    history_key = connection_history_key(connection_key)
+    state.queue_history_sample(history_key, sample)
+    for tier, record in _node().poll_cache.history_rollups.add(
+        connection_key, sample, timestamp
+    ):
+        state.queue_rollup_record(connection_key, tier, record)
+    if history_id is not None:
+        connection["history_id"] = history_id
+    samples = _history_buffers().append(history_key, sample, timestamp)
+    if samples is None:
+        # Without a readable history the windows would silently shrink.
+        return
+    state.queue_window_summary(connection, samples, timestamp, on_window_metrics)
+    if rate_average_seconds is not None:
+        average = average_rate(
+            samples,
+            direction,
+            timestamp,
+            rate_average_seconds,
         )
-        summary = summarize_history(samples, timestamp)
-        if summary:
-            connection["window_metrics"] = summary
-        if include_rate_history:
-            connection["rate_history"] = rate_history(samples, direction)
-        if include_jitter_history:
-            connection["jitter_history"] = jitter_history(samples)
-        if rate_average_seconds is not None:
-            average = average_rate(
-                samples,
-                direction,
-                timestamp,
-                rate_average_seconds,
-            )
-            if average is not None:
-                connection.setdefault("rate_metrics", {})[
-                    f"{rate_average_seconds}s"
-                ] = average
-    except (RedisError, ConnectionError, TimeoutError, TypeError, ValueError) as exc:
-        logging.warning("Kurzzeithistorie konnte nicht geschrieben werden: %s", exc)
+        if average is not None:
+            connection.setdefault("rate_metrics", {})[
+                f"{rate_average_seconds}s"
+            ] = average
 
 
 def _enrich_protocol_metrics(
     connection: Dict[str, Any],
     *,
+    state: CycleState,
     connection_type: Optional[str],
     details: Dict[str, Any],
     direction: str,
@@ -345,7 +1071,7 @@ def _enrich_protocol_metrics(
     fields = counter_fields(connection_type, direction)
     if connection_type in RTMP_CONNECTION_TYPES and direction == "reader":
         discard = counter_delta(
-            r,
+            state,
             key=rtmp_frame_discard_key(connection_key),
             value=details.get("outboundFramesDiscarded"),
             ttl=BITRATE_TTL,
@@ -355,7 +1081,7 @@ def _enrich_protocol_metrics(
             connection["frame_discard_delta"] = discard
     else:
         deltas = counter_deltas(
-            r,
+            state,
             base_key=connection_counter_key(connection_key),
             details=details,
             fields=fields,
@@ -379,6 +1105,7 @@ def _enrich_protocol_metrics(
 
 def _observe_lifecycle(
     *,
+    state: CycleState,
     path: str,
     role: str,
     connection_type: str,
@@ -387,11 +1114,12 @@ def _observe_lifecycle(
 ) -> Dict[str, Dict[str, Any]]:
     """Observe lifecycle state without carrying IDs across collector restarts."""
     key = connection_lifecycle_key(path, role, connection_type)
-    reset_baseline = key not in poll_cache.lifecycle_keys_seen
-    poll_cache.lifecycle_keys_seen.add(key)
+    keys_seen = _node().poll_cache.lifecycle_keys_seen
+    reset_baseline = key not in keys_seen
+    keys_seen.add(key)
     try:
         return observe_connection_groups(
-            r,
+            state,
             key=key,
             current_groups=groups,
             timestamp=timestamp,
@@ -403,27 +1131,27 @@ def _observe_lifecycle(
 
 
 def _enrich_rtmp_lifecycle(
-    entry: Dict[str, Any], path: str, timestamp: float
+    entry: Dict[str, Any], path: str, timestamp: float, state: CycleState
 ) -> None:
     """Attach observed changes only to unambiguous RTMP connections."""
     source = entry["source"]
-    current_roles: set[tuple[str, str]] = set()
-    if source.get("type") in RTMP_CONNECTION_TYPES:
-        current_roles.add(("publisher", source["type"]))
+    current_roles = _lifecycle_roles(entry)
 
     readers_by_type: Dict[str, list[Dict[str, Any]]] = {}
     for reader in entry["readers"]:
         if reader.get("type") in RTMP_CONNECTION_TYPES:
-            current_roles.add(("reader", reader["type"]))
             readers_by_type.setdefault(reader["type"], []).append(reader)
 
-    known_roles = poll_cache.lifecycle_roles_by_path.setdefault(path, set())
+    known_roles = _node().poll_cache.lifecycle_roles_by_path.setdefault(
+        path, set()
+    )
     for role, connection_type in known_roles | current_roles:
         if role == "publisher":
             groups = {}
             if source.get("type") == connection_type and source.get("id"):
                 groups["publisher"] = [str(source["id"])]
             results = _observe_lifecycle(
+                state=state,
                 path=path,
                 role=role,
                 connection_type=connection_type,
@@ -445,6 +1173,7 @@ def _enrich_rtmp_lifecycle(
             entries_by_group.setdefault(host, []).append(reader)
 
         results = _observe_lifecycle(
+            state=state,
             path=path,
             role=role,
             connection_type=connection_type,
@@ -458,87 +1187,121 @@ def _enrich_rtmp_lifecycle(
     known_roles.update(current_roles)
 
 
-def collect_and_store() -> Dict[str, float]:
-    """Collect, enrich, and persist one current MediaMTX monitoring snapshot."""
-    cycle_started = time.perf_counter()
-    metrics = {
+def _new_cycle_metrics() -> Dict[str, float]:
+    return {
         "api_duration_ms": 0.0,
         "api_request_count": 0.0,
         "history_duration_ms": 0.0,
+        "redis_state_duration_ms": 0.0,
         "redis_snapshot_duration_ms": 0.0,
+        "changed_path_count": 0.0,
     }
 
-    def cycle_fetch(
-        endpoint: str,
-        params: Optional[Dict[str, str]] = None,
-        *,
-        required: bool = False,
-    ) -> Dict[str, Any]:
-        started = time.perf_counter()
-        try:
-            return fetch(endpoint, params=params, required=required)
-        finally:
-            metrics["api_duration_ms"] += (
-                time.perf_counter() - started
-            ) * 1000
-            metrics["api_request_count"] += 1
 
-    now = time.time()
-    version_refresh = COLLECTOR_CFG["version_refresh_seconds"]
-    if poll_cache.mediamtx_version is None or now >= poll_cache.next_version_refresh:
-        try:
-            info = cycle_fetch("/v3/info", required=True)
-        except MediaMTXError as exc:
-            logging.warning("MediaMTX-Version konnte nicht gelesen werden: %s", exc)
-            metrics["cycle_duration_ms"] = (
-                time.perf_counter() - cycle_started
-            ) * 1000
-            return metrics
-        mediamtx_version = info.get("version")
-        if not is_supported_version(mediamtx_version):
-            required = ".".join(str(part) for part in MINIMUM_MEDIAMTX_VERSION)
-            shown_version = mediamtx_version or "unbekannt"
-            logging.error(
-                "❌ MediaMTX %s wird nicht unterstützt; erforderlich ist v%s oder neuer.",
-                shown_version,
-                required,
-            )
-            metrics["cycle_duration_ms"] = (
-                time.perf_counter() - cycle_started
-            ) * 1000
-            return metrics
-        poll_cache.mediamtx_version = str(mediamtx_version)
-        poll_cache.next_version_refresh = now + version_refresh
-    mediamtx_version = poll_cache.mediamtx_version
-    if not is_supported_version(mediamtx_version):
-        required = ".".join(str(part) for part in MINIMUM_MEDIAMTX_VERSION)
-        shown_version = mediamtx_version or "unbekannt"
-        logging.error(
-            "❌ MediaMTX %s wird nicht unterstützt; erforderlich ist v%s oder neuer.",
-            shown_version,
-            required,
+def _finish_cycle(metrics: Dict[str, float], cycle_started: float) -> Dict[str, float]:
+    metrics["cycle_duration_ms"] = (
+        time.perf_counter() - cycle_started
+    ) * 1000
+    _cycle_metrics_window().record(metrics)
+    return metrics
+
+
+def _cycle_metrics_window() -> CycleMetricsWindow:
+    cache = _node().poll_cache
+    if cache.cycle_metrics is None:
+        cache.cycle_metrics = CycleMetricsWindow(
+            COLLECTOR_CFG["metrics_window_cycles"]
         )
-        metrics["cycle_duration_ms"] = (
-            time.perf_counter() - cycle_started
-        ) * 1000
-        return metrics
+    return cache.cycle_metrics
 
-    try:
-        paths = cycle_fetch("/v3/paths/list", required=True).get("items", [])
-    except MediaMTXError as exc:
-        logging.warning("MediaMTX-Paths konnten nicht gelesen werden: %s", exc)
-        metrics["cycle_duration_ms"] = (
-            time.perf_counter() - cycle_started
-        ) * 1000
-        return metrics
-    visible_paths = [
-        path
-        for path in paths
-        if not any(
-            str(path.get("name", "")).startswith(prefix)
-            for prefix in IGNORE_PATH_PREFIXES
+
+def _record_missed_intervals(count: int) -> None:
+    if count > 0:
+        logging.warning(
+            "⏱️ Collector-Durchlauf zu langsam: %d Intervall(e) ausgelassen.", count
+        )
+        _cycle_metrics_window().record_missed(count)
+
+
+def _due_cycle_metrics(now: float) -> Optional[Dict[str, Any]]:
+    """Return the cycle-metrics summary when its publication is due."""
+    cache = _node().poll_cache
+    if now < cache.next_metrics_publish:
+        return None
+    cache.next_metrics_publish = now + COLLECTOR_CFG["metrics_publish_seconds"]
+    summary = _cycle_metrics_window().summary()
+    summary["interval_seconds"] = _node_interval()
+    return summary
+
+
+def _publish_cycle_metrics(now: float) -> None:
+    summary = _due_cycle_metrics(now)
+    if summary is None:
+        return
+    try:
+        _node().snapshot_store.write_snapshot(COLLECTOR_METRICS_KEY, summary)
+    except Exception as e:
+        logging.error(
+            f"❌ Redis-Fehler beim Schreiben von {COLLECTOR_METRICS_KEY}: {e}"
+        )
+
+
+async def _publish_cycle_metrics_async(now: float) -> None:
+    summary = _due_cycle_metrics(now)
+    if summary is None:
+        return
+    try:
+        await _node().async_snapshot_store.write_snapshot(
+            COLLECTOR_METRICS_KEY, summary
+        )
+    except Exception as e:
+        logging.error(
+            f"❌ Redis-Fehler beim Schreiben von {COLLECTOR_METRICS_KEY}: {e}"
+        )
+
+
+def _version_refresh_due(now: float) -> bool:
+    cache = _node().poll_cache
+    return cache.mediamtx_version is None or now >= cache.next_version_refresh
+
+
+def _log_unsupported_version(mediamtx_version: Any) -> None:
+    required = ".".join(str(part) for part in MINIMUM_MEDIAMTX_VERSION)
+    shown_version = mediamtx_version or "unbekannt"
+    logging.error(
+        "❌ MediaMTX %s wird nicht unterstützt; erforderlich ist v%s oder neuer.",
+        shown_version,
+        required,
+    )
+
+
+def _accept_version_info(info: Dict[str, Any], now: float) -> bool:
+    """Cache a freshly read MediaMTX version when it is supported."""
+    mediamtx_version = info.get("version")
+    if not is_supported_version(mediamtx_version):
+        _log_unsupported_version(mediamtx_version)
+        return False
+    cache = _node().poll_cache
+    cache.mediamtx_version = str(mediamtx_version)
+    cache.next_version_refresh = now + COLLECTOR_CFG["version_refresh_seconds"]
+    return True
+
+
+def _visible_paths(paths: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+    return [
+        path
+        for path in paths
+        if not any(
+            str(path.get("name", "")).startswith(prefix)
+            for prefix in IGNORE_PATH_PREFIXES
         )
     ]
+
+
+def _plan_detail_fetches(
+    visible_paths: list[Dict[str, Any]],
+) -> tuple[list[str], list[str]]:
+    """Return active detail types and every list endpoint this cycle needs."""
     active_types = {
         connection.get("type")
         for path in visible_paths
@@ -548,124 +1311,255 @@ def collect_and_store() -> Dict[str, float]:
         ]
         if connection.get("type") in DETAIL_ENDPOINTS
     }
+    detail_types = [
+        obj_type for obj_type in DETAIL_ENDPOINTS if obj_type in active_types
+    ]
+    detail_endpoints = [DETAIL_ENDPOINTS[obj_type] for obj_type in detail_types]
+    if "hlsSession" in active_types:
+        detail_endpoints.append(HLS_MUXER_ENDPOINT)
+    return detail_types, detail_endpoints
+
+
+def _index_detail_responses(
+    detail_types: list[str], responses: Dict[str, Dict[str, Any]]
+) -> tuple[Dict[str, Any], Dict[str, Any]]:
     details = index_details({
-        obj_type: cycle_fetch(DETAIL_ENDPOINTS[obj_type]).get("items", [])
-        for obj_type in DETAIL_ENDPOINTS
-        if obj_type in active_types
+        obj_type: responses[DETAIL_ENDPOINTS[obj_type]].get("items", [])
+        for obj_type in detail_types
     })
     hls_muxers = {}
-    if "hlsSession" in active_types:
+    if HLS_MUXER_ENDPOINT in responses:
         hls_muxers = {
             str(item.get("path")): item
-            for item in cycle_fetch(HLS_MUXER_ENDPOINT).get("items", [])
+            for item in responses[HLS_MUXER_ENDPOINT].get("items", [])
             if isinstance(item, dict) and item.get("path") is not None
         }
+    return details, hls_muxers
 
-    if now >= poll_cache.next_forward_refresh:
-        poll_cache.forward_destinations = {
-            str(path.get("name", "")): cycle_fetch(
-                "/v3/paths/forward/list",
-                params={"path": str(path.get("name", ""))},
-            ).get("items", [])
-            for path in visible_paths
-        }
-        poll_cache.next_forward_refresh = (
-            now + COLLECTOR_CFG["forward_refresh_seconds"]
-        )
 
-    aggregated = []
+def _observe_forward_paths(
+    visible_paths: list[Dict[str, Any]],
+) -> ForwardDestinationRefresher:
+    forward_refresher = _forward_refresher()
+    forward_refresher.observe({
+        str(path.get("name", "")): _forward_fingerprint(path)
+        for path in visible_paths
+    })
+    return forward_refresher
+
+
+def _normalize_entries(
+    visible_paths: list[Dict[str, Any]],
+    details: Dict[str, Any],
+    mediamtx_version: Optional[str],
+) -> tuple[list[tuple[Dict[str, Any], Dict[str, Any]]], set[str]]:
+    """Normalize all paths and return the names whose structure changed.
+
+    Track and media models are rebuilt only for new or changed fingerprints.
+    """
+    cache = _node().poll_cache
+    entries = []
+    changed_paths: set[str] = set()
+    structures: Dict[str, PathStructure] = {}
     for path in visible_paths:
-        name: str = path.get("name", "")
-        forward_destinations = poll_cache.forward_destinations.get(name, [])
-        entry = normalize_stream(
+        name = str(path.get("name", ""))
+        fingerprint = path_fingerprint(path)
+        structure = cache.path_structures.get(name)
+        if structure is None or structure.fingerprint != fingerprint:
+            structure = PathStructure(
+                fingerprint=fingerprint,
+                track_model=build_track_model(path.get("tracks2", []) or []),
+            )
+            changed_paths.add(name)
+        structures[name] = structure
+        entries.append((
             path,
-            details,
-            mediamtx_version,
-            forward_destinations,
+            normalize_stream(
+                path,
+                details,
+                mediamtx_version,
+                cache.forward_destinations.get(path.get("name", ""), []),
+                track_model=structure.track_model,
+            ),
+        ))
+    cache.path_structures = structures
+    return entries, changed_paths
+
+
+def _begin_cycle_state() -> CycleState:
+    state_cache = _connection_state_cache()
+    state_cache.purge_expired()
+    return CycleState(_node().r, state_cache)
+
+
+def _enrich_path(
+    path: Dict[str, Any],
+    entry: Dict[str, Any],
+    *,
+    hls_muxers: Dict[str, Any],
+    state: CycleState,
+    now: float,
+    metrics: Dict[str, float],
+) -> Dict[str, Any]:
+    """Add calculated metrics and short history to one normalized path."""
+    name: str = entry["name"]
+    source = entry["source"]
+    src_type: Optional[str] = source["type"]
+    src_details = source["details"]
+    normalized_readers = entry["readers"]
+    entry["readers"] = []
+
+    path_state_key = _path_state_key(name, source)
+
+    path_delta = counter_delta(
+        state,
+        key=f"{path_state_key}:inboundFramesInError",
+        value=path.get("inboundFramesInError"),
+        ttl=BITRATE_TTL,
+    )
+    path_metrics: Dict[str, Any] = {"scope": "path"}
+    if path_delta is not None:
+        path_metrics["protocol_metrics"] = {
+            "family": "path",
+            "counter_deltas": {"frame_error": path_delta},
+        }
+    _update_connection_history(
+        path_metrics,
+        state=state,
+        connection_key=path_state_key,
+        direction="publisher",
+        timestamp=now,
+        on_window_metrics=partial(entry.__setitem__, "path_metrics", path_metrics),
+    )
+
+    hls_muxer = hls_muxers.get(name)
+    if hls_muxer:
+        muxer_state_key = hls_muxer_metric_key(name, hls_muxer.get("created"))
+        mux_delta = counter_delta(
+            state,
+            key=f"{muxer_state_key}:outboundFramesDiscarded",
+            value=hls_muxer.get("outboundFramesDiscarded"),
+            ttl=BITRATE_TTL,
+        )
+        mux_entry: Dict[str, Any] = {
+            "scope": "hls_muxer",
+            "path": name,
+            "created": hls_muxer.get("created"),
+            "lastRequest": hls_muxer.get("lastRequest"),
+            "outboundBytes": hls_muxer.get("outboundBytes"),
+        }
+        if mux_delta is not None:
+            mux_entry["protocol_metrics"] = {
+                "family": "hls",
+                "counter_deltas": {"mux_discard": mux_delta},
+            }
+        _update_connection_history(
+            mux_entry,
+            state=state,
+            connection_key=muxer_state_key,
+            direction="reader",
+            timestamp=now,
+        )
+        entry["hls_muxer"] = mux_entry
+
+    # Prefer the native SRT receive rate over a byte-counter estimate.
+    api_rx_mbps = src_details.get("mbpsReceiveRate")
+    # Detail counters preserve connection scope; the path counter is a fallback.
+    pub_bytes_value = first_available(src_details, "inboundBytes")
+    if pub_bytes_value is None and src_type == "srtConn":
+        pub_bytes_value = first_available(src_details, "bytesReceived")
+    if pub_bytes_value is None:
+        pub_bytes_value = entry.get("inboundBytes")
+
+    pub_identity = connection_identity(source)
+    pub_key = publisher_connection_key(
+        name,
+        src_type,
+        pub_identity,
+    )
+    pub_calc_mbps = None
+    if pub_bytes_value is not None:
+        pub_calc_mbps = calc_bitrate(
+            state,
+            key=pub_key,
+            bytes_now=int(pub_bytes_value),
+            now=now,
+            min_dt=BITRATE_MIN_DT,
+            smooth_alpha=BITRATE_SMOOTH_ALPHA,
+            smooth_reference_seconds=BITRATE_SMOOTH_REFERENCE_SECONDS,
+            ttl=BITRATE_TTL,
         )
-        source = entry["source"]
-        src_type: Optional[str] = source["type"]
-        src_details = source["details"]
-        normalized_readers = entry["readers"]
-        entry["readers"] = []
 
-        path_state_key = path_metric_key(
-            name,
-            f"{source.get('type')}:{source.get('id')}"
-            if source.get("type") and source.get("id") else None,
+    if api_rx_mbps is not None:
+        entry["source"]["bitrate_mbps"] = round(float(api_rx_mbps), 2)
+    else:
+        entry["source"]["bitrate_mbps"] = pub_calc_mbps
+
+    # SRT transport RTT is provided natively by MediaMTX.
+    if src_type == "srtConn" and src_details.get("msRTT") is not None:
+        entry["source"]["transport_rtt_ms"] = round(
+            float(src_details["msRTT"]), 2
         )
 
-        path_delta = counter_delta(
-            r,
-            key=f"{path_state_key}:inboundFramesInError",
-            value=path.get("inboundFramesInError"),
+    if src_type == "srtConn":
+        if src_details.get("msReceiveTsbPdDelay") is not None:
+            entry["source"]["srt_latency_ms"] = src_details[
+                "msReceiveTsbPdDelay"
+            ]
+        entry["source"]["srt_health"] = build_srt_health(
+            state,
+            key=_srt_health_key(name, source, "publisher"),
+            details=src_details,
+            direction="publisher",
             ttl=BITRATE_TTL,
+            transport_rtt_ms=entry["source"].get("transport_rtt_ms"),
         )
-        path_metrics: Dict[str, Any] = {"scope": "path"}
-        if path_delta is not None:
-            path_metrics["protocol_metrics"] = {
-                "family": "path",
-                "counter_deltas": {"frame_error": path_delta},
-            }
+    else:
+        _enrich_protocol_metrics(
+            entry["source"],
+            state=state,
+            connection_type=src_type,
+            details=src_details,
+            direction="publisher",
+            connection_key=pub_key,
+        )
+
+    if src_type:
+        history_started = time.perf_counter()
         _update_connection_history(
-            path_metrics,
-            history_key=connection_history_key(path_state_key),
+            entry["source"],
+            state=state,
+            connection_key=pub_key,
             direction="publisher",
             timestamp=now,
+            history_id=pub_key if src_type in TREND_CONNECTION_TYPES else None,
         )
-        if path_metrics.get("window_metrics"):
-            entry["path_metrics"] = path_metrics
+        metrics["history_duration_ms"] += (
+            time.perf_counter() - history_started
+        ) * 1000
 
-        hls_muxer = hls_muxers.get(name)
-        if hls_muxer:
-            muxer_state_key = hls_muxer_metric_key(name, hls_muxer.get("created"))
-            mux_delta = counter_delta(
-                r,
-                key=f"{muxer_state_key}:outboundFramesDiscarded",
-                value=hls_muxer.get("outboundFramesDiscarded"),
-                ttl=BITRATE_TTL,
-            )
-            mux_entry: Dict[str, Any] = {
-                "scope": "hls_muxer",
-                "path": name,
-                "created": hls_muxer.get("created"),
-                "lastRequest": hls_muxer.get("lastRequest"),
-                "outboundBytes": hls_muxer.get("outboundBytes"),
-            }
-            if mux_delta is not None:
-                mux_entry["protocol_metrics"] = {
-                    "family": "hls",
-                    "counter_deltas": {"mux_discard": mux_delta},
-                }
-            _update_connection_history(
-                mux_entry,
-                history_key=connection_history_key(muxer_state_key),
-                direction="reader",
-                timestamp=now,
-            )
-            entry["hls_muxer"] = mux_entry
-
-        # Prefer the native SRT receive rate over a byte-counter estimate.
-        api_rx_mbps = src_details.get("mbpsReceiveRate")
-        # Detail counters preserve connection scope; the path counter is a fallback.
-        pub_bytes_value = first_available(src_details, "inboundBytes")
-        if pub_bytes_value is None and src_type == "srtConn":
-            pub_bytes_value = first_available(src_details, "bytesReceived")
-        if pub_bytes_value is None:
-            pub_bytes_value = entry.get("inboundBytes")
-
-        pub_identity = connection_identity(source)
-        pub_key = publisher_connection_key(
-            name,
-            src_type,
-            pub_identity,
-        )
-        pub_calc_mbps = None
-        if pub_bytes_value is not None:
-            pub_calc_mbps = calc_bitrate(
-                r,
-                key=pub_key,
-                bytes_now=int(pub_bytes_value),
+    for rd in normalized_readers:
+        rtype: Optional[str] = rd["type"]
+        rid: Optional[str] = rd["id"]
+        rd_details = rd["details"]
+
+        if _is_ignored_reader(rd):
+            continue
+
+        # Prefer the native SRT send rate over a byte-counter estimate.
+        api_tx_mbps = rd_details.get("mbpsSendRate")
+        rd_bytes_value = first_available(rd_details, "outboundBytes")
+        if rd_bytes_value is None and rtype == "srtConn":
+            rd_bytes_value = first_available(rd_details, "bytesSent")
+
+        reader_identity = connection_identity(rd)
+        rd_key = reader_connection_key(name, rtype, reader_identity)
+        rd_calc_mbps = None
+        if rd_bytes_value is not None:
+            rd_calc_mbps = calc_bitrate(
+                state,
+                key=rd_key,
+                bytes_now=int(rd_bytes_value),
                 now=now,
                 min_dt=BITRATE_MIN_DT,
                 smooth_alpha=BITRATE_SMOOTH_ALPHA,
@@ -673,207 +1567,694 @@ def collect_and_store() -> Dict[str, float]:
                 ttl=BITRATE_TTL,
             )
 
-        if api_rx_mbps is not None:
-            entry["source"]["bitrate_mbps"] = round(float(api_rx_mbps), 2)
-        else:
-            entry["source"]["bitrate_mbps"] = pub_calc_mbps
-
-        # SRT transport RTT is provided natively by MediaMTX.
-        if src_type == "srtConn" and src_details.get("msRTT") is not None:
-            entry["source"]["transport_rtt_ms"] = round(
-                float(src_details["msRTT"]), 2
-            )
+        bitrate_final = (
+            round(float(api_tx_mbps), 2)
+            if api_tx_mbps is not None
+            else rd_calc_mbps
+        )
 
-        if src_type == "srtConn":
-            if src_details.get("msReceiveTsbPdDelay") is not None:
-                entry["source"]["srt_latency_ms"] = src_details[
-                    "msReceiveTsbPdDelay"
+        reader_entry = {
+            "type": rtype,
+            "id": rid,
+            "bitrate_mbps": bitrate_final,
+            "details": rd_details,
+        }
+        if rtype == "srtConn":
+            if rd_details.get("msRTT") is not None:
+                reader_entry["transport_rtt_ms"] = round(
+                    float(rd_details["msRTT"]), 2
+                )
+            if rd_details.get("msSendTsbPdDelay") is not None:
+                reader_entry["srt_latency_ms"] = rd_details[
+                    "msSendTsbPdDelay"
                 ]
-            entry["source"]["srt_health"] = build_srt_health(
-                r,
-                key=publisher_srt_health_key(
-                    name,
-                    src_type,
-                    pub_identity,
-                ),
-                details=src_details,
-                direction="publisher",
+            reader_entry["srt_health"] = build_srt_health(
+                state,
+                key=_srt_health_key(name, rd, "reader"),
+                details=rd_details,
+                direction="reader",
                 ttl=BITRATE_TTL,
-                transport_rtt_ms=entry["source"].get("transport_rtt_ms"),
+                transport_rtt_ms=reader_entry.get("transport_rtt_ms"),
             )
         else:
             _enrich_protocol_metrics(
-                entry["source"],
-                connection_type=src_type,
-                details=src_details,
-                direction="publisher",
-                connection_key=pub_key,
+                reader_entry,
+                state=state,
+                connection_type=rtype,
+                details=rd_details,
+                direction="reader",
+                connection_key=rd_key,
             )
+        history_started = time.perf_counter()
+        _update_connection_history(
+            reader_entry,
+            state=state,
+            connection_key=rd_key,
+            direction="reader",
+            timestamp=now,
+            history_id=rd_key if rtype in RTMP_CONNECTION_TYPES else None,
+            rate_average_seconds=10 if rtype == "hlsSession" else None,
+        )
+        metrics["history_duration_ms"] += (
+            time.perf_counter() - history_started
+        ) * 1000
+        entry["readers"].append(reader_entry)
 
-        if src_type:
-            history_started = time.perf_counter()
-            _update_connection_history(
-                entry["source"],
-                history_key=connection_history_key(pub_key),
-                direction="publisher",
-                timestamp=now,
-                include_rate_history=src_type in RTMP_CONNECTION_TYPES,
-                include_jitter_history=src_type in {
-                    "rtspSession", "rtspsSession", "webRTCSession",
-                },
-            )
-            metrics["history_duration_ms"] += (
-                time.perf_counter() - history_started
-            ) * 1000
+    _enrich_rtmp_lifecycle(entry, name, now, state)
+    return entry
 
-        for rd in normalized_readers:
-            rtype: Optional[str] = rd["type"]
-            rid: Optional[str] = rd["id"]
-            rd_details = rd["details"]
-
-            if IGNORE_LOOPBACK:
-                remote = rd_details.get("remoteAddr", "")
-                if is_loopback(remote):
-                    continue
-
-            # Prefer the native SRT send rate over a byte-counter estimate.
-            api_tx_mbps = rd_details.get("mbpsSendRate")
-            rd_bytes_value = first_available(rd_details, "outboundBytes")
-            if rd_bytes_value is None and rtype == "srtConn":
-                rd_bytes_value = first_available(rd_details, "bytesSent")
-
-            reader_identity = connection_identity(rd)
-            rd_key = reader_connection_key(name, rtype, reader_identity)
-            rd_calc_mbps = None
-            if rd_bytes_value is not None:
-                rd_calc_mbps = calc_bitrate(
-                    r,
-                    key=rd_key,
-                    bytes_now=int(rd_bytes_value),
-                    now=now,
-                    min_dt=BITRATE_MIN_DT,
-                    smooth_alpha=BITRATE_SMOOTH_ALPHA,
-                    smooth_reference_seconds=BITRATE_SMOOTH_REFERENCE_SECONDS,
-                    ttl=BITRATE_TTL,
-                )
 
-            bitrate_final = (
-                round(float(api_tx_mbps), 2)
-                if api_tx_mbps is not None
-                else rd_calc_mbps
-            )
+def _enrich_entries(
+    entries: list[tuple[Dict[str, Any], Dict[str, Any]]],
+    *,
+    hls_muxers: Dict[str, Any],
+    state: CycleState,
+    now: float,
+    metrics: Dict[str, float],
+) -> list[Dict[str, Any]]:
+    """Enrich every normalized path from preloaded in-process state."""
+    aggregated = [
+        _enrich_path(
+            path,
+            entry,
+            hls_muxers=hls_muxers,
+            state=state,
+            now=now,
+            metrics=metrics,
+        )
+        for path, entry in entries
+    ]
+    summary_started = time.perf_counter()
+    _attach_window_summaries(state)
+    metrics["history_duration_ms"] += (
+        time.perf_counter() - summary_started
+    ) * 1000
+    return aggregated
 
-            reader_entry = {
-                "type": rtype,
-                "id": rid,
-                "bitrate_mbps": bitrate_final,
-                "details": rd_details,
-            }
-            if rtype == "srtConn":
-                if rd_details.get("msRTT") is not None:
-                    reader_entry["transport_rtt_ms"] = round(
-                        float(rd_details["msRTT"]), 2
-                    )
-                if rd_details.get("msSendTsbPdDelay") is not None:
-                    reader_entry["srt_latency_ms"] = rd_details[
-                        "msSendTsbPdDelay"
-                    ]
-                reader_entry["srt_health"] = build_srt_health(
-                    r,
-                    key=reader_srt_health_key(
-                        name,
-                        rtype,
-                        reader_identity,
-                    ),
-                    details=rd_details,
-                    direction="reader",
-                    ttl=BITRATE_TTL,
-                    transport_rtt_ms=reader_entry.get("transport_rtt_ms"),
-                )
-            else:
-                _enrich_protocol_metrics(
-                    reader_entry,
-                    connection_type=rtype,
-                    details=rd_details,
-                    direction="reader",
-                    connection_key=rd_key,
-                )
-            history_started = time.perf_counter()
-            _update_connection_history(
-                reader_entry,
-                history_key=connection_history_key(rd_key),
-                direction="reader",
-                timestamp=now,
-                include_rate_history=rtype in RTMP_CONNECTION_TYPES,
-                rate_average_seconds=10 if rtype == "hlsSession" else None,
-            )
-            metrics["history_duration_ms"] += (
-                time.perf_counter() - history_started
+
+def _attach_window_summaries(state: CycleState) -> None:
+    """Summarize all queued windows of the cycle as one batch."""
+    pending = state.window_summaries
+    summaries = summarize_histories(
+        [(samples, timestamp) for _connection, samples, timestamp, _hook in pending]
+    )
+    for (connection, _samples, _timestamp, hook), summary in zip(
+        pending, summaries
+    ):
+        if not summary:
+            continue
+        connection["window_metrics"] = summary
+        if hook is not None:
+            hook()
+    pending.clear()
+
+
+def _seed_snapshot_seq(stored: Any, collected_at: float) -> None:
+    """Continue the stored sequence, or start a new run above any earlier one.
+
+    Without a stored value (first start or flushed Redis) the run starts at
+    the collection time in milliseconds, so sequence numbers held by clients
+    from a previous run can never reappear in the new delta log.
+    """
+    cache = _node().poll_cache
+    if isinstance(stored, int) and not isinstance(stored, bool):
+        cache.snapshot_seq = stored
+    else:
+        cache.snapshot_seq = int(collected_at * 1000)
+
+
+def _plan_snapshot_delta(
+    aggregated: list[Dict[str, Any]], collected_at: float
+) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Diff the snapshot against the last published one.
+
+    Returns the indexed paths and the numbered delta, or ``None`` when no path
+    changed; unchanged cycles then keep their sequence number.
+    """
+    cache = _node().poll_cache
+    current = index_paths(aggregated)
+    delta = diff_snapshots(cache.published_paths, current)
+    if is_empty_delta(delta):
+        return current, None
+    return current, {
+        "seq": cache.snapshot_seq + 1,
+        "collected_at": collected_at,
+        **delta,
+    }
+
+
+def _queue_snapshot_write(
+    store: Any,
+    pipeline: Any,
+    aggregated: list[Dict[str, Any]],
+    current: Dict[str, Any],
+    collected_at: float,
+    delta: Optional[Dict[str, Any]],
+) -> Dict[str, str]:
+    """Queue snapshot, freshness, a numbered delta, and the change notification.
+
+    Only changed paths are serialized, once; the document, the hash fields,
+    and the delta splice the same texts. The notification is published inside
+    the same transaction, so subscribers never read a snapshot older than the
+    one they were told about. Returns the texts of all current paths.
+    """
+    published = _node().poll_cache.published_texts
+    changed = store.encode_paths(delta["upserted"]) if delta is not None else {}
+    path_texts = {
+        name: changed[name] if name in changed else published[name]
+        for name in current
+    }
+    layout = REDIS_CFG["snapshot_layout"]
+    if layout != "hash" and len(current) == len(aggregated):
+        store.queue_path_document(pipeline, REDIS_KEY, list(path_texts.values()))
+    elif layout != "hash":
+        # Duplicate path names cannot be indexed; keep every entry.
+        store.queue_snapshot(pipeline, REDIS_KEY, aggregated)
+    store.queue_snapshot(
+        pipeline, stream_snapshot_freshness_key(REDIS_KEY), collected_at
+    )
+    seq = _node().poll_cache.snapshot_seq if delta is None else delta["seq"]
+    store.queue_notification(
+        pipeline,
+        stream_snapshot_channel_key(REDIS_KEY),
+        {"seq": seq, "collected_at": collected_at},
+    )
+    if delta is None:
+        return path_texts
+    if layout != "key":
+        store.queue_path_changes(
+            pipeline,
+            stream_snapshot_paths_key(REDIS_KEY),
+            stream_snapshot_index_key(REDIS_KEY),
+            delta,
+            path_texts,
+        )
+    store.queue_delta(
+        pipeline,
+        stream_snapshot_delta_key(REDIS_KEY),
+        delta,
+        path_texts,
+        max_length=COLLECTOR_CFG["delta_log_length"],
+    )
+    store.queue_snapshot(
+        pipeline, stream_snapshot_sequence_key(REDIS_KEY), delta["seq"]
+    )
+    return path_texts
+
+
+def _commit_snapshot_delta(
+    current: Dict[str, Any],
+    path_texts: Dict[str, str],
+    delta: Optional[Dict[str, Any]],
+) -> None:
+    cache = _node().poll_cache
+    cache.published_paths = current
+    cache.published_texts = path_texts
+    if delta is not None:
+        cache.snapshot_seq = delta["seq"]
+
+
+def _write_output_file(aggregated: list[Dict[str, Any]], now: float) -> None:
+    cache = _node().poll_cache
+    if now < cache.next_output_write:
+        return
+    output_path = _output_json_path()
+    try:
+        Path(output_path).write_text(
+            json_codec.dumps(aggregated, indent=True), encoding="utf-8"
+        )
+        cache.next_output_write = now + COLLECTOR_CFG["output_refresh_seconds"]
+        logging.info(f"💾 JSON gespeichert unter {output_path}")
+    except Exception as e:
+        logging.error(f"❌ Fehler beim Schreiben der JSON-Datei: {e}")
+
+
+def _log_cycle_metrics(metrics: Dict[str, float]) -> None:
+    logging.debug(
+        "Collector cycle %.2f ms (MediaMTX %.2f ms/%d requests, "
+        "history %.2f ms, state Redis %.2f ms, snapshot Redis %.2f ms)",
+        metrics["cycle_duration_ms"],
+        metrics["api_duration_ms"],
+        int(metrics["api_request_count"]),
+        metrics["history_duration_ms"],
+        metrics["redis_state_duration_ms"],
+        metrics["redis_snapshot_duration_ms"],
+    )
+
+
+def collect_and_store() -> Dict[str, float]:
+    """Collect, enrich, and persist one current MediaMTX monitoring snapshot.
+
+    Cycle metrics go to a rolling window that is published on its own cadence,
+    after failed cycles as well.
+    """
+    metrics = _collect_cycle()
+    _publish_cycle_metrics(time.time())
+    return metrics
+
+
+def _collect_cycle() -> Dict[str, float]:
+    cycle_started = time.perf_counter()
+    metrics = _new_cycle_metrics()
+
+    def cycle_fetch(
+        endpoint: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        required: bool = False,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return fetch(endpoint, params=params, required=required)
+        finally:
+            metrics["api_duration_ms"] += (
+                time.perf_counter() - started
             ) * 1000
-            entry["readers"].append(reader_entry)
+            metrics["api_request_count"] += 1
+
+    now = time.time()
+    if _version_refresh_due(now):
+        try:
+            info = cycle_fetch("/v3/info", required=True)
+        except MediaMTXError as exc:
+            logging.warning("MediaMTX-Version konnte nicht gelesen werden: %s", exc)
+            return _finish_cycle(metrics, cycle_started)
+        if not _accept_version_info(info, now):
+            return _finish_cycle(metrics, cycle_started)
+    mediamtx_version = _node().poll_cache.mediamtx_version
+    if not is_supported_version(mediamtx_version):
+        _log_unsupported_version(mediamtx_version)
+        return _finish_cycle(metrics, cycle_started)
+
+    try:
+        paths = cycle_fetch("/v3/paths/list", required=True).get("items", [])
+    except MediaMTXError as exc:
+        logging.warning("MediaMTX-Paths konnten nicht gelesen werden: %s", exc)
+        return _finish_cycle(metrics, cycle_started)
+    visible_paths = _visible_paths(paths)
+    detail_types, detail_endpoints = _plan_detail_fetches(visible_paths)
+    detail_started = time.perf_counter()
+    try:
+        responses = fetch_all(detail_endpoints)
+    finally:
+        metrics["api_duration_ms"] += (
+            time.perf_counter() - detail_started
+        ) * 1000
+        metrics["api_request_count"] += len(detail_endpoints)
+    details, hls_muxers = _index_detail_responses(detail_types, responses)
+
+    forward_refresher = _observe_forward_paths(visible_paths)
+    if not forward_refresher.running:
+        # Without the background loop (--once, tests) due paths are refreshed
+        # inline so the snapshot still carries their destinations.
+        forward_started = time.perf_counter()
+        forward_requests = forward_refresher.refresh_due()
+        metrics["api_duration_ms"] += (
+            time.perf_counter() - forward_started
+        ) * 1000
+        metrics["api_request_count"] += forward_requests
+
+    entries, changed_paths = _normalize_entries(
+        visible_paths, details, mediamtx_version
+    )
+    metrics["changed_path_count"] = float(len(changed_paths))
+    state = _begin_cycle_state()
+    state_started = time.perf_counter()
+    state_keys, history_keys = _plan_cycle_state(entries, hls_muxers)
+    read_history_keys = _carry_history_windows(history_keys, changed_paths)
+    _preload_cycle_state(state, state_keys, read_history_keys, now)
+    metrics["redis_state_duration_ms"] = (
+        time.perf_counter() - state_started
+    ) * 1000
 
-        _enrich_rtmp_lifecycle(entry, name, now)
-        aggregated.append(entry)
+    aggregated = _enrich_entries(
+        entries, hls_muxers=hls_muxers, state=state, now=now, metrics=metrics
+    )
+    _retain_history_windows(history_keys)
+    _close_ended_rollups(state)
+
+    state_started = time.perf_counter()
+    _flush_cycle_state(state, now)
+    metrics["redis_state_duration_ms"] += (
+        time.perf_counter() - state_started
+    ) * 1000
 
     collected_at = time.time()
     snapshot_started = time.perf_counter()
+    node = _node()
     try:
-        snapshot_store.write_snapshot(REDIS_KEY, aggregated)
-        snapshot_store.write_snapshot(
-            stream_snapshot_freshness_key(REDIS_KEY), collected_at
+        if node.poll_cache.snapshot_seq is None:
+            _seed_snapshot_seq(
+                node.snapshot_store.read_snapshot(
+                    stream_snapshot_sequence_key(REDIS_KEY)
+                ),
+                collected_at,
+            )
+        current, delta = _plan_snapshot_delta(aggregated, collected_at)
+        pipeline = node.r.pipeline()
+        path_texts = _queue_snapshot_write(
+            node.snapshot_store, pipeline, aggregated, current, collected_at, delta
         )
+        pipeline.execute()
+        _commit_snapshot_delta(current, path_texts, delta)
         logging.info(
             f"✅ {len(aggregated)} Pfade in Redis gespeichert (Key: {REDIS_KEY})."
         )
     except Exception as e:
+        # The log may hold part of this delta; restart the chain with a reset.
+        node.poll_cache.published_paths = None
         logging.error(f"❌ Redis-Fehler beim Schreiben von {REDIS_KEY}: {e}")
     finally:
         metrics["redis_snapshot_duration_ms"] = (
             time.perf_counter() - snapshot_started
         ) * 1000
 
-    if now >= poll_cache.next_output_write:
-        try:
-            Path(JSON_OUTPUT_PATH).write_text(
-                json.dumps(aggregated, indent=2), encoding="utf-8"
-            )
-            poll_cache.next_output_write = (
-                now + COLLECTOR_CFG["output_refresh_seconds"]
-            )
-            logging.info(f"💾 JSON gespeichert unter {JSON_OUTPUT_PATH}")
-        except Exception as e:
-            logging.error(f"❌ Fehler beim Schreiben der JSON-Datei: {e}")
+    _write_output_file(aggregated, now)
+    _finish_cycle(metrics, cycle_started)
+    _log_cycle_metrics(metrics)
+    return metrics
 
-    metrics["cycle_duration_ms"] = (
-        time.perf_counter() - cycle_started
+
+async def collect_and_store_async() -> Dict[str, float]:
+    """Asyncio variant of ``collect_and_store()`` with the same metrics dict.
+
+    Independent requests run concurrently, so the cycle time follows the
+    slowest request instead of their sum. Enrichment reads only preloaded
+    in-process state and therefore runs without awaiting per-path I/O.
+    """
+    metrics = await _collect_cycle_async()
+    await _publish_cycle_metrics_async(time.time())
+    return metrics
+
+
+async def _collect_cycle_async() -> Dict[str, float]:
+    cycle_started = time.perf_counter()
+    metrics = _new_cycle_metrics()
+
+    now = time.time()
+    refresh_version = _version_refresh_due(now)
+    requests = [fetch_async("/v3/paths/list", required=True)]
+    if refresh_version:
+        requests.append(fetch_async("/v3/info", required=True))
+    api_started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*requests, return_exceptions=True)
+    finally:
+        metrics["api_duration_ms"] += (time.perf_counter() - api_started) * 1000
+        metrics["api_request_count"] += len(requests)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(
+            result, MediaMTXError
+        ):
+            raise result
+    paths_result = results[0]
+    if refresh_version:
+        info = results[1]
+        if isinstance(info, MediaMTXError):
+            logging.warning("MediaMTX-Version konnte nicht gelesen werden: %s", info)
+            return _finish_cycle(metrics, cycle_started)
+        if not _accept_version_info(info, now):
+            return _finish_cycle(metrics, cycle_started)
+    mediamtx_version = _node().poll_cache.mediamtx_version
+    if not is_supported_version(mediamtx_version):
+        _log_unsupported_version(mediamtx_version)
+        return _finish_cycle(metrics, cycle_started)
+    if isinstance(paths_result, MediaMTXError):
+        logging.warning(
+            "MediaMTX-Paths konnten nicht gelesen werden: %s", paths_result
+        )
+        return _finish_cycle(metrics, cycle_started)
+
+    visible_paths = _visible_paths(paths_result.get("items", []))
+    detail_types, detail_endpoints = _plan_detail_fetches(visible_paths)
+    detail_started = time.perf_counter()
+    try:
+        responses = await fetch_all_async(detail_endpoints)
+    finally:
+        metrics["api_duration_ms"] += (
+            time.perf_counter() - detail_started
+        ) * 1000
+        metrics["api_request_count"] += len(detail_endpoints)
+    details, hls_muxers = _index_detail_responses(detail_types, responses)
+
+    forward_refresher = _observe_forward_paths(visible_paths)
+    if not forward_refresher.running:
+        forward_started = time.perf_counter()
+        forward_requests = await asyncio.to_thread(forward_refresher.refresh_due)
+        metrics["api_duration_ms"] += (
+            time.perf_counter() - forward_started
+        ) * 1000
+        metrics["api_request_count"] += forward_requests
+
+    entries, changed_paths = _normalize_entries(
+        visible_paths, details, mediamtx_version
+    )
+    metrics["changed_path_count"] = float(len(changed_paths))
+    state = _begin_cycle_state()
+    state_started = time.perf_counter()
+    state_keys, history_keys = _plan_cycle_state(entries, hls_muxers)
+    read_history_keys = _carry_history_windows(history_keys, changed_paths)
+    await _preload_cycle_state_async(
+        state, state_keys, read_history_keys, now
+    )
+    metrics["redis_state_duration_ms"] = (
+        time.perf_counter() - state_started
     ) * 1000
-    logging.debug(
-        "Collector cycle %.2f ms (MediaMTX %.2f ms/%d requests, "
-        "history %.2f ms, snapshot Redis %.2f ms)",
-        metrics["cycle_duration_ms"],
-        metrics["api_duration_ms"],
-        int(metrics["api_request_count"]),
-        metrics["history_duration_ms"],
-        metrics["redis_snapshot_duration_ms"],
+
+    aggregated = _enrich_entries(
+        entries, hls_muxers=hls_muxers, state=state, now=now, metrics=metrics
     )
+    _retain_history_windows(history_keys)
+    _close_ended_rollups(state)
+
+    state_started = time.perf_counter()
+    await _flush_cycle_state_async(state, now)
+    metrics["redis_state_duration_ms"] += (
+        time.perf_counter() - state_started
+    ) * 1000
+
+    collected_at = time.time()
+    snapshot_started = time.perf_counter()
+    node = _node()
+    try:
+        if node.poll_cache.snapshot_seq is None:
+            _seed_snapshot_seq(
+                await node.async_snapshot_store.read_snapshot(
+                    stream_snapshot_sequence_key(REDIS_KEY)
+                ),
+                collected_at,
+            )
+        current, delta = _plan_snapshot_delta(aggregated, collected_at)
+        pipeline = node.async_redis.pipeline()
+        path_texts = _queue_snapshot_write(
+            node.async_snapshot_store,
+            pipeline,
+            aggregated,
+            current,
+            collected_at,
+            delta,
+        )
+        await pipeline.execute()
+        _commit_snapshot_delta(current, path_texts, delta)
+        logging.info(
+            f"✅ {len(aggregated)} Pfade in Redis gespeichert (Key: {REDIS_KEY})."
+        )
+    except Exception as e:
+        # The log may hold part of this delta; restart the chain with a reset.
+        node.poll_cache.published_paths = None
+        logging.error(f"❌ Redis-Fehler beim Schreiben von {REDIS_KEY}: {e}")
+    finally:
+        metrics["redis_snapshot_duration_ms"] = (
+            time.perf_counter() - snapshot_started
+        ) * 1000
+
+    if now >= _node().poll_cache.next_output_write:
+        await asyncio.to_thread(_write_output_file, aggregated, now)
+    _finish_cycle(metrics, cycle_started)
+    _log_cycle_metrics(metrics)
     return metrics
 
 
-def _run_interval_loop(job: Callable[[], None], interval_seconds: float) -> None:
-    """Run a fixed-cadence job while skipping intervals missed by slow work."""
-    next_run = time.monotonic() + interval_seconds
+def _missed_intervals(next_run: float, now: float, interval_seconds: float) -> int:
+    """Return how many scheduled starts after ``next_run`` have already passed."""
+    next_run += interval_seconds
+    if next_run > now:
+        return 0
+    return int((now - next_run) // interval_seconds) + 1
+
+
+def _next_run_time(next_run: float, now: float, interval_seconds: float) -> float:
+    """Advance a fixed-cadence schedule, skipping intervals missed by slow work."""
+    missed_intervals = _missed_intervals(next_run, now, interval_seconds)
+    return next_run + interval_seconds + missed_intervals * interval_seconds
+
+
+def _run_interval_loop(
+    job: Callable[[], None],
+    interval_seconds: float,
+    *,
+    first_delay: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Run a fixed-cadence job while skipping intervals missed by slow work.
+
+    The first run starts after one interval unless ``first_delay`` is given.
+    With ``stop`` the loop returns once the event is set.
+    """
+    if first_delay is None:
+        first_delay = interval_seconds
+    next_run = time.monotonic() + first_delay
     while True:
-        time.sleep(max(0.0, next_run - time.monotonic()))
+        delay = max(0.0, next_run - time.monotonic())
+        if stop is None:
+            time.sleep(delay)
+        elif stop.wait(delay):
+            return
         try:
             job()
         except Exception:
             logging.exception("❌ Unbehandelter Fehler im Collector-Durchlauf.")
 
-        next_run += interval_seconds
         now = time.monotonic()
-        if next_run <= now:
-            missed_intervals = int((now - next_run) // interval_seconds) + 1
-            next_run += missed_intervals * interval_seconds
+        _record_missed_intervals(_missed_intervals(next_run, now, interval_seconds))
+        next_run = _next_run_time(next_run, now, interval_seconds)
+
+
+async def _run_interval_loop_async(
+    job: Callable[[], Awaitable[Any]],
+    interval_seconds: float,
+    *,
+    first_delay: Optional[float] = None,
+) -> None:
+    """Asyncio counterpart of ``_run_interval_loop()`` with the same cadence."""
+    if first_delay is None:
+        first_delay = interval_seconds
+    loop = asyncio.get_running_loop()
+    next_run = loop.time() + first_delay
+    while True:
+        await asyncio.sleep(max(0.0, next_run - loop.time()))
+        try:
+            await job()
+        except Exception:
+            logging.exception("❌ Unbehandelter Fehler im Collector-Durchlauf.")
+
+        now = loop.time()
+        _record_missed_intervals(_missed_intervals(next_run, now, interval_seconds))
+        next_run = _next_run_time(next_run, now, interval_seconds)
+
+
+def initialize_async_runtime() -> Any:
+    """Create asyncio Redis and MediaMTX clients next to the blocking ones.
+
+    The blocking clients stay in use for the background forward refresher,
+    unplanned state reads, and the shutdown checkpoint. Returns the shared raw
+    Redis client, which the caller closes.
+    """
+    import redis.asyncio
+
+    raw_redis = redis.asyncio.Redis(
+        host=REDIS_HOST, port=REDIS_PORT, decode_responses=True
+    )
+    for node in _runtime_nodes():
+        _run_in_node(node, _attach_async_clients, raw_redis)
+    return raw_redis
+
+
+def _attach_async_clients(raw_redis: Any) -> None:
+    node = _node()
+    node.async_redis = AsyncNamespacedRedis(
+        raw_redis, REDIS_CFG["namespace"], _node_id()
+    )
+    node.async_snapshot_store = AsyncRedisStore(node.async_redis)
+    node.async_mediamtx_client = AsyncMediaMTXClient(node.mediamtx_client)
+
+
+async def _run_node_async(
+    node: Optional[CollectorNode], run_once: bool, first_delay: float
+) -> None:
+    # Each task runs in its own context copy, so the binding stays local.
+    _current_node.set(node)
+    if run_once:
+        await collect_and_store_async()
+    else:
+        await _run_interval_loop_async(
+            collect_and_store_async, _node_interval(), first_delay=first_delay
+        )
+
+
+async def _run_async_runtime(run_once: bool) -> None:
+    raw_redis = initialize_async_runtime()
+    nodes = _runtime_nodes()
+    try:
+        await asyncio.gather(*(
+            _run_node_async(
+                node, run_once, _run_in_node(node, _start_offset, index, len(nodes))
+            )
+            for index, node in enumerate(nodes)
+        ))
+    finally:
+        await raw_redis.aclose()
+
+
+def _run_node_threads(run_once: bool, stop: threading.Event) -> None:
+    """Run every node in its own thread with its own cycle timing."""
+    nodes = _runtime_nodes()
+    threads = []
+    for index, node in enumerate(nodes):
+        if run_once:
+            args: tuple[Any, ...] = (node, collect_and_store)
+        else:
+            args = (
+                node,
+                partial(
+                    _run_interval_loop,
+                    collect_and_store,
+                    _run_in_node(node, _node_interval),
+                    first_delay=_run_in_node(
+                        node, _start_offset, index, len(nodes)
+                    ),
+                    stop=stop,
+                ),
+            )
+        thread = threading.Thread(
+            target=_run_in_node,
+            args=args,
+            name=f"collector-{node.node_id}" if node else "collector",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    try:
+        # Short joins keep the main thread responsive to SIGTERM and Ctrl+C.
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+    finally:
+        # Let running cycles finish before their state is checkpointed.
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=2.0)
+
+
+def _start_node() -> None:
+    _forward_refresher().start()
+
+
+def _release_node() -> None:
+    """Stop the background refresher and fetch workers of the bound node."""
+    refresher = _node().poll_cache.forward_refresher
+    if refresher is not None:
+        refresher.stop(timeout=1.0)
+    shutdown_fetch_executor()
+
+
+def _shutdown_node() -> None:
+    _release_node()
+    checkpoint_connection_state()
+
+
+def _stop_on_signal(signum: int, _frame: Any) -> None:
+    raise KeyboardInterrupt
 
 
 def main(run_once: bool = False) -> None:
@@ -884,15 +2265,44 @@ def main(run_once: bool = False) -> None:
     )
     initialize_runtime()
 
+    use_asyncio = COLLECTOR_CFG["runtime"] == "asyncio"
+    nodes = _runtime_nodes()
+    stop = threading.Event()
+
     if run_once:
-        collect_and_store()
+        if use_asyncio:
+            asyncio.run(_run_async_runtime(run_once=True))
+        elif collector_nodes:
+            _run_node_threads(run_once=True, stop=stop)
+        else:
+            collect_and_store()
+        for node in nodes:
+            _run_in_node(node, _shutdown_node)
         return
 
-    logging.info("🚀 Stream-Collector gestartet.")
+    # systemd stops the service with SIGTERM; unwind like Ctrl+C so the
+    # in-process measurement state is checkpointed before exit.
+    signal.signal(signal.SIGTERM, _stop_on_signal)
+    for node in nodes:
+        _run_in_node(node, _start_node)
+    logging.info(
+        "🚀 Stream-Collector gestartet (%s, %d Knoten).",
+        COLLECTOR_CFG["runtime"],
+        len(nodes),
+    )
     try:
-        _run_interval_loop(collect_and_store, INTERVAL)
+        if use_asyncio:
+            asyncio.run(_run_async_runtime(run_once=False))
+        elif collector_nodes:
+            _run_node_threads(run_once=False, stop=stop)
+        else:
+            _run_interval_loop(collect_and_store, INTERVAL)
     except KeyboardInterrupt:
         logging.info("🛑 Collector gestoppt.")
+    finally:
+        stop.set()
+        for node in nodes:
+            _run_in_node(node, _shutdown_node)
 
 
 if __name__ == "__main__":
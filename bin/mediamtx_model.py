@@ -99,6 +99,18 @@ def get_details_by_type(
     return details.get(obj_type or "", {}).get(str(obj_id or ""), {})
 
 
+def connection_protocol(connection_type: Any) -> Optional[str]:
+    """Return the lower-case protocol of a connection or source type.
+
+    ``srtConn`` gives ``srt``, ``rtspsSession`` gives ``rtsps`` and
+    ``webRTCSource`` gives ``webrtc``; unknown types keep their lowered name.
+    """
+    if not connection_type:
+        return None
+    name = re.sub(r"(Conn|Session|Source)$", "", str(connection_type))
+    return name.lower() or None
+
+
 def track_codecs(tracks2: Any) -> list[str]:
     """Provide the compact codec list expected by the existing renderer."""
     if not isinstance(tracks2, list):
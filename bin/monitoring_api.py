@@ -2,38 +2,246 @@
 """
 MediaMTX Monitor - read-only monitoring API.
 
-Serves current stream and host-system snapshots, snapshot freshness, frontend
-refresh settings, and the static dashboard.
+Serves current stream and host-system snapshots, incremental stream changes,
+short connection trends, snapshot freshness, collector cycle metrics, frontend
+refresh settings, and the static dashboard. Stream changes are also pushed as
+Server-Sent Events when the collector announces a snapshot write.
 
 Does not poll the MediaMTX Control API, calculate stream metrics, or produce
 monitoring snapshots.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
+import hashlib
 import logging
 from pathlib import Path
+import time
 
 import redis
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
 
 try:
+    from . import json_codec
     from .monitoring_config import (
         DEFAULT_CONFIG_PATH,
         load_monitoring_config,
         resolve_monitoring_config,
     )
-    from .redis_store import NamespacedRedis, RedisStore, SnapshotDecodeError
-    from .redis_keys import stream_snapshot_freshness_key
+    from .redis_store import (
+        AsyncNamespacedRedis,
+        NamespacedRedis,
+        RedisStore,
+        SnapshotDecodeError,
+    )
+    from .connection_history import (
+        HISTORY_RETENTION_SECONDS,
+        jitter_history,
+        rate_history,
+    )
+    from .history_rollup import ROLLUP_TIERS, RollupTier, expand_rollups
+    from .redis_keys import (
+        COLLECTOR_METRICS_KEY,
+        connection_direction,
+        connection_history_key,
+        connection_rollup_key,
+        stream_snapshot_channel_key,
+        stream_snapshot_delta_key,
+        stream_snapshot_freshness_key,
+        stream_snapshot_index_key,
+        stream_snapshot_paths_key,
+        stream_snapshot_sequence_key,
+    )
+    from .reply_cache import ReplyCache
+    from .response_compression import (
+        MIN_COMPRESS_BYTES,
+        CompressedBody,
+        CompressedFileCache,
+        negotiate_encoding,
+        variant_etag,
+    )
+    from .snapshot_delta import merge_deltas
+    from .snapshot_events import (
+        SSE_KEEPALIVE_FRAME,
+        SnapshotBroadcaster,
+        format_sse,
+    )
+    from .stream_query import (
+        PROFILES,
+        ROLES,
+        IndexedStream,
+        StreamQuery,
+        compile_projection,
+        index_stream,
+        parse_fields,
+        project,
+        select_streams,
+    )
 except ImportError:
+    import json_codec
     from monitoring_config import (
         DEFAULT_CONFIG_PATH,
         load_monitoring_config,
         resolve_monitoring_config,
     )
-    from redis_store import NamespacedRedis, RedisStore, SnapshotDecodeError
-    from redis_keys import stream_snapshot_freshness_key
+    from redis_store import (
+        AsyncNamespacedRedis,
+        NamespacedRedis,
+        RedisStore,
+        SnapshotDecodeError,
+    )
+    from connection_history import (
+        HISTORY_RETENTION_SECONDS,
+        jitter_history,
+        rate_history,
+    )
+    from history_rollup import ROLLUP_TIERS, RollupTier, expand_rollups
+    from redis_keys import (
+        COLLECTOR_METRICS_KEY,
+        connection_direction,
+        connection_history_key,
+        connection_rollup_key,
+        stream_snapshot_channel_key,
+        stream_snapshot_delta_key,
+        stream_snapshot_freshness_key,
+        stream_snapshot_index_key,
+        stream_snapshot_paths_key,
+        stream_snapshot_sequence_key,
+    )
+    from reply_cache import ReplyCache
+    from response_compression import (
+        MIN_COMPRESS_BYTES,
+        CompressedBody,
+        CompressedFileCache,
+        negotiate_encoding,
+        variant_etag,
+    )
+    from snapshot_delta import merge_deltas
+    from snapshot_events import (
+        SSE_KEEPALIVE_FRAME,
+        SnapshotBroadcaster,
+        format_sse,
+    )
+    from stream_query import (
+        PROFILES,
+        ROLES,
+        IndexedStream,
+        StreamQuery,
+        compile_projection,
+        index_stream,
+        parse_fields,
+        project,
+        select_streams,
+    )
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response rendered with the shared codec instead of stdlib ``json``."""
+
+    def render(self, content) -> bytes:
+        return json_codec.dumps(content).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class StreamsReply:
+    """One encoded ``/api/streams`` reply with its sequence and strong ETag.
+
+    The ETag names the snapshot ``seq`` and the request ``variant`` rather
+    than the body, whose ``collected_at`` and systeminfo change with every
+    write even when no path did; ``collected_at`` is sent as a header
+    instead. Without a ``seq`` the body is hashed. ``compressed`` holds the
+    UTF-8 body and its compressed variants, which are computed on first
+    request and shared by every client.
+    """
+
+    seq: int | None
+    body: str
+    etag: str
+    collected_at: str | None
+    compressed: CompressedBody
+
+    @classmethod
+    def encode(
+        cls, seq: int | None, body: str, variant: str, collected_at: str | None
+    ) -> "StreamsReply":
+        payload = body.encode("utf-8")
+        if seq is None:
+            etag = f'"{hashlib.blake2b(payload, digest_size=12).hexdigest()}"'
+        else:
+            digest = hashlib.blake2b(variant.encode("utf-8"), digest_size=8)
+            etag = f'"{seq}-{digest.hexdigest()}"'
+        return cls(seq, body, etag, collected_at, CompressedBody(payload))
+
+
+@dataclass(frozen=True)
+class StreamIndexView:
+    """One snapshot decoded once per generation for filtered replies."""
+
+    seq: int | None
+    collected_at: str | None
+    system_payload: str | None
+    streams: list[IndexedStream]
+    by_name: dict[str, IndexedStream]
+
+
+class RawJSONResponse(JSONResponse):
+    """JSON response whose body was already assembled from stored JSON."""
+
+    def render(self, content) -> bytes:
+        return content if isinstance(content, bytes) else content.encode("utf-8")
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Static files compressed once per file version for accepting clients."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        stat = getattr(response, "stat_result", None)
+        if (
+            scope.get("method") != "GET"
+            or response.status_code != 200
+            or not isinstance(response, FileResponse)
+            or stat is None
+            or stat.st_size < MIN_COMPRESS_BYTES
+        ):
+            return response
+        request_headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if encoding is None:
+            return response
+
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name != "content-length"
+        }
+        headers["content-encoding"] = encoding
+        headers["vary"] = "Accept-Encoding"
+        if "etag" in headers:
+            headers["etag"] = variant_etag(headers["etag"], encoding)
+            if _etag_matches(request_headers.get("if-none-match"), headers["etag"]):
+                del headers["content-encoding"]
+                return Response(status_code=304, headers=headers)
+        body = await asyncio.to_thread(
+            static_bodies.get,
+            str(response.path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            encoding,
+        )
+        return Response(content=body, headers=headers)
+
 
 config = resolve_monitoring_config({})
 redis_cfg = config["redis"]
@@ -42,9 +250,18 @@ REDIS_PORT = redis_cfg["port"]
 REDIS_KEY = redis_cfg["key"]
 SYSTEM_REDIS_KEY = config["system_monitor"]["redis_key"]
 VERSION_PATH = Path(__file__).resolve().parents[1] / "VERSION"
+PUSH_KEEPALIVE_SECONDS = 15.0
+PUSH_RETRY_SECONDS = 2.0
 monitor_version = None
 r = None
 snapshot_store = None
+snapshot_events = SnapshotBroadcaster()
+reply_cache = ReplyCache()
+# Per-client ``since`` values make many keys; they must not crowd out streams.
+history_cache = ReplyCache(max_entries=256)
+# Stream index per stored ``seq`` while no snapshot generation is known.
+index_cache = ReplyCache(max_entries=1)
+static_bodies = CompressedFileCache()
 
 
 def load_runtime_config(path: Path | str = DEFAULT_CONFIG_PATH) -> dict:
@@ -94,18 +311,66 @@ def initialize_runtime(config_path: Path | str = DEFAULT_CONFIG_PATH) -> None:
         r.ping()
         snapshot_store = RedisStore(r)
         logging.info("🔌 Verbindung zu Redis hergestellt.")
+        logging.info("JSON-Codec: %s", json_codec.codec_name())
     except Exception as exc:
         logging.error(f"❌ Redis-Verbindung fehlgeschlagen: {exc}")
         raise
 
 
+async def _relay_snapshot_notifications(async_redis: AsyncNamespacedRedis) -> None:
+    """Forward collector snapshot notifications from Redis pub/sub to push clients."""
+    channel = stream_snapshot_channel_key(REDIS_KEY)
+    while True:
+        try:
+            pubsub = await async_redis.subscribe(channel)
+            # Writes missed while unsubscribed count as one change.
+            snapshot_events.publish({})
+            snapshot_events.connected = True
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    event = _decode_or(message.get("data"), {})
+                    snapshot_events.publish(event if isinstance(event, dict) else {})
+            finally:
+                snapshot_events.connected = False
+                await pubsub.aclose()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logging.warning("Snapshot-Benachrichtigungen unterbrochen: %s", exc)
+            await asyncio.sleep(PUSH_RETRY_SECONDS)
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    """Initialize runtime dependencies and validate the static directory."""
+    """Initialize runtime dependencies, validate the static directory, and
+    relay snapshot notifications for push clients while the app runs."""
     initialize_runtime()
     if not static_dir.is_dir():
         raise RuntimeError(f"Directory '{static_dir}' does not exist")
-    yield
+
+    import redis.asyncio
+
+    raw_async_redis = redis.asyncio.Redis(
+        host=REDIS_HOST, port=REDIS_PORT, decode_responses=True
+    )
+    relay = asyncio.create_task(
+        _relay_snapshot_notifications(
+            AsyncNamespacedRedis(
+                raw_async_redis, redis_cfg["namespace"], config["node"]["id"]
+            )
+        )
+    )
+    try:
+        yield
+    finally:
+        relay.cancel()
+        try:
+            await relay
+        except asyncio.CancelledError:
+            pass
+        await raw_async_redis.aclose()
 
 app = FastAPI(
     title="MediaMTX Monitoring API",
@@ -117,7 +382,7 @@ static_dir = Path(config["api_server"]["static_dir"])
 index_file = config["api_server"]["index_file"]
 app.mount(
     "/static",
-    StaticFiles(directory=static_dir, check_dir=False),
+    PrecompressedStaticFiles(directory=static_dir, check_dir=False),
     name="static",
 )
 
@@ -126,40 +391,626 @@ def serve_index():
     """Return the static dashboard entry page."""
     return FileResponse(static_dir / index_file)
 
-@app.get("/api/streams", response_class=JSONResponse, summary="Streamdaten abrufen")
-def get_streams():
-    """Return current snapshots, freshness, and frontend refresh settings."""
+
+def _json_document(payload: str | None, default: str) -> str:
+    """Return stored JSON text for splicing, or ``default`` if it is unusable.
+
+    Only the outer brackets are compared with ``default`` so the document
+    itself is never parsed.
+    """
+    if not payload:
+        return default
+    text = payload.strip()
+    if text[:1] != default[0] or text[-1:] != default[-1]:
+        return default
+    return text
+
+
+def _json_object(members: list[tuple[str, str]]) -> str:
+    """Join already encoded member values into the text of one JSON object."""
+    return "{" + ",".join(f'"{name}":{value}' for name, value in members) + "}"
+
+
+def _encoded_members(members: dict) -> list[tuple[str, str]]:
+    return [(name, json_codec.dumps(value)) for name, value in members.items()]
+
+
+def _decode_or(payload: str | None, default):
+    if payload is None:
+        return default
     try:
-        streams = snapshot_store.read_snapshot(REDIS_KEY)
-        if streams is None:
-            streams = []
+        return json_codec.loads(payload)
+    except json_codec.DecodeError:
+        return default
+
+
+def _streams_delta_reply(since: int) -> tuple[int, str, str | None] | None:
+    """Return ``(seq, reply, collected_at)`` after ``since``.
+
+    ``None`` means the delta log cannot describe the range and a full reply is
+    needed.
+    """
+    values, _paths, deltas = snapshot_store.read_stream_view(
+        [stream_snapshot_freshness_key(REDIS_KEY), SYSTEM_REDIS_KEY],
+        delta_key=stream_snapshot_delta_key(REDIS_KEY),
+    )
+    delta = None if deltas is None else merge_deltas(deltas, since)
+    if delta is None:
+        return None
+    collected_at, system_payload = values
+    return delta["seq"], _streams_reply(
+        _encoded_members({**delta, "delta": True, "since": since}),
+        collected_at,
+        system_payload,
+    ), collected_at
+
+
+def _read_snapshot_view() -> tuple[
+    int | None, str | None, str | None, list[str] | str | None
+]:
+    """Read seq, freshness, system, and stream snapshot of one collector write.
+
+    Streams are the per-path JSON texts in the hash layout and the stored
+    document text otherwise.
+    """
+    hash_layout = redis_cfg["snapshot_layout"] == "hash"
+    keys = _freshness_keys()
+    if not hash_layout:
+        keys.append(REDIS_KEY)
+    values, path_payloads, _deltas = snapshot_store.read_stream_view(
+        keys,
+        paths=(
+            stream_snapshot_paths_key(REDIS_KEY),
+            stream_snapshot_index_key(REDIS_KEY),
+        ) if hash_layout else None,
+    )
+    seq_payload, collected_at, system_payload = values[:3]
+    streams = (path_payloads or []) if hash_layout else values[3]
+    return _decode_or(seq_payload, None), collected_at, system_payload, streams
+
+
+def _streams_full_reply() -> tuple[int | None, str, str | None]:
+    """Return ``(seq, reply, collected_at)``; streams are spliced undecoded."""
+    seq, collected_at, system_payload, stored = _read_snapshot_view()
+    if isinstance(stored, list):
+        streams = "[" + ",".join(stored) + "]"
+    else:
+        streams = _json_document(stored, "[]")
+    return seq, _streams_reply(
+        [
+            ("streams", streams),
+            *_encoded_members({"seq": seq, "delta": False}),
+        ],
+        collected_at,
+        system_payload,
+    ), collected_at
+
+
+def _load_streams_reply(since: int | None) -> StreamsReply:
+    delta = None if since is None else _streams_delta_reply(since)
+    seq, body, collected_at = delta if delta is not None else _streams_full_reply()
+    variant = _reply_variant("streams", since if delta is not None else None)
+    return StreamsReply.encode(seq, body, variant, collected_at)
+
+
+def _snapshot_generation() -> int | None:
+    """Return the notification count while it tracks every collector write."""
+    return snapshot_events.version if snapshot_events.connected else None
+
+
+def _streams_reply_after(since: int | None) -> StreamsReply:
+    """Return the reply as a delta after ``since`` when possible.
+
+    Replies are shared by all viewers until the collector announces its next
+    write; without notifications only simultaneous requests share a read.
+    """
+    return reply_cache.get(
+        _snapshot_generation(), since, lambda: _load_streams_reply(since)
+    )
+
+
+def _load_stream_index() -> StreamIndexView:
+    return _index_view(*_read_snapshot_view())
+
+
+def _index_view(
+    seq: int | None,
+    collected_at: str | None,
+    system_payload: str | None,
+    stored: list[str] | str | None,
+) -> StreamIndexView:
+    if isinstance(stored, list):
+        entries = [(_decode_or(text, None), text) for text in stored]
+    else:
+        document = _decode_or(stored, [])
+        entries = [
+            (entry, json_codec.dumps(entry))
+            for entry in (document if isinstance(document, list) else [])
+        ]
+    streams = [
+        index_stream(entry, text)
+        for entry, text in entries
+        if isinstance(entry, dict)
+    ]
+    return StreamIndexView(
+        seq,
+        collected_at,
+        system_payload,
+        streams,
+        {stream.name: stream for stream in streams},
+    )
+
+
+def _stream_index() -> StreamIndexView:
+    """Return the snapshot index, built once per generation like replies.
+
+    Without notifications the index is kept per stored ``seq`` instead; a
+    request then only reads the sequence and freshness values.
+    """
+    generation = _snapshot_generation()
+    if generation is not None:
+        return reply_cache.get(generation, ("index",), _load_stream_index)
+    seq_payload, collected_at, system_payload = snapshot_store.read_stream_view(
+        _freshness_keys()
+    )[0]
+    seq = _decode_or(seq_payload, None)
+    view = index_cache.get(
+        seq if isinstance(seq, int) else None, ("index",), _load_stream_index
+    )
+    if view.seq != seq:
+        return view
+    return replace(view, collected_at=collected_at, system_payload=system_payload)
+
+
+def _freshness_keys() -> list[str]:
+    return [
+        stream_snapshot_sequence_key(REDIS_KEY),
+        stream_snapshot_freshness_key(REDIS_KEY),
+        SYSTEM_REDIS_KEY,
+    ]
+
+
+def _path_view(name: str) -> StreamIndexView:
+    """Return a view holding ``name``, read with one HMGET when uncached."""
+    if _snapshot_generation() is not None or redis_cfg["snapshot_layout"] == "key":
+        return _stream_index()
+    values, path_payloads, _deltas = snapshot_store.read_stream_view(
+        _freshness_keys(),
+        paths=(
+            stream_snapshot_paths_key(REDIS_KEY),
+            stream_snapshot_index_key(REDIS_KEY),
+        ),
+        names=[name],
+    )
+    seq_payload, collected_at, system_payload = values
+    return _index_view(
+        _decode_or(seq_payload, None),
+        collected_at,
+        system_payload,
+        path_payloads or [],
+    )
+
+
+def _stream_text(stream: IndexedStream, fields: tuple[str, ...] | None) -> str:
+    if fields is None:
+        return stream.text
+    return json_codec.dumps(project(stream.entry, compile_projection(fields)))
+
+
+def _load_query_reply(
+    query: StreamQuery,
+    offset: int,
+    limit: int | None,
+    fields: tuple[str, ...] | None,
+) -> StreamsReply:
+    view = _stream_index()
+    selected = select_streams(view.streams, query)
+    page = selected[offset:None if limit is None else offset + limit]
+    texts = [_stream_text(stream, fields) for stream in page]
+    body = _streams_reply(
+        [
+            ("streams", "[" + ",".join(texts) + "]"),
+            *_encoded_members({
+                "seq": view.seq,
+                "delta": False,
+                "total": len(selected),
+                "offset": offset,
+                "limit": limit,
+            }),
+        ],
+        view.collected_at,
+        view.system_payload,
+    )
+    variant = _reply_variant(
+        "query",
+        query.prefix,
+        query.match,
+        sorted(query.protocols),
+        query.role,
+        offset,
+        limit,
+        fields,
+    )
+    return StreamsReply.encode(view.seq, body, variant, view.collected_at)
+
+
+def _load_path_reply(
+    name: str, fields: tuple[str, ...] | None
+) -> StreamsReply | None:
+    view = _path_view(name)
+    stream = view.by_name.get(name)
+    if stream is None:
+        return None
+    body = _streams_reply(
+        [
+            ("stream", _stream_text(stream, fields)),
+            *_encoded_members({"seq": view.seq}),
+        ],
+        view.collected_at,
+        view.system_payload,
+    )
+    variant = _reply_variant("path", name, fields)
+    return StreamsReply.encode(view.seq, body, variant, view.collected_at)
+
+
+def _collector_interval_seconds() -> int:
+    """Return the write cadence of the collector node this API serves."""
+    collector_cfg = config["collector"]
+    for node in collector_cfg["nodes"]:
+        if node["id"] == config["node"]["id"]:
+            return node["interval_seconds"]
+    return collector_cfg["interval_seconds"]
+
+
+def _reply_settings() -> dict:
+    """Return the members every reply carries that only change on restart."""
+    frontend_cfg = config["frontend"]
+    return {
+        "snapshot_refresh_ms": frontend_cfg["snapshot_refresh_ms"],
+        "streamlist_refresh_ms": frontend_cfg["streamlist_refresh_ms"],
+        "collector_interval_ms": _collector_interval_seconds() * 1000,
+        "monitor_version": monitor_version,
+    }
+
+
+def _reply_variant(*parameters) -> str:
+    """Name a reply for its ETag by its request parameters and settings."""
+    return json_codec.dumps([*parameters, _reply_settings()])
+
+
+def _streams_reply(
+    stream_members: list[tuple[str, str]],
+    collected_at: str | None,
+    system_payload: str | None,
+) -> str:
+    return _json_object([
+        *stream_members,
+        *_encoded_members({
+            "collected_at": _decode_or(collected_at, None),
+            **_reply_settings(),
+        }),
+        ("systeminfo", _json_document(system_payload, "{}")),
+    ])
+
+
+@app.get(
+    "/api/streams",
+    response_class=RawJSONResponse,
+    summary="Streamdaten abrufen",
+)
+def get_streams(
+    since: int | None = None,
+    prefix: str | None = None,
+    match: str | None = None,
+    protocol: str | None = None,
+    role: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+    fields: str | None = None,
+    profile: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+):
+    """Return current snapshots, freshness, and frontend refresh settings.
+
+    With ``since`` set to the ``seq`` of an earlier reply, only the paths
+    changed after it are returned while the delta log still covers that range.
+    All inputs of a reply are read in one round trip from one collector write;
+    the stored snapshots are spliced in as JSON text without being decoded.
+    A client that already holds the reply gets ``304`` for its ETag; larger
+    replies are compressed once per snapshot for all clients.
+
+    ``prefix``, ``match`` (glob), ``protocol`` (comma-separated, e.g.
+    ``srt,rtmp``), ``role`` (``publisher`` or ``reader``), ``offset`` and
+    ``limit`` select a page of paths instead; such replies are never deltas
+    and carry the number of matching paths as ``total``.
+
+    ``fields`` (dotted paths, e.g. ``name,readers.bitrate_mbps``) or
+    ``profile`` (``summary``, ``srt``, ``full``) keep only those fields of
+    every path; projected replies are full replies like filtered ones.
+    """
+    if role is not None and role not in ROLES:
+        return _bad_request(f"role muss einer von {', '.join(ROLES)} sein")
+    projection = _projection(fields, profile)
+    if isinstance(projection, CodecJSONResponse):
+        return projection
+    filters = (prefix, match, protocol, role, limit, projection)
+    if offset or any(value is not None for value in filters):
+        query = StreamQuery(
+            prefix=prefix or None,
+            match=match or None,
+            protocols=frozenset(
+                name.strip().lower()
+                for name in (protocol or "").split(",")
+                if name.strip()
+            ),
+            role=role,
+        )
+        offset = max(0, offset)
+        limit = None if limit is None else max(0, limit)
+        reply = reply_cache.get(
+            _snapshot_generation(),
+            ("query", query, offset, limit, projection),
+            lambda: _load_query_reply(query, offset, limit, projection),
+        )
+    else:
+        reply = _streams_reply_after(since)
+    return _reply_response(reply, if_none_match, accept_encoding)
+
+
+def _bad_request(detail: str) -> CodecJSONResponse:
+    return CodecJSONResponse(status_code=400, content={"detail": detail})
+
+
+def _projection(
+    fields: str | None, profile: str | None
+) -> tuple[str, ...] | None | CodecJSONResponse:
+    """Return the requested field list, ``None`` for all fields, or a 400 reply."""
+    if fields:
+        return parse_fields(fields) or None
+    if profile is None:
+        return None
+    if profile not in PROFILES:
+        return _bad_request(f"profile muss einer von {', '.join(PROFILES)} sein")
+    return PROFILES[profile]
+
+
+def _reply_response(
+    reply: StreamsReply, if_none_match: str | None, accept_encoding: str | None
+):
+    """Answer with ``304``, or the reply in the best accepted coding."""
+    body, encoding = reply.compressed.encoded(negotiate_encoding(accept_encoding))
+    headers = {
+        "ETag": variant_etag(reply.etag, encoding),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    # Freshness changes with every write; a ``304`` still carries it.
+    if reply.collected_at is not None:
+        headers["X-Collected-At"] = reply.collected_at
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return RawJSONResponse(content=body, headers=headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Compare ``If-None-Match`` weakly, as RFC 9110 requires for GET."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (
+        tag.removeprefix("W/") for tag in candidates
+    )
+
+
+async def _stream_events(request: Request, since: int | None):
+    """Yield one reply now and one delta reply per announced snapshot write."""
+    retry = f"retry: {int(PUSH_RETRY_SECONDS * 1000)}\n"
+    stale = format_sse(json_codec.dumps({"relay": False}), event="stale")
+    if not snapshot_events.connected:
+        # Without the relay no write is announced; end before reading a
+        # snapshot the client would only receive once and then poll anyway.
+        yield retry + stale
+        return
+    version = snapshot_events.version
+    reply = await asyncio.to_thread(_streams_reply_after, since)
+    yield retry + format_sse(reply.body, event="streams")
+    while not await request.is_disconnected():
+        if not snapshot_events.connected:
+            # Keepalives alone would hide the lost relay; let the client poll.
+            yield stale
+            return
+        update = await snapshot_events.wait_newer(version, PUSH_KEEPALIVE_SECONDS)
+        if update is None:
+            yield SSE_KEEPALIVE_FRAME
+            continue
+        version, _event = update
+        reply = await asyncio.to_thread(_streams_reply_after, reply.seq)
+        yield format_sse(reply.body, event="streams")
+
+
+@app.get(
+    "/api/streams/events",
+    summary="Streamdaten als Server-Sent Events abonnieren",
+)
+async def get_stream_events(request: Request, since: int | None = None):
+    """Push ``/api/streams`` replies whenever the collector writes a snapshot.
+
+    The first event answers like ``/api/streams?since=``; every further event
+    is the delta after the previously sent ``seq``, or a full reply when the
+    delta log no longer covers it. Comment frames keep idle proxies open. While
+    the Redis notification relay is down the stream ends with a ``stale``
+    event, without reading a snapshot first, so clients fall back to polling
+    and reconnect with a backoff.
+    """
+    return StreamingResponse(
+        _stream_events(request, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get(
+    "/api/streams/{path:path}",
+    response_class=RawJSONResponse,
+    summary="Einzelnen Stream abrufen",
+)
+def get_stream(
+    path: str,
+    fields: str | None = None,
+    profile: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+):
+    """Return one path as ``stream`` with the usual freshness fields.
+
+    Path names may contain slashes. A path named ``events`` is only
+    reachable through ``/api/streams?match=events``. ``fields`` and
+    ``profile`` project the path like on ``/api/streams``.
+    """
+    projection = _projection(fields, profile)
+    if isinstance(projection, CodecJSONResponse):
+        return projection
+    reply = reply_cache.get(
+        _snapshot_generation(),
+        ("path", path, projection),
+        lambda: _load_path_reply(path, projection),
+    )
+    if reply is None:
+        return CodecJSONResponse(
+            status_code=404, content={"detail": f"Stream nicht gefunden: {path}"}
+        )
+    return _reply_response(reply, if_none_match, accept_encoding)
+
+
+@app.get(
+    "/api/collector/metrics",
+    response_class=CodecJSONResponse,
+    summary="Collector-Zyklusmetriken abrufen",
+)
+def get_collector_metrics():
+    """Return the rolling collector cycle statistics and their age."""
+    try:
+        summary = snapshot_store.read_snapshot(COLLECTOR_METRICS_KEY)
     except SnapshotDecodeError:
-        streams = []
+        summary = None
+    if not isinstance(summary, dict):
+        return CodecJSONResponse(content={"available": False})
+
+    updated_at = summary.get("updated_at")
+    age_seconds = None
+    if isinstance(updated_at, (int, float)):
+        age_seconds = round(max(0.0, time.time() - updated_at), 3)
+    return CodecJSONResponse(content={
+        **summary,
+        "available": True,
+        "age_seconds": age_seconds,
+    })
+
 
+def _load_history_reply(connection: str, since: float | None) -> dict:
+    direction = connection_direction(connection)
+    oldest = time.time() - HISTORY_RETENTION_SECONDS
     try:
-        collected_at = snapshot_store.read_snapshot(
-            stream_snapshot_freshness_key(REDIS_KEY)
+        samples = snapshot_store.read_history(
+            connection_history_key(connection),
+            from_timestamp=oldest if since is None else max(since, oldest),
+            to_timestamp=float("inf"),
         )
     except SnapshotDecodeError:
-        collected_at = None
+        samples = []
+    if since is not None:
+        samples = [
+            sample for sample in samples
+            if isinstance(sample.get("timestamp"), (int, float))
+            and sample["timestamp"] > since
+        ]
+    rate = rate_history(samples, direction)
+    return {
+        "connection": connection,
+        "rate": rate,
+        "jitter": jitter_history(samples),
+        "until": rate[-1]["timestamp"] if rate else since,
+    }
+
+
+@app.get(
+    "/api/history/{connection:path}",
+    response_class=CodecJSONResponse,
+    summary="Verbindungsverlauf abrufen",
+)
+def get_connection_history(connection: str, since: float | None = None):
+    """Return rate and jitter points of one connection newer than ``since``.
 
+    ``connection`` is the ``history_id`` of a snapshot connection. Clients
+    pass the returned ``until`` as the next ``since`` and append the points.
+    """
+    if connection_direction(connection) is None:
+        return CodecJSONResponse(
+            status_code=404,
+            content={"detail": f"Verbindung nicht gefunden: {connection}"},
+        )
+    reply = history_cache.get(
+        _snapshot_generation(),
+        ("history", connection, since),
+        lambda: _load_history_reply(connection, since),
+    )
+    return CodecJSONResponse(content=reply)
+
+
+def _load_rollup_reply(
+    connection: str, tier: RollupTier, since: float | None
+) -> dict:
+    oldest = time.time() - tier.retention_seconds
     try:
-        systeminfo = snapshot_store.read_snapshot(SYSTEM_REDIS_KEY)
-        if systeminfo is None:
-            systeminfo = {}
+        records = snapshot_store.read_history(
+            connection_rollup_key(connection, tier.name),
+            from_timestamp=oldest if since is None else max(since, oldest),
+            to_timestamp=float("inf"),
+        )
     except SnapshotDecodeError:
-        systeminfo = {}
+        records = []
+    buckets = [
+        bucket for bucket in expand_rollups(records)
+        if since is None or bucket["start"] > since
+    ]
+    return {
+        "connection": connection,
+        "tier": tier.name,
+        "bucket_seconds": tier.bucket_seconds,
+        "buckets": buckets,
+        "until": buckets[-1]["start"] if buckets else since,
+    }
 
-    frontend_cfg = config["frontend"]
 
-    return JSONResponse(content={
-        "streams": streams,
-        "collected_at": collected_at,
-        "snapshot_refresh_ms": frontend_cfg["snapshot_refresh_ms"],
-        "streamlist_refresh_ms": frontend_cfg["streamlist_refresh_ms"],
-        "monitor_version": monitor_version,
-        "systeminfo": systeminfo
-    })
+@app.get(
+    "/api/rollups/{connection:path}",
+    response_class=CodecJSONResponse,
+    summary="Verdichteten Verbindungsverlauf abrufen",
+)
+def get_connection_rollups(
+    connection: str, tier: str = "10s", since: float | None = None
+):
+    """Return closed 10 s or 1 min buckets of one connection after ``since``.
+
+    ``connection`` is a measurement identity such as ``pub:<path>:srtConn:<id>``.
+    Each bucket carries min, max, mean, sum, and count per sample field.
+    """
+    rollup_tier = next((item for item in ROLLUP_TIERS if item.name == tier), None)
+    if rollup_tier is None:
+        return CodecJSONResponse(
+            status_code=404,
+            content={"detail": f"Verdichtungsstufe nicht gefunden: {tier}"},
+        )
+    reply = history_cache.get(
+        _snapshot_generation(),
+        ("rollups", connection, tier, since),
+        lambda: _load_rollup_reply(connection, rollup_tier, since),
+    )
+    return CodecJSONResponse(content=reply)
+
 
 def main() -> None:
     """Run the configured monitoring API server."""
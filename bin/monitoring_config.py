@@ -32,6 +32,7 @@ REDIS_DEFAULTS: Dict[str, Any] = {
     "port": 6379,
     "namespace": "mediamtx-monitor:",
     "key": DEFAULT_STREAM_SNAPSHOT_KEY,
+    "snapshot_layout": "both",
 }
 
 NODE_DEFAULTS: Dict[str, Any] = {
@@ -42,13 +43,27 @@ LEGACY_STREAM_SNAPSHOT_KEY = "mediamtx:streams:latest"
 LEGACY_SYSTEM_SNAPSHOT_KEY = "mediamtx:system:latest"
 NODE_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
 
+COLLECTOR_RUNTIMES = ("threads", "asyncio")
+# "key": one JSON document, "hash": one hash field per path, "both": both.
+SNAPSHOT_LAYOUTS = ("key", "hash", "both")
+
 COLLECTOR_DEFAULTS: Dict[str, Any] = {
     "output_json_path": "/tmp/mediamtx_streams.json",
     "interval_seconds": 1,
+    "runtime": "threads",
     "version_refresh_seconds": 60,
     "forward_refresh_seconds": 5,
+    "forward_revalidate_seconds": 60,
+    "forward_fetch_workers": 4,
     "output_refresh_seconds": 5,
+    "state_checkpoint_seconds": 5,
+    "detail_fetch_workers": 4,
+    "detail_fetch_deadline_seconds": 0.8,
+    "metrics_window_cycles": 300,
+    "metrics_publish_seconds": 5,
+    "delta_log_length": 30,
     "ignore_path_prefixes": ["__preview__/"],
+    "nodes": [],
 }
 
 BITRATE_DEFAULTS: Dict[str, Any] = {
@@ -115,6 +130,10 @@ def resolve_redis_config(config: Mapping[str, Any]) -> Dict[str, Any]:
     resolved["namespace"] = f"{namespace}:"
     if resolved["key"] == LEGACY_STREAM_SNAPSHOT_KEY:
         resolved["key"] = DEFAULT_STREAM_SNAPSHOT_KEY
+    if resolved["snapshot_layout"] not in SNAPSHOT_LAYOUTS:
+        raise ValueError(
+            "redis.snapshot_layout muss 'key', 'hash' oder 'both' sein."
+        )
     return resolved
 
 
@@ -139,14 +158,69 @@ def resolve_node_config(config: Mapping[str, Any]) -> Dict[str, Any]:
     return {"id": node_id}
 
 
+def resolve_collector_nodes(
+    nodes: Any, default_interval_seconds: int
+) -> list[Dict[str, Any]]:
+    """Resolve the optional list of MediaMTX nodes polled by one collector.
+
+    An empty list keeps the single-node mode driven by ``api_base_url`` and
+    ``node.id``.
+    """
+    if nodes is None:
+        return []
+    if not isinstance(nodes, list):
+        raise ValueError("collector.nodes muss eine YAML-Liste sein.")
+    resolved: list[Dict[str, Any]] = []
+    seen: set[str] = set()
+    for entry in nodes:
+        if not isinstance(entry, Mapping) or "id" not in entry:
+            raise ValueError("Jeder Eintrag in collector.nodes braucht eine id.")
+        node = resolve_node_config({"node": entry})
+        if node["id"] in seen:
+            raise ValueError(
+                f"collector.nodes enthält die id {node['id']} mehrfach."
+            )
+        seen.add(node["id"])
+        api_base_url = entry.get("api_base_url")
+        if not isinstance(api_base_url, str) or not api_base_url.strip():
+            raise ValueError(
+                f"collector.nodes[{node['id']}].api_base_url darf nicht leer sein."
+            )
+        node["api_base_url"] = api_base_url.strip()
+        node["interval_seconds"] = int(
+            entry.get("interval_seconds", default_interval_seconds)
+        )
+        resolved.append(node)
+    return resolved
+
+
 def resolve_collector_config(config: Mapping[str, Any]) -> Dict[str, Any]:
     """Resolve collector scheduling, output, and filtering settings."""
     resolved = _component_config(config, "collector", COLLECTOR_DEFAULTS)
     resolved["interval_seconds"] = int(resolved["interval_seconds"])
+    if resolved["runtime"] not in COLLECTOR_RUNTIMES:
+        raise ValueError(
+            "collector.runtime muss 'threads' oder 'asyncio' sein."
+        )
     resolved["version_refresh_seconds"] = int(resolved["version_refresh_seconds"])
     resolved["forward_refresh_seconds"] = int(resolved["forward_refresh_seconds"])
+    resolved["forward_revalidate_seconds"] = int(
+        resolved["forward_revalidate_seconds"]
+    )
+    resolved["forward_fetch_workers"] = int(resolved["forward_fetch_workers"])
     resolved["output_refresh_seconds"] = int(resolved["output_refresh_seconds"])
+    resolved["state_checkpoint_seconds"] = int(resolved["state_checkpoint_seconds"])
+    resolved["detail_fetch_workers"] = int(resolved["detail_fetch_workers"])
+    resolved["detail_fetch_deadline_seconds"] = float(
+        resolved["detail_fetch_deadline_seconds"]
+    )
+    resolved["metrics_window_cycles"] = int(resolved["metrics_window_cycles"])
+    resolved["metrics_publish_seconds"] = int(resolved["metrics_publish_seconds"])
+    resolved["delta_log_length"] = max(1, int(resolved["delta_log_length"]))
     resolved["ignore_path_prefixes"] = list(resolved["ignore_path_prefixes"])
+    resolved["nodes"] = resolve_collector_nodes(
+        resolved["nodes"], resolved["interval_seconds"]
+    )
     return resolved
 
 
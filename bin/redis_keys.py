@@ -11,11 +11,13 @@ from __future__ import annotations
 
 DEFAULT_STREAM_SNAPSHOT_KEY = "streams:latest"
 DEFAULT_SYSTEM_SNAPSHOT_KEY = "system:latest"
+COLLECTOR_METRICS_KEY = "collector:metrics"
 
 _PUBLISHER_PREFIX = "pub"
 _READER_PREFIX = "rd"
 _SRT_HEALTH_PREFIX = "srt-health"
 _CONNECTION_HISTORY_PREFIX = "history"
+_CONNECTION_ROLLUP_PREFIX = "rollup"
 _BITRATE_PREV_BYTES = "prev_bytes"
 _BITRATE_PREV_TS = "prev_ts"
 _BITRATE_EWMA_MBPS = "ewma_mbps"
@@ -45,11 +47,47 @@ def connection_history_key(connection_key: str) -> str:
     return f"{_CONNECTION_HISTORY_PREFIX}:{connection_key}"
 
 
+def connection_rollup_key(connection_key: str, tier: str) -> str:
+    """Build the key of one rollup tier for an existing connection identity."""
+    return f"{_CONNECTION_ROLLUP_PREFIX}:{tier}:{connection_key}"
+
+
+def connection_direction(connection_key: str) -> str | None:
+    """Return the direction of a measurement identity, or ``None`` if unknown."""
+    prefix = connection_key.split(":", 1)[0]
+    return {_PUBLISHER_PREFIX: "publisher", _READER_PREFIX: "reader"}.get(prefix)
+
+
 def stream_snapshot_freshness_key(snapshot_key: str) -> str:
     """Build the collection-timestamp sidecar for a stream snapshot."""
     return f"{snapshot_key}:collected_at"
 
 
+def stream_snapshot_sequence_key(snapshot_key: str) -> str:
+    """Build the sequence-number sidecar for a stream snapshot."""
+    return f"{snapshot_key}:seq"
+
+
+def stream_snapshot_channel_key(snapshot_key: str) -> str:
+    """Build the pub/sub channel announcing each written stream snapshot."""
+    return f"{snapshot_key}:events"
+
+
+def stream_snapshot_paths_key(snapshot_key: str) -> str:
+    """Build the per-path hash holding one snapshot entry per path name."""
+    return f"{snapshot_key}:paths"
+
+
+def stream_snapshot_index_key(snapshot_key: str) -> str:
+    """Build the ordered path-name index of the per-path snapshot hash."""
+    return f"{snapshot_key}:index"
+
+
+def stream_snapshot_delta_key(snapshot_key: str) -> str:
+    """Build the newest-first per-path delta log for a stream snapshot."""
+    return f"{snapshot_key}:deltas"
+
+
 def bitrate_state_keys(base_key: str) -> tuple[str, str, str]:
     """Return previous-byte, timestamp, and EWMA keys for a connection."""
     return (
@@ -1,15 +1,31 @@
 """
 MediaMTX Monitor - Redis snapshot and short-history persistence.
 
-Stores current JSON snapshots without expiration and compact connection-history
-samples with time-based retention and TTL. Key construction, metric calculation,
-and MediaMTX interpretation remain outside this module.
+Stores current JSON snapshots without expiration, optionally as one hash field
+per path, and compact connection-history samples with time-based retention and
+TTL. Path entries are encoded once and spliced into the document, the hash,
+and the delta log. Planned collector measurement state and histories can be read together in one pipelined round trip; history
+appends of a whole cycle can return their trimmed windows from the same
+MULTI/EXEC round trip that writes them. Closed connection rollup buckets are
+kept in sorted sets scored by their bucket start with their own retention. The
+asyncio collector uses awaitable counterparts with the same key prefix and
+encoding.
+Key construction, metric calculation, and MediaMTX interpretation remain
+outside this module.
 """
 
 from __future__ import annotations
 
-import json
-from typing import Any
+import logging
+from typing import Any, Mapping, Optional, Sequence
+
+try:
+    from . import json_codec
+except ImportError:
+    import json_codec
+
+
+logger = logging.getLogger(__name__)
 
 
 def redis_key_prefix(namespace: str, node_id: str) -> str:
@@ -36,6 +52,9 @@ class NamespacedRedis:
     def set(self, key: str, value: Any, **kwargs: Any) -> Any:
         return self._redis.set(self._key(key), value, **kwargs)
 
+    def mget(self, keys: Sequence[str]) -> Any:
+        return self._redis.mget([self._key(key) for key in keys])
+
     def delete(self, *keys: str) -> Any:
         return self._redis.delete(*(self._key(key) for key in keys))
 
@@ -59,7 +78,14 @@ class NamespacedRedis:
             self._key(key), minimum, maximum, **kwargs
         )
 
+    def lrange(self, key: str, start: int, end: int) -> Any:
+        return self._redis.lrange(self._key(key), start, end)
+
+    def hmget(self, key: str, fields: Sequence[str]) -> Any:
+        return self._redis.hmget(self._key(key), list(fields))
+
     def pipeline(self) -> "NamespacedRedisPipeline":
+        """Return a namespaced pipeline; redis-py runs it as MULTI/EXEC."""
         return NamespacedRedisPipeline(self._redis.pipeline(), self.prefix)
 
 
@@ -70,14 +96,146 @@ class NamespacedRedisPipeline:
         self._pipeline = pipeline
         self._prefix = prefix
 
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    def get(self, key: str) -> "NamespacedRedisPipeline":
+        self._pipeline.get(self._key(key))
+        return self
+
+    def mget(self, keys: Sequence[str]) -> "NamespacedRedisPipeline":
+        self._pipeline.mget([self._key(key) for key in keys])
+        return self
+
     def set(self, key: str, value: Any, **kwargs: Any) -> "NamespacedRedisPipeline":
-        self._pipeline.set(f"{self._prefix}{key}", value, **kwargs)
+        self._pipeline.set(self._key(key), value, **kwargs)
+        return self
+
+    def delete(self, *keys: str) -> "NamespacedRedisPipeline":
+        self._pipeline.delete(*(self._key(key) for key in keys))
+        return self
+
+    def zadd(
+        self, key: str, mapping: Any, **kwargs: Any
+    ) -> "NamespacedRedisPipeline":
+        self._pipeline.zadd(self._key(key), mapping, **kwargs)
+        return self
+
+    def zremrangebyscore(
+        self, key: str, minimum: Any, maximum: Any, **kwargs: Any
+    ) -> "NamespacedRedisPipeline":
+        self._pipeline.zremrangebyscore(self._key(key), minimum, maximum, **kwargs)
+        return self
+
+    def expire(
+        self, key: str, ttl_seconds: int, **kwargs: Any
+    ) -> "NamespacedRedisPipeline":
+        self._pipeline.expire(self._key(key), ttl_seconds, **kwargs)
+        return self
+
+    def zrangebyscore(
+        self, key: str, minimum: Any, maximum: Any, **kwargs: Any
+    ) -> "NamespacedRedisPipeline":
+        self._pipeline.zrangebyscore(self._key(key), minimum, maximum, **kwargs)
+        return self
+
+    def lpush(self, key: str, *values: Any) -> "NamespacedRedisPipeline":
+        self._pipeline.lpush(self._key(key), *values)
+        return self
+
+    def ltrim(self, key: str, start: int, end: int) -> "NamespacedRedisPipeline":
+        self._pipeline.ltrim(self._key(key), start, end)
+        return self
+
+    def hset(
+        self, key: str, *, mapping: Mapping[str, Any]
+    ) -> "NamespacedRedisPipeline":
+        self._pipeline.hset(self._key(key), mapping=mapping)
+        return self
+
+    def hdel(self, key: str, *fields: str) -> "NamespacedRedisPipeline":
+        self._pipeline.hdel(self._key(key), *fields)
+        return self
+
+    def hgetall(self, key: str) -> "NamespacedRedisPipeline":
+        self._pipeline.hgetall(self._key(key))
+        return self
+
+    def lrange(self, key: str, start: int, end: int) -> "NamespacedRedisPipeline":
+        self._pipeline.lrange(self._key(key), start, end)
+        return self
+
+    def publish(self, channel: str, message: Any) -> "NamespacedRedisPipeline":
+        self._pipeline.publish(self._key(channel), message)
         return self
 
     def execute(self) -> Any:
         return self._pipeline.execute()
 
 
+class AsyncNamespacedRedis:
+    """Namespaced wrapper around ``redis.asyncio`` for the asyncio collector."""
+
+    def __init__(self, redis_client: Any, namespace: str, node_id: str) -> None:
+        self._redis = redis_client
+        self.prefix = redis_key_prefix(namespace, node_id)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def ping(self) -> Any:
+        return await self._redis.ping()
+
+    async def get(self, key: str) -> Any:
+        return await self._redis.get(self._key(key))
+
+    async def set(self, key: str, value: Any, **kwargs: Any) -> Any:
+        return await self._redis.set(self._key(key), value, **kwargs)
+
+    async def mget(self, keys: Sequence[str]) -> Any:
+        return await self._redis.mget([self._key(key) for key in keys])
+
+    async def delete(self, *keys: str) -> Any:
+        return await self._redis.delete(*(self._key(key) for key in keys))
+
+    async def zrangebyscore(
+        self, key: str, minimum: Any, maximum: Any, **kwargs: Any
+    ) -> Any:
+        return await self._redis.zrangebyscore(
+            self._key(key), minimum, maximum, **kwargs
+        )
+
+    async def lrange(self, key: str, start: int, end: int) -> Any:
+        return await self._redis.lrange(self._key(key), start, end)
+
+    async def hmget(self, key: str, fields: Sequence[str]) -> Any:
+        return await self._redis.hmget(self._key(key), list(fields))
+
+    async def subscribe(self, channel: str) -> Any:
+        """Return a pub/sub connection subscribed to the namespaced channel."""
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self._key(channel))
+        return pubsub
+
+    def pipeline(self) -> "AsyncNamespacedRedisPipeline":
+        return AsyncNamespacedRedisPipeline(self._redis.pipeline(), self.prefix)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+class AsyncNamespacedRedisPipeline(NamespacedRedisPipeline):
+    """Queue namespaced commands like the blocking pipeline; execution is awaited."""
+
+    async def execute(self) -> Any:
+        return await self._pipeline.execute()
+
+
+def _json_list(texts: Sequence[str]) -> str:
+    """Join already encoded JSON values into the text of one JSON array."""
+    return "[" + ",".join(texts) + "]"
+
+
 class SnapshotDecodeError(ValueError):
     """Raised when a stored snapshot is not valid JSON."""
 
@@ -94,8 +252,12 @@ class RedisStore:
 
     def write_snapshot(self, key: str, snapshot: Any) -> None:
         """Serialize and store a snapshot under the supplied configured key."""
-        payload = json.dumps(snapshot)
-        self._redis.set(key, payload)
+        self.queue_snapshot(self._redis, key, snapshot)
+
+    @staticmethod
+    def queue_snapshot(pipeline: Any, key: str, snapshot: Any) -> None:
+        """Queue a serialized snapshot write on a pipeline."""
+        pipeline.set(key, json_codec.dumps(snapshot))
 
     def read_snapshot(self, key: str) -> Any:
         """Return a decoded snapshot, or ``None`` when the key does not exist."""
@@ -103,12 +265,146 @@ class RedisStore:
         if payload is None:
             return None
         try:
-            return json.loads(payload)
-        except json.JSONDecodeError as exc:
+            return json_codec.loads(payload)
+        except json_codec.DecodeError as exc:
             raise SnapshotDecodeError(key) from exc
 
-    def append_history_sample(
+    @staticmethod
+    def encode_paths(entries: Sequence[Mapping[str, Any]]) -> dict[str, str]:
+        """Serialize snapshot entries once, keyed by their path name.
+
+        The texts are spliced into the snapshot document, the per-path hash,
+        and the delta log, so a changed path is encoded once per cycle.
+        """
+        return {
+            str(entry.get("name", "")): json_codec.dumps(entry) for entry in entries
+        }
+
+    @staticmethod
+    def queue_path_document(pipeline: Any, key: str, texts: Sequence[str]) -> None:
+        """Queue a snapshot document spliced from already encoded path texts."""
+        pipeline.set(key, _json_list(texts))
+
+    @staticmethod
+    def queue_delta(
+        pipeline: Any,
+        key: str,
+        delta: Mapping[str, Any],
+        path_texts: Mapping[str, str],
+        *,
+        max_length: int,
+    ) -> None:
+        """Queue a delta at the head of a newest-first log bounded in length.
+
+        Upserted paths are spliced in from ``path_texts`` instead of being
+        serialized again.
+        """
+        upserted = _json_list([
+            path_texts[str(entry.get("name", ""))] for entry in delta["upserted"]
+        ])
+        members = [
+            f'"{name}":'
+            + (upserted if name == "upserted" else json_codec.dumps(value))
+            for name, value in delta.items()
+        ]
+        pipeline.lpush(key, "{" + ",".join(members) + "}")
+        pipeline.ltrim(key, 0, max_length - 1)
+
+    @staticmethod
+    def queue_path_changes(
+        pipeline: Any,
+        paths_key: str,
+        index_key: str,
+        delta: Mapping[str, Any],
+        path_texts: Mapping[str, str],
+    ) -> None:
+        """Queue a snapshot delta on the per-path hash and its name index.
+
+        Only upserted paths are written, from their texts in ``path_texts``;
+        unchanged fields stay untouched. A reset delta replaces the whole hash.
+        """
+        if delta["reset"]:
+            pipeline.delete(paths_key)
+        elif delta["removed"]:
+            pipeline.hdel(paths_key, *delta["removed"])
+        if delta["upserted"]:
+            names = [str(entry.get("name", "")) for entry in delta["upserted"]]
+            pipeline.hset(
+                paths_key, mapping={name: path_texts[name] for name in names}
+            )
+        pipeline.set(index_key, json_codec.dumps(delta["names"]))
+
+    def read_stream_view(
         self,
+        keys: Sequence[str],
+        *,
+        paths: Optional[tuple[str, str]] = None,
+        names: Optional[Sequence[str]] = None,
+        delta_key: Optional[str] = None,
+    ) -> tuple[list[Any], Optional[list[str]], Optional[list[dict[str, Any]]]]:
+        """Read raw values plus optional path payloads and deltas in one round trip.
+
+        ``paths`` is the ``(paths_key, index_key)`` pair of the per-path hash;
+        with ``names`` only those paths are read with one HMGET, unknown names
+        are skipped. Without ``paths`` and ``delta_key`` this is a single MGET.
+        Redis pipelines run as MULTI/EXEC, so every part belongs to the same
+        collector write. Undecodable indexes or delta logs are returned as
+        ``None``.
+        """
+        if paths is None and delta_key is None:
+            return list(self._redis.mget(list(keys))), None, None
+        pipeline = self._redis.pipeline()
+        pipeline.mget(list(keys))
+        if paths is not None and names is None:
+            pipeline.get(paths[1])
+            pipeline.hgetall(paths[0])
+        elif paths is not None and names:
+            pipeline.hmget(paths[0], list(names))
+        if delta_key is not None:
+            pipeline.lrange(delta_key, 0, -1)
+        results = list(pipeline.execute())
+        values = list(results.pop(0))
+
+        path_payloads = None
+        if paths is not None and names is not None:
+            payloads = results.pop(0) if names else []
+            path_payloads = [payload for payload in payloads if payload is not None]
+        elif paths is not None:
+            index_payload, fields = results.pop(0), results.pop(0)
+            try:
+                path_payloads = self._ordered_path_payloads(
+                    paths[1], index_payload, fields
+                )
+            except SnapshotDecodeError as exc:
+                logger.warning("Path-Index nicht lesbar: %s", exc)
+        deltas = None
+        if delta_key is not None:
+            try:
+                deltas = self._decode_payloads(delta_key, results.pop(0) or [])
+            except SnapshotDecodeError as exc:
+                logger.warning("Snapshot-Deltas nicht lesbar: %s", exc)
+        return values, path_payloads, deltas
+
+    @staticmethod
+    def _ordered_path_payloads(
+        index_key: str, index_payload: Any, fields: Mapping[str, str]
+    ) -> list[str]:
+        try:
+            names = json_codec.loads(index_payload) if index_payload else []
+        except json_codec.DecodeError as exc:
+            raise SnapshotDecodeError(index_key) from exc
+        return [fields[name] for name in names if name in fields]
+
+    @staticmethod
+    def queue_notification(
+        pipeline: Any, channel: str, event: dict[str, Any]
+    ) -> None:
+        """Queue a pub/sub notification; inside MULTI it follows the writes."""
+        pipeline.publish(channel, json_codec.dumps(event))
+
+    @staticmethod
+    def queue_history_sample(
+        pipeline: Any,
         key: str,
         sample: dict[str, Any],
         *,
@@ -116,21 +412,185 @@ class RedisStore:
         retention_seconds: float,
         ttl_seconds: int,
     ) -> None:
-        """Append, time-trim, and expire a compact connection sample."""
-        payload = json.dumps(sample, separators=(",", ":"), sort_keys=True)
-        self._redis.zadd(key, {payload: timestamp})
-        self._redis.zremrangebyscore(key, "-inf", timestamp - retention_seconds)
-        self._redis.expire(key, ttl_seconds)
+        """Queue the append, trim, and expiry of one sample on a pipeline."""
+        payload = json_codec.dumps(sample, sort_keys=True)
+        pipeline.zadd(key, {payload: timestamp})
+        pipeline.zremrangebyscore(key, "-inf", timestamp - retention_seconds)
+        pipeline.expire(key, ttl_seconds)
+
+    @staticmethod
+    def queue_rollup_record(
+        pipeline: Any, key: str, record: dict[str, Any], *, retention_seconds: int
+    ) -> None:
+        """Queue one closed rollup bucket, scored by its start, with trimming."""
+        start = record["start"]
+        payload = json_codec.dumps(record, sort_keys=True)
+        pipeline.zadd(key, {payload: start})
+        pipeline.zremrangebyscore(key, "-inf", start - retention_seconds)
+        pipeline.expire(key, retention_seconds)
+
+    @classmethod
+    def queue_history_samples(
+        cls,
+        pipeline: Any,
+        samples: Sequence[tuple[str, dict[str, Any]]],
+        *,
+        timestamp: float,
+        retention_seconds: float,
+        ttl_seconds: int,
+        read_keys: Optional[Sequence[str]] = None,
+        read_from: Optional[float] = None,
+    ) -> list[str]:
+        """Queue sample writes followed by the window reads of ``read_keys``.
+
+        The reads are queued last, after every append and trim, so they see the
+        trimmed windows and form the tail of the pipeline result. Returns the
+        keys in read order for ``decode_history_windows()``.
+        """
+        for key, sample in samples:
+            cls.queue_history_sample(
+                pipeline,
+                key,
+                sample,
+                timestamp=timestamp,
+                retention_seconds=retention_seconds,
+                ttl_seconds=ttl_seconds,
+            )
+        if read_from is None or not read_keys:
+            return []
+        keys = list(dict.fromkeys(read_keys))
+        for key in keys:
+            pipeline.zrangebyscore(key, read_from, timestamp)
+        return keys
+
+    @classmethod
+    def decode_history_windows(
+        cls, read_keys: Sequence[str], results: Any
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Decode the window reads at the end of a pipeline result."""
+        if not read_keys:
+            return {}
+        return cls._decode_cycle_results(
+            [], read_keys, list(results)[-len(read_keys):]
+        )[1]
+
+    def read_cycle_state(
+        self,
+        state_keys: Sequence[str],
+        history_keys: Sequence[str],
+        *,
+        from_timestamp: float,
+        to_timestamp: float,
+    ) -> tuple[list[Any], dict[str, list[dict[str, Any]]]]:
+        """Read planned state values and histories in one pipelined round trip.
+
+        Histories with undecodable members are omitted from the result so one
+        damaged key cannot hide the windows of every other connection.
+        """
+        pipeline = self._redis.pipeline()
+        self._queue_cycle_reads(
+            pipeline, state_keys, history_keys, from_timestamp, to_timestamp
+        )
+        return self._decode_cycle_results(
+            state_keys, history_keys, pipeline.execute()
+        )
+
+    @staticmethod
+    def _queue_cycle_reads(
+        pipeline: Any,
+        state_keys: Sequence[str],
+        history_keys: Sequence[str],
+        from_timestamp: float,
+        to_timestamp: float,
+    ) -> None:
+        if state_keys:
+            pipeline.mget(list(state_keys))
+        for key in history_keys:
+            pipeline.zrangebyscore(key, from_timestamp, to_timestamp)
+
+    @classmethod
+    def _decode_cycle_results(
+        cls,
+        state_keys: Sequence[str],
+        history_keys: Sequence[str],
+        results: Any,
+    ) -> tuple[list[Any], dict[str, list[dict[str, Any]]]]:
+        results = list(results)
+        values = list(results.pop(0)) if state_keys else []
+        histories = {}
+        for key, payloads in zip(history_keys, results):
+            try:
+                histories[key] = cls._decode_payloads(key, payloads)
+            except SnapshotDecodeError as exc:
+                logger.warning("Kurzzeithistorie nicht lesbar: %s", exc)
+        return values, histories
 
     def read_history(
         self, key: str, *, from_timestamp: float, to_timestamp: float
     ) -> list[dict[str, Any]]:
         """Read decoded history samples ordered by their timestamp score."""
         payloads = self._redis.zrangebyscore(key, from_timestamp, to_timestamp)
+        return self._decode_payloads(key, payloads)
+
+    @staticmethod
+    def _decode_payloads(key: str, payloads: Any) -> list[dict[str, Any]]:
         samples = []
         for payload in payloads:
             try:
-                samples.append(json.loads(payload))
-            except json.JSONDecodeError as exc:
+                samples.append(json_codec.loads(payload))
+            except json_codec.DecodeError as exc:
                 raise SnapshotDecodeError(key) from exc
         return samples
+
+
+class AsyncRedisStore:
+    """Awaitable counterpart of ``RedisStore`` for the asyncio collector.
+
+    Serialization, history sample encoding, and cycle-read decoding are shared
+    with ``RedisStore`` so both runtimes store byte-identical data.
+    """
+
+    queue_history_sample = staticmethod(RedisStore.queue_history_sample)
+    queue_history_samples = staticmethod(RedisStore.queue_history_samples)
+    decode_history_windows = staticmethod(RedisStore.decode_history_windows)
+    queue_rollup_record = staticmethod(RedisStore.queue_rollup_record)
+    queue_snapshot = staticmethod(RedisStore.queue_snapshot)
+    encode_paths = staticmethod(RedisStore.encode_paths)
+    queue_path_document = staticmethod(RedisStore.queue_path_document)
+    queue_delta = staticmethod(RedisStore.queue_delta)
+    queue_path_changes = staticmethod(RedisStore.queue_path_changes)
+    queue_notification = staticmethod(RedisStore.queue_notification)
+
+    def __init__(self, redis_client: Any) -> None:
+        self._redis = redis_client
+
+    async def write_snapshot(self, key: str, snapshot: Any) -> None:
+        """Serialize and store a snapshot under the supplied configured key."""
+        await self._redis.set(key, json_codec.dumps(snapshot))
+
+    async def read_snapshot(self, key: str) -> Any:
+        """Return a decoded snapshot, or ``None`` when the key does not exist."""
+        payload = await self._redis.get(key)
+        if payload is None:
+            return None
+        try:
+            return json_codec.loads(payload)
+        except json_codec.DecodeError as exc:
+            raise SnapshotDecodeError(key) from exc
+
+    async def read_cycle_state(
+        self,
+        state_keys: Sequence[str],
+        history_keys: Sequence[str],
+        *,
+        from_timestamp: float,
+        to_timestamp: float,
+    ) -> tuple[list[Any], dict[str, list[dict[str, Any]]]]:
+        """Read planned state values and histories in one pipelined round trip."""
+        pipeline = self._redis.pipeline()
+        RedisStore._queue_cycle_reads(
+            pipeline, state_keys, history_keys, from_timestamp, to_timestamp
+        )
+        return RedisStore._decode_cycle_results(
+            state_keys, history_keys, await pipeline.execute()
+        )
@@ -0,0 +1,89 @@
+"""
+MediaMTX Monitor - per-generation API reply cache.
+
+Lets every viewer of the dashboard share one Redis read and one encoded reply
+per collector snapshot, so API cost no longer grows with the number of viewers.
+
+Responsibilities:
+- Keep encoded replies for the newest snapshot generation, keyed by request,
+  evicting the least recently used reply when the cache is full.
+- Coalesce concurrent misses of the same request into one load.
+
+Does not:
+- Read Redis, build replies, or decide when a new generation begins.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+
+class ReplyCache:
+    """Thread-safe cache of replies for the newest snapshot generation.
+
+    ``generation`` is a monotonically increasing number supplied by the caller.
+    ``None`` means the generation is unknown: nothing is cached, but requests
+    that arrive while an identical load is in flight still share its result.
+    At most ``max_entries`` replies are kept; a new one evicts the least
+    recently used.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation: Optional[int] = None
+        self._entries: dict[Hashable, Any] = {}
+        self._pending: dict[tuple[Optional[int], Hashable], Future] = {}
+
+    def get(
+        self, generation: Optional[int], key: Hashable, load: Callable[[], Any]
+    ) -> Any:
+        token = (generation, key)
+        with self._lock:
+            if (
+                generation is not None
+                and generation == self._generation
+                and key in self._entries
+            ):
+                value = self._entries.pop(key)
+                self._entries[key] = value
+                return value
+            future = self._pending.get(token)
+            owner = future is None
+            if owner:
+                future = self._pending[token] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = load()
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[token]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._pending[token]
+            self._store(generation, key, value)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation = None
+            self._entries = {}
+
+    def _store(self, generation: Optional[int], key: Hashable, value: Any) -> None:
+        if generation is None:
+            return
+        if self._generation is None or generation > self._generation:
+            self._generation = generation
+            self._entries = {}
+        if generation != self._generation:
+            return
+        self._entries.pop(key, None)
+        while self._entries and len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = value
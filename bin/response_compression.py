@@ -0,0 +1,124 @@
+"""
+MediaMTX Monitor - HTTP response compression.
+
+Compresses API replies and static assets once and shares the result with every
+client, so dashboards on slow links receive small responses without the API
+compressing the same bytes again per request.
+
+Responsibilities:
+- Choose a content coding from ``Accept-Encoding`` among installed backends.
+- Keep the compressed variants of one body, computed on first use.
+- Keep compressed static files per file version.
+
+Does not:
+- Build responses, read Redis, or decide which endpoints are compressed.
+"""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+import threading
+from typing import Callable, Optional
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is always available.
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:  # Python < 3.14; gzip is always available.
+    zstd = None
+
+
+MIN_COMPRESS_BYTES = 1024
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+if zstd is not None:
+    COMPRESSORS["zstd"] = lambda body: zstd.compress(body, level=3)
+
+# Preferred first when the client rates several codings equally.
+_PREFERENCE = ("zstd", "br", "gzip")
+ENCODINGS = tuple(name for name in _PREFERENCE if name in COMPRESSORS)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Return the best supported coding for ``Accept-Encoding``, or ``None``."""
+    if not accept_encoding:
+        return None
+    ratings: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            ratings[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for name in ENCODINGS:
+        quality = ratings.get(name, ratings.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def variant_etag(etag: str, encoding: Optional[str]) -> str:
+    """Mark a quoted ETag per coding; each representation needs its own."""
+    if encoding is None:
+        return etag
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return f"{etag}-{encoding}"
+
+
+class CompressedBody:
+    """One body and its compressed variants, each computed at most once."""
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self._variants: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        """Return ``(bytes, coding)``; small bodies are sent uncompressed."""
+        if encoding is None or len(self.body) < MIN_COMPRESS_BYTES:
+            return self.body, None
+        with self._lock:
+            if encoding not in self._variants:
+                self._variants[encoding] = COMPRESSORS[encoding](self.body)
+            return self._variants[encoding], encoding
+
+
+class CompressedFileCache:
+    """Compressed file contents keyed by path, version, and coding."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._max_entries = max_entries
+        self._entries: dict[tuple[str, int, int, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, path: str, mtime_ns: int, size: int, encoding: str
+    ) -> bytes:
+        key = (path, mtime_ns, size, encoding)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None:
+            return cached
+        compressed = COMPRESSORS[encoding](Path(path).read_bytes())
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+            self._entries[key] = compressed
+        return compressed
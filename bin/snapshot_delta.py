@@ -0,0 +1,101 @@
+"""
+MediaMTX Monitor - incremental stream snapshots.
+
+Describes consecutive stream snapshots as per-path changes so clients that
+already hold a snapshot only transfer what changed since their sequence number.
+
+Responsibilities:
+- Diff two snapshots by path name into upserted and removed paths.
+- Merge a newest-first delta log into the changes after a client sequence.
+
+Does not:
+- Perform Redis I/O, assign sequence numbers, or decide the write cadence.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional, Sequence
+
+
+def index_paths(snapshot: Sequence[Mapping[str, Any]]) -> dict[str, Any]:
+    """Index snapshot entries by path name, keeping snapshot order."""
+    return {str(entry.get("name", "")): entry for entry in snapshot}
+
+
+def diff_snapshots(
+    previous: Optional[Mapping[str, Any]],
+    current: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Return the paths added or changed and the names removed since ``previous``.
+
+    ``previous`` is ``None`` when the base is unknown, e.g. after a collector
+    restart; the delta then carries every path and is marked as a reset.
+    """
+    if previous is None:
+        return {
+            "reset": True,
+            "upserted": list(current.values()),
+            "removed": [],
+            "names": list(current),
+        }
+    return {
+        "reset": False,
+        "upserted": [
+            entry
+            for name, entry in current.items()
+            if previous.get(name) != entry
+        ],
+        "removed": [name for name in previous if name not in current],
+        "names": list(current),
+    }
+
+
+def is_empty_delta(delta: Mapping[str, Any]) -> bool:
+    return not delta["reset"] and not delta["upserted"] and not delta["removed"]
+
+
+def merge_deltas(
+    deltas: Sequence[Mapping[str, Any]], since: int
+) -> Optional[dict[str, Any]]:
+    """Combine newest-first deltas into the changes from ``since`` to the newest.
+
+    Returns ``None`` when the log cannot describe that range: the client
+    sequence is unknown, already trimmed, from a previous sequence run, or
+    followed by a reset delta. The caller then answers with a full snapshot.
+    """
+    if not deltas:
+        return None
+    newest = deltas[0]
+    if since > newest["seq"]:
+        return None
+
+    pending = []
+    expected = newest["seq"]
+    for delta in deltas:
+        if delta["seq"] <= since:
+            break
+        if delta["seq"] != expected or delta.get("reset"):
+            return None
+        pending.append(delta)
+        expected -= 1
+    if expected != since:
+        return None
+
+    upserted: dict[str, Any] = {}
+    removed: set[str] = set()
+    for delta in reversed(pending):
+        for name in delta["removed"]:
+            upserted.pop(name, None)
+            removed.add(name)
+        for entry in delta["upserted"]:
+            name = str(entry.get("name", ""))
+            upserted[name] = entry
+            removed.discard(name)
+
+    names = list(newest["names"])
+    return {
+        "seq": newest["seq"],
+        "upserted": [upserted[name] for name in names if name in upserted],
+        "removed": sorted(removed.difference(names)),
+        "names": names,
+    }
@@ -0,0 +1,62 @@
+"""
+MediaMTX Monitor - snapshot change notifications for push clients.
+
+Fans the collector's per-write notifications out to Server-Sent-Event clients
+of the API, so dashboards update once per collector write instead of polling
+on their own cadence.
+
+Responsibilities:
+- Keep the latest notification and wake every waiting client once per write.
+- Format Server-Sent-Event frames.
+
+Does not:
+- Subscribe to Redis, build API replies, or handle HTTP connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Mapping, Optional
+
+
+class SnapshotBroadcaster:
+    """Wake all waiting clients of one event loop when a snapshot was written.
+
+    Clients remember the ``version`` they last saw; a client that is slower
+    than the collector skips intermediate versions instead of queueing them.
+    ``connected`` is true while notifications arrive; only then does an
+    unchanged ``version`` mean that no snapshot was written.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.connected = False
+        self.latest: Optional[dict[str, Any]] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Mapping[str, Any]) -> None:
+        self.version += 1
+        self.latest = dict(event)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_newer(
+        self, version: int, timeout: float
+    ) -> Optional[tuple[int, Optional[dict[str, Any]]]]:
+        """Return ``(version, event)`` once newer than ``version``, else ``None``."""
+        if self.version <= version:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.version, self.latest
+
+
+def format_sse(data: str, *, event: Optional[str] = None) -> str:
+    """Format one Server-Sent-Event frame; multi-line data is split per line."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+SSE_KEEPALIVE_FRAME = ": keepalive\n\n"
@@ -37,6 +37,12 @@ READER_COUNTERS = {
 }
 
 
+def srt_state_keys(key: str, direction: str) -> list[str]:
+    """Return the counter state keys read by ``build_srt_health``."""
+    counters = PUBLISHER_COUNTERS if direction == "publisher" else READER_COUNTERS
+    return [srt_counter_key(key, native_name) for native_name in counters.values()]
+
+
 def counter_delta(redis_client, key: str, value: Any, ttl: int) -> Optional[int]:
     """Store a cumulative SRT counter and return its non-negative delta."""
     if value is None:
@@ -8,6 +8,7 @@ Responsibilities:
 - Join paths, publishers, and readers with indexed connection details.
 - Build the existing base stream, track, and media representation.
 - Provide the stable connection identity fallback used by metric enrichment.
+- Describe the structure of a path so unchanged paths can reuse derived data.
 
 Does not:
 - Perform HTTP requests or persist snapshots.
@@ -61,24 +62,51 @@ def connection_identity(connection: Mapping[str, Any]) -> Any:
     ) or "n/a"
 
 
+def path_fingerprint(path: Mapping[str, Any]) -> tuple[Any, ...]:
+    """Return the structural identity of a raw path, compared by equality.
+
+    Covers the publisher, the set of readers, and the raw track list. Byte and
+    frame counters are deliberately excluded because they change every poll.
+    """
+    source = path.get("source", {}) or {}
+    readers = path.get("readers", []) or []
+    return (
+        source.get("type"),
+        source.get("id"),
+        frozenset((reader.get("type"), reader.get("id")) for reader in readers),
+        path.get("tracks2", []) or [],
+    )
+
+
+def build_track_model(tracks2: Any) -> tuple[list[str], dict[str, Any]]:
+    """Return the compact codec list and media model derived from ``tracks2``."""
+    return track_codecs(tracks2), build_media_model(tracks2)
+
+
 def normalize_stream(
     path: Mapping[str, Any],
     details: Mapping[str, Any],
     mediamtx_version: Any,
     forward_destinations: Any,
+    track_model: Optional[tuple[list[str], dict[str, Any]]] = None,
 ) -> dict[str, Any]:
-    """Build the existing base snapshot object for one raw MediaMTX path."""
+    """Build the existing base snapshot object for one raw MediaMTX path.
+
+    ``track_model`` may carry a previously built result of
+    ``build_track_model`` for the same ``tracks2``.
+    """
     source = path.get("source", {}) or {}
     readers = path.get("readers", []) or []
     tracks2 = path.get("tracks2", []) or []
+    tracks, media = track_model or build_track_model(tracks2)
 
     return {
         "name": path.get("name", ""),
         "mediamtxVersion": mediamtx_version,
         "source": normalize_publisher(source, details),
         "tracks2": tracks2,
-        "tracks": track_codecs(tracks2),
-        "media": build_media_model(tracks2),
+        "tracks": tracks,
+        "media": media,
         "inboundBytes": int(path.get("inboundBytes") or 0),
         "outboundBytes": int(path.get("outboundBytes") or 0),
         "inboundFramesInError": int(path.get("inboundFramesInError") or 0),
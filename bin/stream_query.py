@@ -0,0 +1,165 @@
+"""
+MediaMTX Monitor - stream snapshot queries.
+
+Indexes one stream snapshot by path name, protocol, and connection role so API
+clients can fetch single paths, filtered pages, or only the fields they need
+without receiving the whole node.
+
+Responsibilities:
+- Derive the publisher and reader protocols of every path once per snapshot.
+- Select paths by name prefix, glob, protocol, and role.
+- Compile field lists and named profiles into reusable projection plans.
+
+Does not:
+- Read Redis, encode replies, or decide how long an index is reused.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+try:
+    from .mediamtx_model import connection_protocol
+except ImportError:
+    from mediamtx_model import connection_protocol
+
+
+ROLES = ("publisher", "reader")
+
+_CONNECTION_SUMMARY = ("type", "id", "bitrate_mbps")
+_CONNECTION_SRT = (
+    *_CONNECTION_SUMMARY,
+    "transport_rtt_ms",
+    "srt_latency_ms",
+    "srt_health",
+)
+
+# Named field lists for ``fields``; ``full`` keeps every field.
+PROFILES: dict[str, Optional[tuple[str, ...]]] = {
+    "full": None,
+    "summary": (
+        "name",
+        "tracks",
+        *(f"source.{field}" for field in _CONNECTION_SUMMARY),
+        *(f"readers.{field}" for field in _CONNECTION_SUMMARY),
+    ),
+    "srt": (
+        "name",
+        *(f"source.{field}" for field in _CONNECTION_SRT),
+        *(f"readers.{field}" for field in _CONNECTION_SRT),
+    ),
+}
+
+
+@dataclass(frozen=True)
+class IndexedStream:
+    """One snapshot entry with its stored JSON text and query attributes."""
+
+    name: str
+    text: str
+    entry: Mapping[str, Any]
+    publisher_protocols: frozenset[str]
+    reader_protocols: frozenset[str]
+
+
+@dataclass(frozen=True)
+class StreamQuery:
+    """Path filters; empty fields match every path.
+
+    Without ``role``, ``protocols`` match the publisher or any reader. With
+    ``role`` alone, paths need a publisher or at least one reader.
+    """
+
+    prefix: Optional[str] = None
+    match: Optional[str] = None
+    protocols: frozenset[str] = frozenset()
+    role: Optional[str] = None
+
+    def matches(self, stream: IndexedStream) -> bool:
+        if self.prefix and not stream.name.startswith(self.prefix):
+            return False
+        if self.match and not fnmatchcase(stream.name, self.match):
+            return False
+        if self.role == "publisher":
+            available = stream.publisher_protocols
+        elif self.role == "reader":
+            available = stream.reader_protocols
+        else:
+            available = stream.publisher_protocols | stream.reader_protocols
+        if self.protocols:
+            return not available.isdisjoint(self.protocols)
+        return self.role is None or bool(available)
+
+
+def _protocols(connections: Iterable[Any]) -> frozenset[str]:
+    return frozenset(
+        protocol
+        for connection in connections
+        if isinstance(connection, Mapping)
+        and (protocol := connection_protocol(connection.get("type")))
+    )
+
+
+def index_stream(entry: Mapping[str, Any], text: str) -> IndexedStream:
+    """Index one decoded snapshot entry; ``text`` is spliced into replies."""
+    readers = entry.get("readers")
+    return IndexedStream(
+        name=str(entry.get("name", "")),
+        text=text,
+        entry=entry,
+        publisher_protocols=_protocols([entry.get("source")]),
+        reader_protocols=_protocols(readers if isinstance(readers, list) else []),
+    )
+
+
+def select_streams(
+    streams: Sequence[IndexedStream], query: StreamQuery
+) -> list[IndexedStream]:
+    """Return matching streams in snapshot order."""
+    return [stream for stream in streams if query.matches(stream)]
+
+
+def parse_fields(fields: str) -> tuple[str, ...]:
+    """Split ``name,source.bitrate_mbps`` into unique dotted paths, in order."""
+    return tuple(dict.fromkeys(
+        field.strip() for field in fields.split(",") if field.strip()
+    ))
+
+
+@lru_cache(maxsize=64)
+def compile_projection(fields: tuple[str, ...]) -> Mapping[str, Any]:
+    """Compile dotted paths into a read-only selection tree.
+
+    Leaves are ``True``; a path that selects a whole object wins over deeper
+    paths below it. Plans are cached, so repeated field lists cost nothing.
+    """
+    plan: dict[str, Any] = {}
+    for field in fields:
+        parts = [part for part in field.split(".") if part]
+        node = plan
+        for part in parts[:-1]:
+            if node.get(part) is True:
+                break
+            node = node.setdefault(part, {})
+        else:
+            if parts:
+                node[parts[-1]] = True
+    return plan
+
+
+def project(value: Any, plan: Any) -> Any:
+    """Keep the planned fields; lists are projected element by element."""
+    if plan is True:
+        return value
+    if isinstance(value, list):
+        return [project(item, plan) for item in value]
+    if isinstance(value, Mapping):
+        return {
+            key: project(value[key], selection)
+            for key, selection in plan.items()
+            if key in value
+        }
+    return value
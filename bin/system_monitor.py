@@ -11,7 +11,6 @@ Does not query the MediaMTX Control API or interpret stream and connection data.
 """
 
 import ipaddress
-import json
 import socket
 import time
 import logging
@@ -25,6 +24,7 @@ try:
         load_monitoring_config,
         resolve_monitoring_config,
     )
+    from . import json_codec
     from .redis_store import NamespacedRedis, RedisStore
 except ImportError:
     from monitoring_config import (
@@ -32,6 +32,7 @@ except ImportError:
         load_monitoring_config,
         resolve_monitoring_config,
     )
+    import json_codec
     from redis_store import NamespacedRedis, RedisStore
 
 config = resolve_monitoring_config({})
@@ -221,7 +222,7 @@ def collect_and_store():
         snapshot_store.write_snapshot(REDIS_KEY, data)
         logging.debug("📊 Systemdaten in Redis gespeichert.")
 
-        Path(JSON_OUTPUT_PATH).write_text(json.dumps(data, indent=2))
+        Path(JSON_OUTPUT_PATH).write_text(json_codec.dumps(data, indent=True))
         logging.debug(f"💾 JSON gespeichert unter {JSON_OUTPUT_PATH}")
 
     except Exception as e:
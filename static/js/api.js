@@ -4,25 +4,138 @@
  * Diese Funktion ruft den Endpunkt `/api/streams` auf und gibt ein JSON-Objekt zurück:
  * {
  *   streams: [...],                 // Liste der aktuellen Streams
+ *   seq: Number | null,             // Sequenznummer des Snapshots
  *   collected_at: Number | null,    // Zeitpunkt des letzten Collector-Snapshots
  *   snapshot_refresh_ms: Number,   // Intervall für Snapshot-Reload
  *   streamlist_refresh_ms: Number, // Intervall für Streamliste
  *   monitor_version: String | null // Version des MediaMTX Monitor
  * }
  * 
- * @returns {Promise<Object>} - Datenobjekt oder leeres Fallback-Objekt bei Fehlern
+ * Nach der ersten Antwort wird nur noch `?since=<seq>` abgefragt; die
+ * gelieferten Änderungen werden auf die zuletzt empfangene Liste angewendet.
+ * Wiederholte Abfragen senden das ETag der letzten Antwort mit. Das ETag folgt
+ * der Sequenznummer; bei `304` liefert `fetchStreamsFromApi` nur
+ * `{unchanged: true, collected_at}` aus dem Header `X-Collected-At`, damit das
+ * Datenalter weiterläuft, während die Liste unverändert bleibt.
+ *
+ * `subscribeToStreams` empfängt dieselben Antworten per Server-Sent Events
+ * von `/api/streams/events`, sobald der Collector einen Snapshot schreibt.
+ *
+ * @returns {Promise<Object>} - Datenobjekt, `{unchanged: true, collected_at}`
+ *   bei unveränderten Daten oder leeres Fallback-Objekt bei Fehlern
  */
+import { mergeStreamsReply } from "./stream-delta.js";
+
+let lastSeq = null;
+let lastStreams = [];
+let lastUrl = null;
+let lastEtag = null;
+
+// Liefert `{unchanged: true, collected_at}` nur bei `conditional`, wenn die
+// Antwort unverändert ist (304).
+async function requestStreams(since, conditional = false) {
+  const url = since == null ? "/api/streams" : `/api/streams?since=${since}`;
+  const headers = conditional && url === lastUrl && lastEtag
+    ? {"If-None-Match": lastEtag}
+    : {};
+  // `no-store`: sonst beantwortet der Browser-Cache 304 selbst mit dem alten Inhalt.
+  const res = await fetch(url, {headers, cache: "no-store"});
+  if (conditional && res.status === 304) {
+    const collectedAt = res.headers.get("X-Collected-At");
+    return {unchanged: true, collected_at: collectedAt == null ? null : Number(collectedAt)};
+  }
+  if (!res.ok) throw new Error(`API antwortete mit Status ${res.status}`);
+  lastUrl = url;
+  lastEtag = res.headers.get("ETag");
+  return res.json();
+}
+
+// Wendet eine Antwort an; `null`, wenn das Delta nicht zur lokalen Liste passt.
+function acceptReply(data) {
+  const streams = mergeStreamsReply(lastStreams, data);
+  if (streams == null) return null;
+  const {upserted, removed, names, since, ...rest} = data;
+  lastSeq = data.seq ?? null;
+  lastStreams = streams;
+  return {...rest, streams};
+}
+
 export async function fetchStreamsFromApi() {
   try {
-    const res = await fetch("/api/streams");
-    if (!res.ok) throw new Error(`API antwortete mit Status ${res.status}`);
-    const data = await res.json();
-    return data;
+    const data = await requestStreams(lastSeq, true);
+    if (data.unchanged) return data;
+    return acceptReply(data) ?? acceptReply(await requestStreams(null));
   } catch (err) {
     console.error("❌ Fehler beim API-Fetch:", err);
+    lastSeq = null;
+    lastStreams = [];
+    lastEtag = null;
     return {
       streams: [],
       streamlist_refresh_ms: 1000
     };
   }
 }
+
+// Wartezeit vor dem erneuten Abonnieren; verdoppelt sich bis zum Maximum,
+// solange die Verbindung ohne Push-Event endet.
+const PUSH_RECONNECT_MIN_MS = 2000;
+const PUSH_RECONNECT_MAX_MS = 60000;
+
+/**
+ * Abonniert Push-Aktualisierungen; `onResult` erhält dasselbe Objekt wie
+ * `fetchStreamsFromApi`, `onError` wird bei Verbindungsabbrüchen und bei
+ * einem `stale`-Event aufgerufen, mit dem die API den Stream beendet, solange
+ * sie keine Snapshot-Benachrichtigungen empfängt.
+ *
+ * Nach einem Abbruch verbindet sich das Abonnement selbst neu, mit wachsendem
+ * Abstand und mit `?since=<seq>`, damit die erste Antwort nur die Änderungen
+ * seit der zuletzt empfangenen Liste enthält.
+ *
+ * @returns {{close: Function}|null} - `null`, wenn der Browser kein SSE unterstützt
+ */
+export function subscribeToStreams(onResult, onError) {
+  if (typeof EventSource !== "function") return null;
+
+  let source = null;
+  let reconnectTimer = null;
+  let reconnectMs = PUSH_RECONNECT_MIN_MS;
+
+  function reconnectLater() {
+    if (reconnectTimer != null) return;
+    source.close();
+    onError();
+    // Zufälliger Anteil, damit nicht alle Browser gleichzeitig zurückkehren.
+    const delay = reconnectMs * (0.5 + Math.random() / 2);
+    reconnectMs = Math.min(2 * reconnectMs, PUSH_RECONNECT_MAX_MS);
+    reconnectTimer = setTimeout(connect, delay);
+  }
+
+  function connect() {
+    reconnectTimer = null;
+    const url = lastSeq == null
+      ? "/api/streams/events"
+      : `/api/streams/events?since=${lastSeq}`;
+    source = new EventSource(url);
+    source.addEventListener("streams", async event => {
+      reconnectMs = PUSH_RECONNECT_MIN_MS;
+      try {
+        const result = acceptReply(JSON.parse(event.data))
+          ?? acceptReply(await requestStreams(null));
+        onResult(result);
+      } catch (err) {
+        console.error("❌ Fehler beim Verarbeiten der Push-Daten:", err);
+      }
+    });
+    source.addEventListener("stale", reconnectLater);
+    source.onerror = reconnectLater;
+  }
+
+  connect();
+  return {
+    close() {
+      clearTimeout(reconnectTimer);
+      source.close();
+    },
+  };
+}
@@ -0,0 +1,86 @@
+/**
+ * MediaMTX Monitor - Browser-local connection trends from `/api/history`.
+ *
+ * Snapshots only name a connection's `history_id`; rate and jitter points are
+ * fetched for connections of visible cards and appended incrementally.
+ */
+
+import {TELEMETRY_WINDOW_SECONDS} from "./telemetry-store.js";
+
+const histories = new Map(); // history_id → {rate, jitter, until, pending}
+
+function streamConnections(stream) {
+  return [stream?.source, ...(stream?.readers || [])]
+    .filter(connection => connection?.history_id);
+}
+
+function recentPoints(points, until) {
+  if (until == null) return points;
+  return points.filter(point => point.timestamp > until - TELEMETRY_WINDOW_SECONDS);
+}
+
+async function fetchHistory(historyId, entry, fetchImpl) {
+  if (entry.pending) return false;
+  entry.pending = true;
+  const query = entry.until == null ? "" : `?since=${entry.until}`;
+  try {
+    const res = await fetchImpl(
+      `/api/history/${encodeURIComponent(historyId)}${query}`,
+      {cache: "no-store"},
+    );
+    if (!res.ok) return false;
+    const data = await res.json();
+    entry.until = data.until ?? entry.until;
+    entry.rate = recentPoints([...entry.rate, ...(data.rate || [])], entry.until);
+    entry.jitter = recentPoints([...entry.jitter, ...(data.jitter || [])], entry.until);
+    return (data.rate || []).length > 0;
+  } catch (err) {
+    console.error("Fehler beim Abrufen des Verbindungsverlaufs:", err);
+    return false;
+  } finally {
+    entry.pending = false;
+  }
+}
+
+// Setzt `rate_history`/`jitter_history` aus dem Speicher, damit die
+// Sparkline-Darstellung unverändert bleibt.
+export function attachHistories(streams) {
+  for (const stream of streams) {
+    for (const connection of streamConnections(stream)) {
+      const entry = histories.get(connection.history_id);
+      if (!entry) continue;
+      connection.rate_history = entry.rate;
+      connection.jitter_history = entry.jitter;
+    }
+  }
+}
+
+/**
+ * Holt neue Punkte für alle Verbindungen sichtbarer Streams und vergisst
+ * Verbindungen, die im Snapshot nicht mehr vorkommen.
+ *
+ * @returns {Promise<boolean>} - `true`, wenn neue Punkte angekommen sind
+ */
+export async function refreshHistories(streams, isVisible, fetchImpl = fetch) {
+  const present = new Set();
+  const requests = [];
+  for (const stream of streams) {
+    for (const connection of streamConnections(stream)) {
+      const historyId = connection.history_id;
+      present.add(historyId);
+      if (!isVisible(stream)) continue;
+      if (!histories.has(historyId)) {
+        histories.set(historyId, {rate: [], jitter: [], until: null, pending: false});
+      }
+      requests.push(fetchHistory(historyId, histories.get(historyId), fetchImpl));
+    }
+  }
+  for (const historyId of histories.keys()) {
+    if (!present.has(historyId)) histories.delete(historyId);
+  }
+  return (await Promise.all(requests)).some(Boolean);
+}
+
+export function resetHistories() {
+  histories.clear();
+}
@@ -4,7 +4,9 @@
  * Dieses Modul steuert den Hauptablauf:
  * - Holt die aktuellen Streamdaten + Refresh-Intervalle vom Backend
  * - Rendert die Daten im DOM mithilfe externer Module
- * - Aktualisiert die Anzeige regelmäßig basierend auf YAML-Konfiguration
+ * - Aktualisiert die Anzeige per Push (Server-Sent Events) und fällt auf
+ *   Polling im Intervall aus der YAML-Konfiguration zurück
+ * - Lädt Verlaufsgrafiken nur für sichtbare Stream-Karten nach
  * 
  * 🔧 Modulübersicht:
  * | Datei         | Aufgabe                                    |
@@ -18,7 +20,8 @@
  */
 
 
-import { fetchStreamsFromApi } from "./api.js";
+import { fetchStreamsFromApi, subscribeToStreams } from "./api.js";
+import { attachHistories, refreshHistories } from "./history-store.js";
 import {
   dataAgeStatusClass,
   formatDataAge,
@@ -33,26 +36,94 @@ const container = document.getElementById("streams");
 const noStreams = document.getElementById("no-streams");
 const pageTitle = document.getElementById("page-title");
 const streamCards = new Map(); // Name → DOM-Element
+const visibleCards = new Set(); // Namen der Karten im Viewport
 
 let refreshIntervalMs = 1000; // Defaultwert, wird gleich überschrieben
+let collectorIntervalMs = 1000; // Schreibtakt des Collectors laut API
 let refreshTimer = null;
+let pushWatchdog = null;
+let lastResult = null; // für das Datenalter bei unveränderten Antworten (304)
+
+// 👁 Ohne IntersectionObserver gelten alle Karten als sichtbar
+const cardObserver = typeof IntersectionObserver === "undefined" ? null
+  : new IntersectionObserver(entries => {
+    let appeared = false;
+    for (const entry of entries) {
+      const name = entry.target.dataset.streamName;
+      if (entry.isIntersecting) {
+        appeared = appeared || !visibleCards.has(name);
+        visibleCards.add(name);
+      } else {
+        visibleCards.delete(name);
+      }
+    }
+    if (appeared) updateHistories();
+  });
+
+function isCardVisible(stream) {
+  return cardObserver == null || visibleCards.has(stream.name);
+}
+
+// 📈 Verlauf nachladen und nur die sichtbaren Karten neu zeichnen
+async function updateHistories() {
+  const streams = lastResult?.streams || [];
+  if (!(await refreshHistories(streams, isCardVisible))) return;
+  attachHistories(streams);
+  for (const stream of streams) {
+    const card = streamCards.get(stream.name);
+    if (card && isCardVisible(stream)) updateStreamCard(card, stream);
+  }
+}
+
+function startPolling() {
+  if (refreshTimer == null) refreshTimer = setInterval(updateUI, refreshIntervalMs);
+}
+
+function stopPolling() {
+  clearInterval(refreshTimer);
+  refreshTimer = null;
+}
+
+// 🐕 Bleibt ein Push-Event zwei Collector-Intervalle aus, wieder pollen.
+// Keepalive-Kommentare erreichen das Skript nicht und zählen daher nicht.
+function armPushWatchdog() {
+  clearTimeout(pushWatchdog);
+  pushWatchdog = setTimeout(startPolling, 2 * collectorIntervalMs);
+}
 
 async function updateUI() {
   const result = await fetchStreamsFromApi();
+  if (result.unchanged) {
+    // 🟰 Unverändert: nur den Zeitpunkt des letzten Collector-Laufs übernehmen
+    if (lastResult) {
+      lastResult = {...lastResult, collected_at: result.collected_at ?? lastResult.collected_at};
+      renderDataAge(lastResult);
+    }
+    return;
+  }
+  renderResult(result);
+}
 
-  renderMonitorTitle(pageTitle, result.monitor_version);
-
+function renderDataAge(result) {
   const ageText = formatDataAge(result.collected_at);
   renderSystemInfo(
     result.systeminfo || {},
     ageText || "Datenalter: —",
     dataAgeStatusClass(result.collected_at),
   );
+}
+
+function renderResult(result) {
+  lastResult = result;
+  renderMonitorTitle(pageTitle, result.monitor_version);
+  renderDataAge(result);
 
   const newInterval = result.streamlist_refresh_ms ?? 1000;
+  collectorIntervalMs = result.collector_interval_ms ?? collectorIntervalMs;
 
   const streams = result.streams || [];
   recordSnapshotTelemetry(streams, result.collected_at);
+  attachHistories(streams);
   const seen = new Set();
 
   for (const stream of streams) {
@@ -61,8 +132,10 @@ async function updateUI() {
 
     if (!existingCard) {
       const newCard = renderStreamCard(stream);
+      newCard.dataset.streamName = stream.name;
       container.appendChild(newCard);
       streamCards.set(stream.name, newCard);
+      cardObserver?.observe(newCard);
     } else {
       updateStreamCard(existingCard, stream);
     }
@@ -71,24 +144,43 @@ async function updateUI() {
   // 🧹 Entferne veraltete Karten
   for (const [name, card] of streamCards.entries()) {
     if (!seen.has(name)) {
+      cardObserver?.unobserve(card);
       card.remove();
       streamCards.delete(name);
+      visibleCards.delete(name);
     }
   }
 
   // 🔘 Sichtbarkeit "Keine Streams"
   noStreams.style.display = streams.length === 0 ? "block" : "none";
 
-  // ⏱ Intervall bei Bedarf neu setzen
+  updateHistories();
+
+  // ⏱ Intervall bei Bedarf neu setzen (nur während Polling aktiv ist)
   if (newInterval !== refreshIntervalMs) {
-    clearInterval(refreshTimer);
     refreshIntervalMs = newInterval;
-    refreshTimer = setInterval(updateUI, refreshIntervalMs);
+    if (refreshTimer != null) {
+      stopPolling();
+      startPolling();
+    }
   }
 }
 
 
-// 🟢 Initiale Ausführung + Intervall starten
+// 🟢 Initiale Ausführung, dann Push; Polling nur solange Push nicht liefert
 updateUI().then(() => {
-  refreshTimer = setInterval(updateUI, refreshIntervalMs);
+  startPolling();
+  subscribeToStreams(
+    result => {
+      stopPolling();
+      renderResult(result);
+      armPushWatchdog();
+    },
+    startPolling,
+  );
 });
+
+// ⏳ Datenalter lokal fortschreiben, auch wenn weder Push noch Polling liefert
+setInterval(() => {
+  if (lastResult) renderDataAge(lastResult);
+}, 1000);
@@ -0,0 +1,25 @@
+/**
+ * MediaMTX Monitor - Browser-local stream list from incremental API replies.
+ *
+ * Applies `/api/streams?since=<seq>` deltas to the previously received list
+ * without network access or rendering.
+ */
+
+/**
+ * Returns the stream list described by an API reply.
+ *
+ * Full replies carry `streams`; delta replies carry only `upserted` paths,
+ * `removed` names and the complete name order in `names`. `null` means the
+ * delta does not fit `previous`, so the caller must request a full reply.
+ */
+export function mergeStreamsReply(previous, reply) {
+  if (!reply?.delta) return reply?.streams || [];
+
+  const byName = new Map((previous || []).map(stream => [stream.name, stream]));
+  for (const name of reply.removed || []) byName.delete(name);
+  for (const stream of reply.upserted || []) byName.set(stream.name, stream);
+
+  const names = reply.names || [];
+  if (names.some(name => !byName.has(name))) return null;
+  return names.map(name => byName.get(name));
+}
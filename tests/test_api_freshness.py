@@ -1,3 +1,4 @@
+import asyncio
 import json
 from pathlib import Path
 import sys
@@ -6,17 +7,38 @@ import types
 import unittest
 from unittest import mock
 
-from bin.redis_keys import stream_snapshot_freshness_key
+from bin.redis_keys import (
+    COLLECTOR_METRICS_KEY,
+    connection_history_key,
+    connection_rollup_key,
+    stream_snapshot_delta_key,
+    stream_snapshot_freshness_key,
+    stream_snapshot_index_key,
+    stream_snapshot_paths_key,
+    stream_snapshot_sequence_key,
+)
 from bin.redis_store import RedisStore
+from tests.test_bitrate import FakePipeline
+from tests.test_srt_health import FakeRedis as HistoryRedis
 
 
 class FakeRedis:
-    def __init__(self, values):
+    def __init__(self, values, lists=None):
         self.values = values
+        self.lists = lists or {}
 
     def get(self, key):
         return self.values.get(key)
 
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])
+
+    def pipeline(self):
+        return FakePipeline(self)
+
 
 class ApiFreshnessTests(unittest.TestCase):
     @classmethod
@@ -35,16 +57,53 @@ class ApiFreshnessTests(unittest.TestCase):
             def get(self, *args, **kwargs):
                 return lambda function: function
 
-        class FakeJSONResponse:
-            def __init__(self, content):
-                self.body = json.dumps(content).encode()
+        class FakeResponse:
+            def __init__(self, content=None, status_code=200, headers=None):
+                self.status_code = status_code
+                self.headers = headers or {}
+                self.body = b"" if content is None else self.render(content)
+
+            def render(self, content):
+                return content
+
+        class FakeJSONResponse(FakeResponse):
+
+            def render(self, content):
+                return json.dumps(content).encode()
+
+        class FakeStreamingResponse:
+            def __init__(self, content, media_type=None, headers=None):
+                self.body_iterator = content
+                self.media_type = media_type
+                self.headers = headers or {}
 
         fastapi_module.FastAPI = FakeFastAPI
+        fastapi_module.Request = object
+        fastapi_module.Header = lambda default=None, **kwargs: default
         responses_module = types.ModuleType("fastapi.responses")
         responses_module.JSONResponse = FakeJSONResponse
-        responses_module.FileResponse = object
+        class FakeFileResponse:
+            status_code = 200
+
+            def __init__(self, path, stat_result, headers):
+                self.path = path
+                self.stat_result = stat_result
+                self.headers = headers
+
+        responses_module.FileResponse = FakeFileResponse
+        responses_module.StreamingResponse = FakeStreamingResponse
+        responses_module.Response = FakeResponse
         staticfiles_module = types.ModuleType("fastapi.staticfiles")
-        staticfiles_module.StaticFiles = lambda *args, **kwargs: object()
+        class FakeStaticFiles:
+            response = None
+
+            def __init__(self, *args, **kwargs):
+                pass
+
+            async def get_response(self, path, scope):
+                return self.response
+
+        staticfiles_module.StaticFiles = FakeStaticFiles
         with mock.patch.dict(
             sys.modules,
             {
@@ -57,6 +116,9 @@ class ApiFreshnessTests(unittest.TestCase):
             from bin import monitoring_api
         cls.api = monitoring_api
 
+    def setUp(self):
+        self.api.index_cache = self.api.ReplyCache(max_entries=1)
+
     def test_api_exposes_collector_timestamp_next_to_unchanged_streams(self):
         streams = [{"name": "path-x", "readers": []}]
         values = {
@@ -88,6 +150,587 @@ class ApiFreshnessTests(unittest.TestCase):
 
         self.assertEqual(payload["systeminfo"], systeminfo)
 
+    def delta_store(self, streams):
+        key = self.api.REDIS_KEY
+        changes = [
+            {"seq": 8, "reset": False, "upserted": [streams[0]],
+             "removed": ["old"], "names": ["a", "b"]},
+            {"seq": 7, "reset": False, "upserted": [streams[1]],
+             "removed": [], "names": ["a", "b", "old"]},
+        ]
+        values = {
+            key: json.dumps(streams),
+            stream_snapshot_sequence_key(key): json.dumps(8),
+            stream_snapshot_freshness_key(key): json.dumps(1234.5),
+        }
+        lists = {
+            stream_snapshot_delta_key(key): [json.dumps(item) for item in changes]
+        }
+        return RedisStore(FakeRedis(values, lists))
+
+    def test_full_reply_carries_the_sequence_for_the_next_delta(self):
+        streams = [{"name": "a", "v": 2}, {"name": "b", "v": 1}]
+        self.api.snapshot_store = self.delta_store(streams)
+
+        payload = json.loads(self.api.get_streams().body)
+
+        self.assertFalse(payload["delta"])
+        self.assertEqual(payload["seq"], 8)
+        self.assertEqual(payload["streams"], streams)
+
+    def test_since_returns_only_changes_after_that_sequence(self):
+        streams = [{"name": "a", "v": 2}, {"name": "b", "v": 1}]
+        self.api.snapshot_store = self.delta_store(streams)
+
+        payload = json.loads(self.api.get_streams(since=6).body)
+
+        self.assertTrue(payload["delta"])
+        self.assertNotIn("streams", payload)
+        self.assertEqual(payload["seq"], 8)
+        self.assertEqual(payload["upserted"], streams)
+        self.assertEqual(payload["removed"], ["old"])
+        self.assertEqual(payload["names"], ["a", "b"])
+        self.assertEqual(payload["collected_at"], 1234.5)
+
+    def test_since_outside_the_delta_log_falls_back_to_full_snapshot(self):
+        streams = [{"name": "a", "v": 2}, {"name": "b", "v": 1}]
+        self.api.snapshot_store = self.delta_store(streams)
+
+        payload = json.loads(self.api.get_streams(since=3).body)
+
+        self.assertFalse(payload["delta"])
+        self.assertEqual(payload["streams"], streams)
+
+    def test_push_clients_receive_a_reply_per_announced_snapshot(self):
+        streams = [{"name": "a", "v": 2}, {"name": "b", "v": 1}]
+        self.api.snapshot_store = self.delta_store(streams)
+
+        class FakeRequest:
+            def __init__(self):
+                self.checks = 0
+
+            async def is_disconnected(self):
+                self.checks += 1
+                return self.checks > 2
+
+        async def receive():
+            events = self.api.SnapshotBroadcaster()
+            events.connected = True
+            with (
+                mock.patch.object(self.api, "snapshot_events", events),
+                mock.patch.object(self.api, "PUSH_KEEPALIVE_SECONDS", 0.01),
+            ):
+                response = await self.api.get_stream_events(FakeRequest(), since=6)
+                frames = response.body_iterator
+                received = [await frames.__anext__()]
+                events.publish({"seq": 8, "collected_at": 1234.5})
+                received.append(await frames.__anext__())
+                received.append(await frames.__anext__())
+                received.extend([frame async for frame in frames])
+            return response, received
+
+        response, frames = asyncio.run(receive())
+
+        self.assertEqual(response.media_type, "text/event-stream")
+        self.assertTrue(frames[0].startswith("retry: "))
+        first = json.loads(frames[0].split("data: ", 1)[1])
+        self.assertEqual((first["delta"], first["since"]), (True, 6))
+        self.assertTrue(frames[1].startswith("event: streams\ndata: "))
+        pushed = json.loads(frames[1].split("data: ", 1)[1])
+        self.assertEqual((pushed["since"], pushed["upserted"]), (8, []))
+        self.assertEqual(frames[2], self.api.SSE_KEEPALIVE_FRAME)
+        self.assertEqual(len(frames), 3)
+
+    def test_push_stream_ends_with_a_stale_event_without_the_relay(self):
+        self.api.snapshot_store = self.delta_store(
+            [{"name": "a", "v": 2}, {"name": "b", "v": 1}]
+        )
+
+        class FakeRequest:
+            async def is_disconnected(self):
+                return False
+
+        async def receive():
+            events = self.api.SnapshotBroadcaster()
+            with (
+                mock.patch.object(self.api, "snapshot_events", events),
+                mock.patch.object(
+                    self.api.snapshot_store,
+                    "read_stream_view",
+                    side_effect=AssertionError("snapshot read"),
+                ),
+            ):
+                response = await self.api.get_stream_events(FakeRequest())
+                return [frame async for frame in response.body_iterator]
+
+        frames = asyncio.run(receive())
+
+        self.assertEqual(len(frames), 1)
+        retry, stale = frames[0].split("\n", 1)
+        self.assertTrue(retry.startswith("retry: "))
+        self.assertTrue(stale.startswith("event: stale\ndata: "))
+
+    def test_named_paths_are_read_from_the_per_path_hash(self):
+        from tests.test_srt_health import FakeRedis as HashRedis
+
+        redis = HashRedis()
+        redis.hashes[stream_snapshot_paths_key(self.api.REDIS_KEY)] = {
+            "a": json.dumps({"name": "a"}),
+            "b": json.dumps({"name": "b"}),
+        }
+        redis.values[stream_snapshot_index_key(self.api.REDIS_KEY)] = json.dumps(
+            ["a", "b"]
+        )
+        self.api.snapshot_store = RedisStore(redis)
+
+        with (
+            mock.patch.object(redis, "hgetall", side_effect=AssertionError),
+            mock.patch.dict(self.api.redis_cfg, {"snapshot_layout": "both"}),
+        ):
+            single = json.loads(self.api.get_stream("b").body)
+            missing = self.api.get_stream("c")
+        with mock.patch.dict(self.api.redis_cfg, {"snapshot_layout": "hash"}):
+            payload = json.loads(self.api.get_streams().body)
+
+        self.assertEqual(single["stream"], {"name": "b"})
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(payload["streams"], [{"name": "a"}, {"name": "b"}])
+
+    def test_single_key_index_is_reused_while_the_seq_is_unchanged(self):
+        from tests.test_collector_state import CountingRedis
+
+        redis = CountingRedis()
+        redis.values.update({
+            self.api.REDIS_KEY: json.dumps([{"name": "a"}, {"name": "b"}]),
+            stream_snapshot_sequence_key(self.api.REDIS_KEY): json.dumps(3),
+            stream_snapshot_freshness_key(self.api.REDIS_KEY): json.dumps(10.0),
+        })
+        self.api.snapshot_store = RedisStore(redis)
+
+        with mock.patch.dict(self.api.redis_cfg, {"snapshot_layout": "key"}):
+            first = json.loads(self.api.get_stream("a").body)
+            redis.values[stream_snapshot_freshness_key(self.api.REDIS_KEY)] = "11.0"
+            with mock.patch.object(
+                self.api.json_codec, "loads", wraps=self.api.json_codec.loads
+            ) as loads:
+                second = json.loads(self.api.get_stream("b").body)
+
+        self.assertEqual(first["stream"], {"name": "a"})
+        self.assertEqual(first["collected_at"], 10.0)
+        self.assertEqual(second["stream"], {"name": "b"})
+        self.assertEqual(second["collected_at"], 11.0)
+        self.assertNotIn(
+            redis.values[self.api.REDIS_KEY],
+            [call.args[0] for call in loads.call_args_list],
+        )
+
+    def test_api_exposes_collector_cycle_metrics_with_age(self):
+        summary = {
+            "updated_at": 1000.0,
+            "missed_intervals": 1,
+            "metrics": {"cycle_duration_ms": {"p95": 180.0}},
+        }
+        values = {COLLECTOR_METRICS_KEY: json.dumps(summary)}
+        self.api.snapshot_store = RedisStore(FakeRedis(values))
+
+        with mock.patch.object(self.api.time, "time", return_value=1002.5):
+            payload = json.loads(self.api.get_collector_metrics().body)
+
+        self.assertTrue(payload["available"])
+        self.assertEqual(payload["age_seconds"], 2.5)
+        self.assertEqual(payload["missed_intervals"], 1)
+        self.assertEqual(payload["metrics"], summary["metrics"])
+
+    def test_missing_collector_metrics_are_reported_unavailable(self):
+        self.api.snapshot_store = RedisStore(FakeRedis({}))
+
+        payload = json.loads(self.api.get_collector_metrics().body)
+
+        self.assertEqual(payload, {"available": False})
+
+    def test_history_returns_points_newer_than_since(self):
+        redis = HistoryRedis()
+        key = connection_history_key("pub:live/cam:rtspSession:a")
+        redis.zadd(key, {
+            json.dumps({"timestamp": 30.0, "rx_mbps": 1.0}): 30.0,
+            json.dumps({"timestamp": 100.0, "rx_mbps": 4.0, "jitter_ms": 2.5}): 100.0,
+            json.dumps({"timestamp": 101.0}): 101.0,
+        })
+        self.api.snapshot_store = RedisStore(redis)
+
+        with mock.patch.object(self.api.time, "time", return_value=102.0):
+            full = json.loads(
+                self.api.get_connection_history("pub:live/cam:rtspSession:a").body
+            )
+            newer = json.loads(self.api.get_connection_history(
+                "pub:live/cam:rtspSession:a", since=100.0
+            ).body)
+            idle = json.loads(self.api.get_connection_history(
+                "pub:live/cam:rtspSession:a", since=101.0
+            ).body)
+        unknown = self.api.get_connection_history("history:pub:x")
+
+        self.assertEqual(full["rate"], [
+            {"timestamp": 100.0, "mbps": 4.0},
+            {"timestamp": 101.0, "mbps": None},
+        ])
+        self.assertEqual(full["jitter"][0], {"timestamp": 100.0, "ms": 2.5})
+        self.assertEqual(full["until"], 101.0)
+        self.assertEqual(newer["rate"], [{"timestamp": 101.0, "mbps": None}])
+        self.assertEqual((idle["rate"], idle["until"]), ([], 101.0))
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_rollups_merge_split_buckets_and_report_the_mean(self):
+        redis = HistoryRedis()
+        key = connection_rollup_key("pub:live/cam:srtConn:a", "10s")
+        for start, fields in (
+            (90.0, {"rx_mbps": [1.0, 3.0, 4.0, 2]}),
+            (90.0, {"rx_mbps": [5.0, 5.0, 5.0, 1]}),
+            (100.0, {"loss_packets": [0, 2, 2, 3]}),
+        ):
+            redis.zadd(key, {json.dumps({"start": start, "fields": fields}): start})
+        self.api.snapshot_store = RedisStore(redis)
+
+        with mock.patch.object(self.api.time, "time", return_value=110.0):
+            full = json.loads(
+                self.api.get_connection_rollups("pub:live/cam:srtConn:a").body
+            )
+            newer = json.loads(self.api.get_connection_rollups(
+                "pub:live/cam:srtConn:a", since=90.0
+            ).body)
+        unknown = self.api.get_connection_rollups("pub:x", tier="1h")
+
+        self.assertEqual(full["buckets"][0], {
+            "start": 90.0,
+            "fields": {
+                "rx_mbps": {
+                    "min": 1.0, "max": 5.0, "mean": 3.0, "sum": 9.0, "count": 3,
+                },
+            },
+        })
+        self.assertEqual(full["until"], 100.0)
+        self.assertEqual([bucket["start"] for bucket in newer["buckets"]], [100.0])
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_stored_snapshots_are_spliced_into_the_reply_without_decoding(self):
+        stored_streams = '[{"name": "a",  "bitrate_mbps": 1.50}]'
+        stored_system = '{"host": "mediamtx18"}'
+        values = {
+            self.api.REDIS_KEY: stored_streams,
+            self.api.SYSTEM_REDIS_KEY: stored_system,
+        }
+        self.api.snapshot_store = RedisStore(FakeRedis(values))
+
+        with mock.patch.object(
+            self.api.json_codec, "loads", side_effect=AssertionError("decoded")
+        ):
+            body = self.api.get_streams().body.decode()
+
+        self.assertIn(f'"streams":{stored_streams}', body)
+        self.assertIn(f'"systeminfo":{stored_system}', body)
+        self.assertEqual(list(json.loads(body)), [
+            "streams",
+            "seq",
+            "delta",
+            "collected_at",
+            "snapshot_refresh_ms",
+            "streamlist_refresh_ms",
+            "collector_interval_ms",
+            "monitor_version",
+            "systeminfo",
+        ])
+
+    def test_unusable_stored_documents_fall_back_to_empty_values(self):
+        values = {
+            self.api.REDIS_KEY: '{"not": "a list"}',
+            self.api.SYSTEM_REDIS_KEY: "not-json",
+        }
+        self.api.snapshot_store = RedisStore(FakeRedis(values))
+
+        payload = json.loads(self.api.get_streams().body)
+
+        self.assertEqual(payload["streams"], [])
+        self.assertEqual(payload["systeminfo"], {})
+
+    def test_history_clients_do_not_crowd_streams_out_of_the_cache(self):
+        from tests.test_collector_state import CountingRedis
+
+        redis = CountingRedis()
+        redis.values[self.api.REDIS_KEY] = json.dumps([{"name": "a"}])
+        self.api.snapshot_store = RedisStore(redis)
+        events = self.api.SnapshotBroadcaster()
+        events.connected = True
+
+        with (
+            mock.patch.object(self.api, "snapshot_events", events),
+            mock.patch.object(self.api, "reply_cache", self.api.ReplyCache(2)),
+            mock.patch.object(self.api, "history_cache", self.api.ReplyCache(2)),
+        ):
+            self.api.get_streams()
+            for since in range(5):
+                self.api.get_connection_history("pub:a:rtspSession:x", since=since)
+                self.api.get_connection_rollups("pub:a:srtConn:x", since=since)
+            redis.round_trips = 0
+            self.api.get_streams()
+
+        self.assertEqual(redis.round_trips, 0)
+
+    def test_every_streams_reply_costs_one_redis_round_trip(self):
+        from tests.test_collector_state import CountingRedis
+
+        key = self.api.REDIS_KEY
+        redis = CountingRedis()
+        redis.values.update({
+            key: json.dumps([{"name": "a"}]),
+            stream_snapshot_sequence_key(key): json.dumps(4),
+            stream_snapshot_freshness_key(key): json.dumps(1234.5),
+            stream_snapshot_index_key(key): json.dumps(["a"]),
+        })
+        redis.hashes[stream_snapshot_paths_key(key)] = {
+            "a": json.dumps({"name": "a"}),
+        }
+        redis.lists[stream_snapshot_delta_key(key)] = [json.dumps({
+            "seq": 4, "reset": False, "upserted": [{"name": "a"}],
+            "removed": [], "names": ["a"],
+        })]
+        self.api.snapshot_store = RedisStore(redis)
+
+        for layout, since in (("both", None), ("hash", None), ("both", 3)):
+            with self.subTest(layout=layout, since=since):
+                redis.round_trips = 0
+                with mock.patch.dict(self.api.redis_cfg, {"snapshot_layout": layout}):
+                    payload = json.loads(self.api.get_streams(since=since).body)
+
+                self.assertEqual(redis.round_trips, 1)
+                self.assertEqual(payload["collected_at"], 1234.5)
+                self.assertEqual(payload["seq"], 4)
+                self.assertEqual(payload["delta"], since is not None)
+
+    def test_viewers_share_one_read_per_announced_snapshot(self):
+        from tests.test_collector_state import CountingRedis
+
+        redis = CountingRedis()
+        redis.values[self.api.REDIS_KEY] = json.dumps([{"name": "a"}])
+        self.api.snapshot_store = RedisStore(redis)
+        events = self.api.SnapshotBroadcaster()
+        events.connected = True
+
+        with (
+            mock.patch.object(self.api, "snapshot_events", events),
+            mock.patch.object(self.api, "reply_cache", self.api.ReplyCache()),
+        ):
+            bodies = {self.api.get_streams().body for _ in range(30)}
+            self.assertEqual((redis.round_trips, len(bodies)), (1, 1))
+
+            redis.values[self.api.REDIS_KEY] = json.dumps([{"name": "b"}])
+            events.publish({"seq": None, "collected_at": 2.0})
+            payload = json.loads(self.api.get_streams().body)
+
+            events.connected = False
+            self.api.get_streams()
+            self.api.get_streams()
+
+        self.assertEqual(payload["streams"], [{"name": "b"}])
+        self.assertEqual(redis.round_trips, 4)
+
+    def test_unchanged_reply_is_answered_with_304_for_its_etag(self):
+        values = {self.api.REDIS_KEY: json.dumps([{"name": "a"}])}
+        self.api.snapshot_store = RedisStore(FakeRedis(values))
+
+        response = self.api.get_streams()
+        etag = response.headers["ETag"]
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            with self.subTest(header=header):
+                cached = self.api.get_streams(if_none_match=header)
+                self.assertEqual((cached.status_code, cached.body), (304, b""))
+                self.assertEqual(cached.headers["ETag"], etag)
+
+        values[self.api.REDIS_KEY] = json.dumps([{"name": "b"}])
+        changed = self.api.get_streams(if_none_match=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertEqual(json.loads(changed.body)["streams"], [{"name": "b"}])
+
+    def test_etag_follows_the_sequence_not_freshness_or_systeminfo(self):
+        key = self.api.REDIS_KEY
+        values = {
+            key: json.dumps([{"name": "a"}]),
+            stream_snapshot_sequence_key(key): json.dumps(8),
+            stream_snapshot_freshness_key(key): json.dumps(100.0),
+            self.api.SYSTEM_REDIS_KEY: json.dumps({"cpu_percent": 1}),
+        }
+        self.api.snapshot_store = RedisStore(FakeRedis(values))
+
+        first = self.api.get_streams()
+        etag = first.headers["ETag"]
+        values[stream_snapshot_freshness_key(key)] = json.dumps(101.0)
+        values[self.api.SYSTEM_REDIS_KEY] = json.dumps({"cpu_percent": 2})
+        idle = self.api.get_streams(if_none_match=etag)
+        filtered = self.api.get_streams(prefix="a")
+        values[stream_snapshot_sequence_key(key)] = json.dumps(9)
+        changed = self.api.get_streams(if_none_match=etag)
+
+        self.assertEqual(first.headers["X-Collected-At"], "100.0")
+        self.assertEqual(idle.status_code, 304)
+        self.assertEqual(idle.headers["X-Collected-At"], "101.0")
+        self.assertNotEqual(filtered.headers["ETag"], etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+    def test_large_replies_are_compressed_once_for_all_clients(self):
+        import gzip
+
+        streams = [{"name": f"path-{index}", "readers": []} for index in range(100)]
+        values = {self.api.REDIS_KEY: json.dumps(streams)}
+        self.api.snapshot_store = RedisStore(FakeRedis(values))
+        events = self.api.SnapshotBroadcaster()
+        events.connected = True
+
+        with (
+            mock.patch.object(self.api, "snapshot_events", events),
+            mock.patch.object(self.api, "reply_cache", self.api.ReplyCache()),
+        ):
+            plain = self.api.get_streams(accept_encoding="identity")
+            first = self.api.get_streams(accept_encoding="gzip")
+            second = self.api.get_streams(accept_encoding="gzip")
+            not_modified = self.api.get_streams(
+                accept_encoding="gzip", if_none_match=first.headers["ETag"]
+            )
+
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(first.headers["Content-Encoding"], "gzip")
+        self.assertEqual(first.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(first.body), plain.body)
+        # The same bytes object: compressed once, then shared.
+        self.assertIs(first.body, second.body)
+        self.assertNotEqual(first.headers["ETag"], plain.headers["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_static_files_are_served_compressed_per_file_version(self):
+        import gzip
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "main.js"
+            path.write_text("console.log(1);\n" * 200, encoding="utf-8")
+            content = path.read_bytes()
+            files = self.api.PrecompressedStaticFiles(directory=temp_dir)
+            files.response = self.api.FileResponse(
+                path,
+                path.stat(),
+                {"content-type": "text/javascript", "content-length": "3200",
+                 "etag": '"static"'},
+            )
+
+            def request(**headers):
+                scope = {
+                    "method": "GET",
+                    "headers": [
+                        (name.replace("_", "-").encode(), value.encode())
+                        for name, value in headers.items()
+                    ],
+                }
+                return asyncio.run(files.get_response("main.js", scope))
+
+            with mock.patch.object(self.api, "static_bodies", self.api.CompressedFileCache()):
+                plain = request()
+                compressed = request(accept_encoding="gzip")
+                cached = request(accept_encoding="gzip", if_none_match='"static-gzip"')
+
+        self.assertIs(plain, files.response)
+        self.assertEqual(compressed.headers["content-encoding"], "gzip")
+        self.assertEqual(compressed.headers["etag"], '"static-gzip"')
+        self.assertNotIn("content-length", compressed.headers)
+        self.assertEqual(gzip.decompress(compressed.body), content)
+        self.assertEqual(cached.status_code, 304)
+
+    def query_store(self):
+        from tests.test_collector_state import CountingRedis
+
+        streams = [
+            {"name": f"live/cam{index}", "source": {"type": "srtConn"},
+             "readers": [{"type": "webRTCSession"}] if index % 2 else []}
+            for index in range(6)
+        ] + [{"name": "studio", "source": {"type": "rtmpConn"}, "readers": []}]
+        redis = CountingRedis()
+        redis.values.update({
+            self.api.REDIS_KEY: json.dumps(streams),
+            stream_snapshot_sequence_key(self.api.REDIS_KEY): json.dumps(5),
+        })
+        # The default "both" layout also keeps one hash field per path.
+        redis.hashes[stream_snapshot_paths_key(self.api.REDIS_KEY)] = {
+            stream["name"]: json.dumps(stream) for stream in streams
+        }
+        self.api.snapshot_store = RedisStore(redis)
+        return redis, streams
+
+    def test_filtered_pages_are_cut_from_one_index_per_snapshot(self):
+        redis, streams = self.query_store()
+        events = self.api.SnapshotBroadcaster()
+        events.connected = True
+
+        with (
+            mock.patch.object(self.api, "snapshot_events", events),
+            mock.patch.object(self.api, "reply_cache", self.api.ReplyCache()),
+        ):
+            page = json.loads(self.api.get_streams(
+                prefix="live/", protocol="webrtc", role="reader", offset=1, limit=1
+            ).body)
+            srt = json.loads(self.api.get_streams(protocol="SRT", limit=2).body)
+            glob = json.loads(self.api.get_streams(match="stud*").body)
+            single = json.loads(self.api.get_stream("live/cam3").body)
+
+        self.assertEqual(redis.round_trips, 1)
+        self.assertEqual(page["streams"], [streams[3]])
+        self.assertEqual((page["total"], page["offset"], page["limit"]), (3, 1, 1))
+        self.assertEqual((page["seq"], page["delta"]), (5, False))
+        self.assertEqual([item["name"] for item in srt["streams"]], ["live/cam0", "live/cam1"])
+        self.assertEqual(srt["total"], 6)
+        self.assertEqual(glob["streams"], [streams[-1]])
+        self.assertEqual(single["stream"], streams[3])
+        self.assertEqual(single["seq"], 5)
+
+    def test_projections_return_only_the_requested_fields(self):
+        _redis, streams = self.query_store()
+
+        summary = json.loads(self.api.get_streams(profile="summary").body)
+        fields = json.loads(self.api.get_streams(fields="name,readers.type").body)
+        single = json.loads(self.api.get_stream("studio", fields="name").body)
+        full = json.loads(self.api.get_streams(profile="full").body)
+
+        self.assertEqual(summary["streams"][0], {
+            "name": "live/cam0", "source": {"type": "srtConn"}, "readers": [],
+        })
+        self.assertEqual(summary["total"], len(streams))
+        self.assertEqual(fields["streams"][1], {
+            "name": "live/cam1", "readers": [{"type": "webRTCSession"}],
+        })
+        self.assertEqual(single["stream"], {"name": "studio"})
+        self.assertEqual(full["streams"], streams)
+        self.assertNotIn("total", full)
+        self.assertEqual(self.api.get_streams(profile="tiny").status_code, 400)
+
+    def test_unknown_path_and_invalid_role_are_rejected(self):
+        self.query_store()
+
+        missing = self.api.get_stream("live/none")
+        invalid = self.api.get_streams(role="viewer")
+
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertIn("publisher", json.loads(invalid.body)["detail"])
+
+    def test_responses_are_rendered_with_the_shared_codec(self):
+        from bin import json_codec
+
+        content = {"streams": [{"name": "kamera/ö"}], "collected_at": 1.5}
+
+        body = self.api.CodecJSONResponse.render(None, content)
+
+        self.assertEqual(body, json_codec.dumps(content).encode("utf-8"))
+        self.assertEqual(json.loads(body), content)
+
     def test_monitor_version_is_read_without_trailing_newline(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             version_file = Path(temp_dir) / "VERSION"
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bin import mediamtx_collector
+from bin.mediamtx_client import (
+    AsyncMediaMTXClient,
+    MediaMTXClient,
+    MediaMTXHTTPError,
+)
+from bin.redis_store import AsyncNamespacedRedis, AsyncRedisStore, RedisStore
+from tests.test_collector_state import ReaderFanoutClient
+from tests.test_mediamtx_client import FakeResponse, FakeSession
+from tests.test_srt_health import FakeRedis
+
+
+class AsyncFakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.pipeline = redis.sync.pipeline()
+
+    def __getattr__(self, name):
+        method = getattr(self.pipeline, name)
+
+        def queue(*args, **kwargs):
+            method(*args, **kwargs)
+            return self
+
+        return queue
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        return self.pipeline.execute()
+
+
+class AsyncFakeRedis:
+    """Awaitable facade over the shared synchronous fake."""
+
+    def __init__(self, sync):
+        self.sync = sync
+        self.closed = False
+
+    async def get(self, key):
+        return self.sync.get(key)
+
+    async def set(self, key, value, **kwargs):
+        return self.sync.set(key, value, **kwargs)
+
+    async def mget(self, keys):
+        return self.sync.mget(keys)
+
+    async def ping(self):
+        return True
+
+    def pipeline(self):
+        return AsyncFakePipeline(self)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class SlowAsyncClient:
+    """Async client whose requests each take a fixed amount of wall time."""
+
+    def __init__(self, client, delay):
+        self.client = client
+        self.delay = delay
+
+    def build_url(self, endpoint):
+        return self.client.build_url(endpoint)
+
+    async def get_json(self, endpoint, params=None, timeout=None):
+        await asyncio.sleep(self.delay)
+        return self.client.get_json(endpoint, params=params)
+
+
+class AsyncCollectorTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.client = ReaderFanoutClient(3)
+        mediamtx_collector.r = self.redis
+        mediamtx_collector.snapshot_store = RedisStore(self.redis)
+        mediamtx_collector.mediamtx_client = self.client
+        mediamtx_collector.async_redis = AsyncFakeRedis(self.redis)
+        mediamtx_collector.async_snapshot_store = AsyncRedisStore(
+            mediamtx_collector.async_redis
+        )
+        mediamtx_collector.async_mediamtx_client = SlowAsyncClient(self.client, 0)
+        mediamtx_collector.reset_poll_cache()
+
+    def collect(self, timestamp, job):
+        with (
+            mock.patch.object(Path, "write_text"),
+            mock.patch.object(mediamtx_collector.time, "time", return_value=timestamp),
+        ):
+            metrics = job()
+        snapshot = json.loads(self.redis.values[mediamtx_collector.REDIS_KEY])
+        return snapshot, metrics
+
+    def run_cycles(self, job):
+        snapshots = []
+        for offset in range(3):
+            self.client.bytes = offset * 1_000_000
+            snapshot, metrics = self.collect(100.0 + offset, job)
+            snapshots.append(snapshot)
+        return snapshots, metrics
+
+    def test_async_cycle_produces_the_same_snapshot_and_metrics_keys(self):
+        async_snapshots, async_metrics = self.run_cycles(
+            lambda: asyncio.run(mediamtx_collector.collect_and_store_async())
+        )
+        self.redis.values.clear()
+        self.redis.sorted_sets.clear()
+        mediamtx_collector.reset_poll_cache()
+        sync_snapshots, sync_metrics = self.run_cycles(
+            mediamtx_collector.collect_and_store
+        )
+
+        self.assertEqual(async_snapshots, sync_snapshots)
+        self.assertEqual(set(async_metrics), set(sync_metrics))
+        self.assertEqual(async_metrics["api_request_count"], 3)
+        self.assertEqual(
+            async_snapshots[-1][0]["readers"][0]["srt_health"]["retrans_packets"],
+            1000,
+        )
+
+    def test_cycle_time_follows_slowest_request_not_the_sum(self):
+        delay = 0.05
+        mediamtx_collector.async_mediamtx_client = SlowAsyncClient(
+            self.client, delay
+        )
+
+        started = time.perf_counter()
+        _snapshot, metrics = self.collect(
+            200.0, lambda: asyncio.run(mediamtx_collector.collect_and_store_async())
+        )
+        elapsed = time.perf_counter() - started
+
+        # info + paths, then two detail lists, plus one inline forward list:
+        # serially that would be at least four delays.
+        self.assertEqual(metrics["api_request_count"], 5)
+        self.assertLess(elapsed, 4 * delay)
+
+    def test_detail_deadline_degrades_slow_lists_to_empty(self):
+        mediamtx_collector.async_mediamtx_client = SlowAsyncClient(
+            self.client, 0.05
+        )
+
+        with (
+            mock.patch.dict(
+                mediamtx_collector.COLLECTOR_CFG,
+                {"detail_fetch_deadline_seconds": 0.001},
+            ),
+            mock.patch.object(mediamtx_collector.logging, "warning") as warning,
+        ):
+            snapshot, _metrics = self.collect(
+                300.0,
+                lambda: asyncio.run(mediamtx_collector.collect_and_store_async()),
+            )
+
+        self.assertEqual(snapshot[0]["name"], "fanout")
+        self.assertEqual(warning.call_count, 2)
+
+    def test_failed_paths_poll_keeps_previous_snapshot(self):
+        self.collect(400.0, lambda: asyncio.run(
+            mediamtx_collector.collect_and_store_async()
+        ))
+        previous = self.redis.values[mediamtx_collector.REDIS_KEY]
+
+        async def failing(endpoint, params=None, timeout=None):
+            raise MediaMTXHTTPError(f"http://localhost:9997{endpoint}", 500)
+
+        mediamtx_collector.async_mediamtx_client.get_json = failing
+        with mock.patch.object(mediamtx_collector.time, "time", return_value=401.0):
+            asyncio.run(mediamtx_collector.collect_and_store_async())
+
+        self.assertEqual(self.redis.values[mediamtx_collector.REDIS_KEY], previous)
+
+
+class AsyncClientBoundaryTests(unittest.TestCase):
+    def test_async_client_raises_the_blocking_client_errors(self):
+        client = AsyncMediaMTXClient(MediaMTXClient(
+            "http://localhost:9997/",
+            session=FakeSession(FakeResponse(status_code=503)),
+        ))
+
+        with self.assertRaises(MediaMTXHTTPError) as raised:
+            asyncio.run(client.get_json("/v3/paths/list"))
+
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(
+            client.build_url("/v3/paths/list"), "http://localhost:9997/v3/paths/list"
+        )
+
+    def test_async_redis_applies_node_namespace(self):
+        raw = AsyncFakeRedis(FakeRedis())
+        redis = AsyncNamespacedRedis(raw, "mediamtx-monitor:", "node-a")
+
+        async def exercise():
+            await redis.set("streams:latest", "[]")
+            await redis.pipeline().set("state", 1, ex=5).execute()
+            return await redis.mget(["streams:latest", "state"])
+
+        values = asyncio.run(exercise())
+
+        self.assertEqual(values, ["[]", "1"])
+        self.assertEqual(
+            sorted(raw.sync.values),
+            [
+                "mediamtx-monitor:node:node-a:state",
+                "mediamtx-monitor:node:node-a:streams:latest",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,17 +5,25 @@ from bin.redis_keys import bitrate_state_keys
 
 
 class FakePipeline:
+    """Queue any command and replay it on the fake client on execute."""
+
     def __init__(self, redis_client):
         self.redis = redis_client
         self.operations = []
 
-    def set(self, key, value, ex=None):
-        self.operations.append((key, value, ex))
-        return self
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.operations.append((name, args, kwargs))
+            return self
+
+        return queue
 
     def execute(self):
-        for key, value, _ttl in self.operations:
-            self.redis.values[key] = str(value)
+        operations, self.operations = self.operations, []
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in operations
+        ]
 
 
 class FakeRedis:
@@ -0,0 +1,502 @@
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bin import mediamtx_collector
+from bin.bitrate import calc_bitrate
+from bin.collector_state import ConnectionStateCache, CycleState, unique_keys
+from bin.connection_history import rate_history
+from bin.redis_keys import (
+    bitrate_state_keys,
+    connection_direction,
+    connection_history_key,
+    connection_rollup_key,
+    reader_connection_key,
+)
+from bin.redis_store import RedisStore
+from tests.test_bitrate import FakePipeline
+from tests.test_srt_health import FakeRedis
+
+
+def stored_rate_history(redis, connection):
+    """Rate trend that ``/api/history`` serves for a snapshot connection."""
+    history_id = connection["history_id"]
+    samples = RedisStore(redis).read_history(
+        connection_history_key(history_id),
+        from_timestamp=float("-inf"),
+        to_timestamp=float("inf"),
+    )
+    return rate_history(samples, connection_direction(history_id))
+
+
+class CountingRedis(FakeRedis):
+    """Count client calls and pipeline executions as Redis round trips."""
+
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+        self.history_reads = 0
+        self.replaying = False
+
+    def count(self):
+        if not self.replaying:
+            self.round_trips += 1
+
+    def get(self, key):
+        self.count()
+        return super().get(key)
+
+    def mget(self, keys):
+        self.count()
+        return super().mget(keys)
+
+    def set(self, key, value, ex=None):
+        self.count()
+        return super().set(key, value, ex=ex)
+
+    def delete(self, *keys):
+        self.count()
+        for key in keys:
+            self.values.pop(key, None)
+        return len(keys)
+
+    def zadd(self, key, members):
+        self.count()
+        return super().zadd(key, members)
+
+    def zremrangebyscore(self, key, minimum, maximum):
+        self.count()
+        return super().zremrangebyscore(key, minimum, maximum)
+
+    def expire(self, key, seconds):
+        self.count()
+        return super().expire(key, seconds)
+
+    def zrangebyscore(self, key, minimum, maximum):
+        self.count()
+        self.history_reads += 1
+        return super().zrangebyscore(key, minimum, maximum)
+
+    def pipeline(self):
+        return CountingPipeline(self)
+
+
+class CountingPipeline(FakePipeline):
+    def execute(self):
+        self.redis.round_trips += 1
+        self.redis.replaying = True
+        try:
+            return super().execute()
+        finally:
+            self.redis.replaying = False
+
+
+class ReaderFanoutClient:
+    def __init__(self, reader_count):
+        self.reader_count = reader_count
+        self.bytes = 0
+
+    def build_url(self, endpoint):
+        return f"http://localhost:9997{endpoint}"
+
+    def get_json(self, endpoint, params=None, timeout=None):
+        if endpoint == "/v3/info":
+            return {"version": "1.20.0"}
+        if endpoint == "/v3/paths/list":
+            return {"items": [{
+                "name": "fanout",
+                "source": {"type": "rtmpConn", "id": "pub"},
+                "readers": [
+                    {"type": "srtConn", "id": f"srt-{index}"}
+                    for index in range(self.reader_count)
+                ] + [
+                    {"type": "rtmpConn", "id": f"rtmp-{index}"}
+                    for index in range(self.reader_count)
+                ],
+            }]}
+        if endpoint == "/v3/srtconns/list":
+            return {"items": [
+                {
+                    "id": f"srt-{index}",
+                    "remoteAddr": f"192.0.2.{index + 1}:9000",
+                    "bytesSent": self.bytes,
+                    "packetsRetrans": self.bytes // 1000,
+                    "msRTT": 20,
+                }
+                for index in range(self.reader_count)
+            ]}
+        if endpoint == "/v3/rtmpconns/list":
+            return {"items": [
+                {"id": "pub", "remoteAddr": "198.51.100.1:1935",
+                 "inboundBytes": self.bytes},
+                *[
+                    {
+                        "id": f"rtmp-{index}",
+                        "remoteAddr": f"203.0.113.{index + 1}:1935",
+                        "outboundBytes": self.bytes,
+                        "outboundFramesDiscarded": 0,
+                    }
+                    for index in range(self.reader_count)
+                ],
+            ]}
+        return {"items": []}
+
+
+class CycleStateTests(unittest.TestCase):
+    def test_planned_keys_are_served_without_redis_reads(self):
+        redis = CountingRedis()
+        state = CycleState(redis)
+        state.load(["a", "b"], ["1", None])
+
+        self.assertEqual(state.get("a"), "1")
+        self.assertIsNone(state.get("b"))
+        self.assertEqual(redis.round_trips, 0)
+        self.assertEqual(state.miss_count, 0)
+
+    def test_unplanned_key_falls_back_to_one_read(self):
+        redis = CountingRedis()
+        redis.values["late"] = "7"
+        state = CycleState(redis)
+
+        self.assertEqual(state.get("late"), "7")
+        self.assertEqual(state.get("late"), "7")
+        self.assertEqual(redis.round_trips, 1)
+        self.assertEqual(state.miss_count, 1)
+
+    def test_writes_are_deferred_and_visible_within_the_cycle(self):
+        redis = CountingRedis()
+        state = CycleState(redis)
+        state.load(["counter"], [None])
+
+        state.set("counter", 12, ex=30)
+        pipeline = state.pipeline()
+        pipeline.set("ts", 1.5, ex=30).execute()
+
+        self.assertEqual(state.get("counter"), "12")
+        self.assertEqual(state.get("ts"), "1.5")
+        self.assertEqual(redis.values, {})
+
+        target = redis.pipeline()
+        self.assertEqual(
+            state.cache.checkpoint_into(target), ["counter", "ts"]
+        )
+        target.execute()
+        self.assertEqual(redis.values, {"counter": "12", "ts": "1.5"})
+        self.assertEqual(redis.expirations, {"counter": 30, "ts": 30})
+        self.assertEqual(redis.round_trips, 1)
+
+    def test_bitrate_uses_the_buffer_like_a_redis_client(self):
+        redis = CountingRedis()
+        state = CycleState(redis)
+        state.load(list(bitrate_state_keys("rd:x")), ["0", "10.0", None])
+
+        mbps = calc_bitrate(
+            state, key="rd:x", bytes_now=1_250_000, now=11.0, ttl=300
+        )
+
+        self.assertEqual(mbps, 10.0)
+        self.assertEqual(redis.round_trips, 0)
+
+    def test_unique_keys_preserve_plan_order(self):
+        self.assertEqual(unique_keys(["b", "a", "b", "c"]), ["b", "a", "c"])
+
+
+class ConnectionStateCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        self.redis = CountingRedis()
+        self.cache = ConnectionStateCache(
+            self.redis, default_ttl=60, clock=lambda: self.now
+        )
+
+    def test_known_keys_are_not_rehydrated_again(self):
+        self.cache.load(["a", "b"], ["1", None])
+        self.cache.set("c", 3, ex=30)
+
+        self.assertEqual(self.cache.unknown_keys(["a", "b", "c", "d"]), ["d"])
+
+    def test_values_expire_like_redis_keys(self):
+        self.cache.set("short", 1, ex=5)
+        self.now = 105.0
+
+        self.assertEqual(self.cache.unknown_keys(["short"]), ["short"])
+        self.cache.load(["short"], [None])
+        self.assertIsNone(self.cache.get("short"))
+        self.assertEqual(self.redis.round_trips, 0)
+
+    def test_checkpoint_writes_only_dirty_keys_with_remaining_ttl(self):
+        self.cache.load(["loaded"], ["7"])
+        self.cache.set("counter", 12, ex=30)
+        self.cache.delete("gone")
+        self.now = 110.0
+
+        pipeline = self.redis.pipeline()
+        self.assertEqual(
+            self.cache.checkpoint_into(pipeline), ["counter", "gone"]
+        )
+        pipeline.execute()
+
+        self.assertEqual(self.redis.values, {"counter": "12"})
+        self.assertEqual(self.redis.expirations, {"counter": 20})
+        self.assertEqual(self.cache.checkpoint_into(self.redis.pipeline()), [])
+
+    def test_failed_checkpoint_can_be_requeued(self):
+        self.cache.set("counter", 12, ex=30)
+        keys = self.cache.checkpoint_into(self.redis.pipeline())
+
+        self.cache.mark_dirty(keys)
+
+        self.assertEqual(
+            self.cache.checkpoint_into(self.redis.pipeline()), ["counter"]
+        )
+
+    def test_purge_drops_expired_entries(self):
+        self.cache.set("old", 1, ex=5)
+        self.cache.set("new", 1, ex=50)
+        self.now = 106.0
+
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_deleted_keys_are_purged_after_their_checkpoint(self):
+        self.cache.delete("gone")
+        self.assertIsNone(self.cache.get("gone"))
+        self.cache.checkpoint_into(self.redis.pipeline())
+        self.now = 161.0
+
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.redis.round_trips, 0)
+
+
+class BatchedCollectorCycleTests(unittest.TestCase):
+    def run_cycles(self, reader_count):
+        self.redis = redis = CountingRedis()
+        client = ReaderFanoutClient(reader_count)
+        mediamtx_collector.r = redis
+        mediamtx_collector.snapshot_store = RedisStore(redis)
+        mediamtx_collector.mediamtx_client = client
+        mediamtx_collector.reset_poll_cache()
+        round_trips = []
+        for offset in range(3):
+            client.bytes = offset * 1_000_000
+            redis.round_trips = 0
+            with (
+                mock.patch.object(Path, "write_text"),
+                mock.patch.object(
+                    mediamtx_collector.time, "time", return_value=100.0 + offset
+                ),
+            ):
+                mediamtx_collector.collect_and_store()
+            round_trips.append(redis.round_trips)
+        snapshot = json.loads(redis.values[mediamtx_collector.REDIS_KEY])
+        return round_trips, snapshot
+
+    def test_round_trips_do_not_grow_with_connection_count(self):
+        small, _snapshot = self.run_cycles(2)
+        large, snapshot = self.run_cycles(40)
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(max(large), 4)
+        readers = snapshot[0]["readers"]
+        self.assertEqual(len(readers), 80)
+        self.assertEqual(readers[0]["srt_health"]["retrans_packets"], 1000)
+        self.assertEqual(readers[-1]["bitrate_mbps"], 8.0)
+        self.assertNotIn("rate_history", readers[-1])
+        history = stored_rate_history(self.redis, readers[-1])
+        self.assertEqual(history[-1], {"timestamp": 102.0, "mbps": 8.0})
+        self.assertEqual(len(history), 3)
+
+    def test_planned_cycle_has_no_unplanned_state_reads(self):
+        redis = CountingRedis()
+        client = ReaderFanoutClient(3)
+        mediamtx_collector.r = redis
+        mediamtx_collector.snapshot_store = RedisStore(redis)
+        mediamtx_collector.mediamtx_client = client
+        mediamtx_collector.reset_poll_cache()
+        states = []
+        original = mediamtx_collector.CycleState
+
+        def recording_state(redis_client, cache=None):
+            states.append(original(redis_client, cache))
+            return states[-1]
+
+        for offset in range(2):
+            client.bytes = offset * 1_000_000
+            with (
+                mock.patch.object(Path, "write_text"),
+                mock.patch.object(
+                    mediamtx_collector.time, "time", return_value=200.0 + offset
+                ),
+                mock.patch.object(
+                    mediamtx_collector, "CycleState", recording_state
+                ),
+            ):
+                mediamtx_collector.collect_and_store()
+
+        self.assertEqual([state.miss_count for state in states], [0, 0])
+
+    def test_state_is_checkpointed_on_cadence_not_every_cycle(self):
+        redis = CountingRedis()
+        client = ReaderFanoutClient(2)
+        mediamtx_collector.r = redis
+        mediamtx_collector.snapshot_store = RedisStore(redis)
+        mediamtx_collector.mediamtx_client = client
+        mediamtx_collector.reset_poll_cache()
+        state_key = "rd:fanout:srtConn:srt-0:prev_bytes"
+        checkpointed = []
+        for offset in range(7):
+            client.bytes = offset * 1_000_000
+            with (
+                mock.patch.object(Path, "write_text"),
+                mock.patch.object(
+                    mediamtx_collector.time, "time", return_value=300.0 + offset
+                ),
+            ):
+                mediamtx_collector.collect_and_store()
+            checkpointed.append(redis.values.get(state_key))
+
+        self.assertEqual(
+            checkpointed,
+            ["0", "0", "0", "0", "0", "5000000", "5000000"],
+        )
+
+    def test_restart_rehydrates_baselines_from_checkpoint(self):
+        redis = CountingRedis()
+        client = ReaderFanoutClient(2)
+        mediamtx_collector.r = redis
+        mediamtx_collector.snapshot_store = RedisStore(redis)
+        mediamtx_collector.mediamtx_client = client
+        mediamtx_collector.reset_poll_cache()
+
+        def collect(timestamp):
+            with (
+                mock.patch.object(Path, "write_text"),
+                mock.patch.object(
+                    mediamtx_collector.time, "time", return_value=timestamp
+                ),
+            ):
+                mediamtx_collector.collect_and_store()
+            return json.loads(redis.values[mediamtx_collector.REDIS_KEY])
+
+        collect(400.0)
+        client.bytes = 1_000_000
+        collect(401.0)
+        with mock.patch.object(mediamtx_collector.time, "time", return_value=401.0):
+            mediamtx_collector.checkpoint_connection_state()
+
+        mediamtx_collector.reset_poll_cache()
+        client.bytes = 2_000_000
+        readers = collect(402.0)[0]["readers"]
+
+        self.assertEqual(readers[0]["bitrate_mbps"], 8.0)
+
+
+class IncrementalEnrichmentTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = CountingRedis()
+        self.client = ReaderFanoutClient(2)
+        mediamtx_collector.r = self.redis
+        mediamtx_collector.snapshot_store = RedisStore(self.redis)
+        mediamtx_collector.mediamtx_client = self.client
+        mediamtx_collector.reset_poll_cache()
+
+    def collect(self, timestamp):
+        self.redis.history_reads = 0
+        with (
+            mock.patch.object(Path, "write_text"),
+            mock.patch.object(mediamtx_collector.time, "time", return_value=timestamp),
+        ):
+            metrics = mediamtx_collector.collect_and_store()
+        snapshot = json.loads(self.redis.values[mediamtx_collector.REDIS_KEY])
+        return snapshot, metrics
+
+    def test_unchanged_paths_reuse_history_windows(self):
+        reads = []
+        changed = []
+        for offset in range(3):
+            self.client.bytes = offset * 1_000_000
+            _snapshot, metrics = self.collect(500.0 + offset)
+            reads.append(self.redis.history_reads)
+            changed.append(metrics["changed_path_count"])
+
+        self.assertEqual(reads, [6, 0, 0])
+        self.assertEqual(changed, [1.0, 0.0, 0.0])
+
+    def test_structural_change_rereads_the_changed_path(self):
+        self.collect(600.0)
+        self.client.reader_count = 3
+        self.client.bytes = 1_000_000
+
+        _snapshot, metrics = self.collect(601.0)
+
+        self.assertEqual(metrics["changed_path_count"], 1.0)
+        self.assertEqual(self.redis.history_reads, 8)
+
+    def test_failed_preload_reads_windows_back_with_the_sample_writes(self):
+        self.collect(650.0)
+        mediamtx_collector.poll_cache.path_structures.clear()
+        self.client.bytes = 1_000_000
+        with mock.patch.object(
+            RedisStore, "read_cycle_state", side_effect=ConnectionError("down")
+        ):
+            self.collect(651.0)
+        buffered = len(mediamtx_collector.poll_cache.history_buffers)
+
+        self.client.bytes = 2_000_000
+        snapshot, _metrics = self.collect(652.0)
+
+        self.assertEqual(buffered, 6)
+        self.assertEqual(self.redis.history_reads, 0)
+        self.assertIn("window_metrics", snapshot[0]["readers"][-1])
+
+    def test_closed_buckets_are_rolled_up_without_rereading_samples(self):
+        reader = reader_connection_key("fanout", "srtConn", "srt-1")
+        for offset in range(11):
+            self.client.bytes = offset * 1_000_000
+            self.collect(800.0 + offset)
+        self.client.reader_count = 1
+        self.collect(811.0)
+
+        def stored(tier):
+            return RedisStore(self.redis).read_history(
+                connection_rollup_key(reader, tier),
+                from_timestamp=float("-inf"),
+                to_timestamp=float("inf"),
+            )
+
+        ten_seconds = stored("10s")
+        self.assertEqual([record["start"] for record in ten_seconds], [800.0, 810.0])
+        self.assertEqual(ten_seconds[0]["fields"]["transport_rtt_ms"][3], 10)
+        self.assertEqual(ten_seconds[1]["fields"]["transport_rtt_ms"][3], 1)
+        self.assertEqual([record["start"] for record in stored("1m")], [780.0])
+
+    def test_reused_windows_match_windows_read_from_redis(self):
+        # Cycles 62 s apart cross the read range between the two samples.
+        timestamps = [700.0, 701.0, 702.0, 763.0, 764.0]
+        incremental = []
+        for offset, timestamp in enumerate(timestamps):
+            self.client.bytes = offset * 1_000_000
+            incremental.append(self.collect(timestamp)[0])
+
+        self.redis.values.clear()
+        self.redis.sorted_sets.clear()
+        mediamtx_collector.reset_poll_cache()
+        reread = []
+        for offset, timestamp in enumerate(timestamps):
+            self.client.bytes = offset * 1_000_000
+            mediamtx_collector.poll_cache.path_structures.clear()
+            mediamtx_collector.poll_cache.history_buffers = None
+            reread.append(self.collect(timestamp)[0])
+
+        self.assertEqual(incremental, reread)
+        self.assertEqual(
+            reread[2][0]["readers"][-1]["window_metrics"],
+            incremental[2][0]["readers"][-1]["window_metrics"],
+        )
+        self.assertIn("history_id", reread[-1][0]["readers"][-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
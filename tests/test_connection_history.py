@@ -1,10 +1,14 @@
+import json
+import random
 import unittest
 
+from bin import connection_history
 from bin.connection_history import (
     average_rate,
     build_history_sample,
     jitter_history,
     rate_history,
+    summarize_histories,
     summarize_history,
 )
 
@@ -222,6 +226,24 @@ class HistorySummaryTests(unittest.TestCase):
         self.assertEqual(summary["timing"]["10s"]["sample_count"], 4)
         self.assertEqual(summary["timing"]["60s"]["sample_count"], 10)
 
+    def test_unordered_samples_keep_sample_order_within_each_window(self):
+        samples = [
+            {"timestamp": 58.0, "jitter_ms": 4.0, "retrans_packets": 1},
+            {"timestamp": 20.0, "jitter_ms": 9.0, "retrans_packets": 2},
+            {"timestamp": 61.0, "jitter_ms": 7.0, "retrans_packets": 4},
+            {"timestamp": 52.0, "jitter_ms": 2.0, "retrans_packets": True},
+        ]
+
+        summary = summarize_history(samples, 60.0)
+
+        self.assertEqual(summary["events"], {
+            "10s": {"retrans_packets": 1.0},
+            "60s": {"retrans_packets": 3.0},
+        })
+        self.assertEqual(summary["jitter"]["10s"]["current_ms"], 2.0)
+        self.assertEqual(summary["jitter"]["60s"]["sample_count"], 3)
+        self.assertEqual(summary["jitter"]["60s"]["p50_ms"], 4.0)
+
     def test_frame_discard_windows_sum_interval_deltas_separately(self):
         samples = [
             {"timestamp": 1.0, "frame_discard_delta": 10},
@@ -263,6 +285,68 @@ class HistorySummaryTests(unittest.TestCase):
         })
 
 
+def random_histories(seed, count):
+    rng = random.Random(seed)
+    values = [None, 0, 3, 2.5, -0.0, True, "n/a", float("nan"), float("inf")]
+
+    def value():
+        return rng.choice(values + [rng.random() * 100] * 4)
+
+    histories = []
+    for _ in range(count):
+        now = 1000.0 + rng.random()
+        samples = []
+        for _ in range(rng.randint(0, 70)):
+            sample = {"timestamp": now - rng.random() * 70}
+            for field in (
+                "transport_rtt_ms", "retrans_packets", "loss_packets",
+                "frame_discard_delta", "jitter_ms",
+            ):
+                if rng.random() < 0.7:
+                    sample[field] = value()
+            if rng.random() < 0.4:
+                sample["protocol_counter_deltas"] = {
+                    name: value()
+                    for name in rng.sample(["loss", "nack", "pli"], 2)
+                }
+            samples.append(sample)
+        samples.sort(key=lambda sample: sample["timestamp"])
+        histories.append((samples, now))
+    return histories
+
+
+class BatchSummaryTests(unittest.TestCase):
+    def expected(self, histories):
+        return json.dumps([
+            summarize_history(samples, now) for samples, now in histories
+        ])
+
+    def test_pure_python_batch_matches_single_summaries(self):
+        histories = random_histories(1, 20)
+
+        self.assertEqual(
+            json.dumps(summarize_histories(histories, vectorized=False)),
+            self.expected(histories),
+        )
+
+    @unittest.skipIf(connection_history.numpy is None, "NumPy not installed")
+    def test_vectorized_batch_matches_pure_python_exactly(self):
+        for seed in range(20):
+            histories = random_histories(seed, 30)
+            with self.subTest(seed=seed):
+                self.assertEqual(
+                    json.dumps(summarize_histories(histories, vectorized=True)),
+                    self.expected(histories),
+                )
+
+    def test_empty_batch_and_empty_windows(self):
+        self.assertEqual(summarize_histories([], vectorized=True), [])
+        self.assertEqual(
+            summarize_histories([([], 10.0), ([{"timestamp": 1.0}], 10.0)]),
+            [{}, {}],
+        )
+
+
 class RateHistoryTests(unittest.TestCase):
     def test_ten_second_average_uses_available_burst_samples_without_mutation(self):
         samples = [
@@ -18,7 +18,7 @@ class LifecycleMediaMTXClient:
     def build_url(self, endpoint):
         return f"http://localhost:9997{endpoint}"
 
-    def get_json(self, endpoint, params=None):
+    def get_json(self, endpoint, params=None, timeout=None):
         self.calls.append((endpoint, params))
         if endpoint == "/v3/info":
             return {"version": "1.20.0"}
@@ -52,7 +52,7 @@ class LifecycleMediaMTXClient:
 
 
 class FailingPathsClient(LifecycleMediaMTXClient):
-    def get_json(self, endpoint, params=None):
+    def get_json(self, endpoint, params=None, timeout=None):
         if endpoint == "/v3/paths/list":
             raise MediaMTXRequestError("paths unavailable")
         return super().get_json(endpoint, params=params)
@@ -0,0 +1,117 @@
+import json
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bin import mediamtx_collector
+from bin.cycle_metrics import CycleMetricsWindow
+from bin.redis_keys import COLLECTOR_METRICS_KEY
+from bin.redis_store import RedisStore
+from tests.test_collector_state import ReaderFanoutClient
+from tests.test_interval_loops import FakeClock
+from tests.test_srt_health import FakeRedis
+
+
+class CycleMetricsWindowTests(unittest.TestCase):
+    def test_summary_reports_percentiles_max_and_last_value(self):
+        window = CycleMetricsWindow(10, clock=lambda: 50.0)
+        for duration in (10, 20, 30, 40, 100):
+            window.record({"cycle_duration_ms": duration, "api_request_count": 3})
+
+        summary = window.summary()
+
+        self.assertEqual(summary["updated_at"], 50.0)
+        self.assertEqual(summary["window_cycles"], 5)
+        self.assertEqual(summary["metrics"]["cycle_duration_ms"], {
+            "p50": 30.0, "p95": 88.0, "max": 100.0, "last": 100.0,
+        })
+        self.assertEqual(summary["metrics"]["api_request_count"]["p95"], 3.0)
+
+    def test_window_is_bounded_and_missed_intervals_age_out_with_cycles(self):
+        window = CycleMetricsWindow(3)
+        window.record({"cycle_duration_ms": 5000})
+        window.record_missed(4)
+        for _cycle in range(3):
+            window.record({"cycle_duration_ms": 10})
+
+        summary = window.summary()
+
+        self.assertEqual(summary["window_cycles"], 3)
+        self.assertEqual(summary["cycles_total"], 4)
+        self.assertEqual(summary["metrics"]["cycle_duration_ms"]["max"], 10.0)
+        self.assertEqual(summary["missed_intervals"], 0)
+        self.assertEqual(summary["missed_intervals_total"], 4)
+
+    def test_empty_window_has_no_metrics(self):
+        summary = CycleMetricsWindow().summary()
+
+        self.assertEqual(summary["metrics"], {})
+        self.assertEqual(summary["missed_intervals"], 0)
+
+
+class CollectorCycleMetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.client = ReaderFanoutClient(2)
+        mediamtx_collector.r = self.redis
+        mediamtx_collector.snapshot_store = RedisStore(self.redis)
+        mediamtx_collector.mediamtx_client = self.client
+        mediamtx_collector.reset_poll_cache()
+
+    def collect(self, timestamp):
+        with (
+            mock.patch.object(Path, "write_text"),
+            mock.patch.object(mediamtx_collector.time, "time", return_value=timestamp),
+        ):
+            mediamtx_collector.collect_and_store()
+
+    def published(self):
+        return json.loads(self.redis.values[COLLECTOR_METRICS_KEY])
+
+    def test_metrics_are_published_on_their_own_cadence(self):
+        self.collect(100.0)
+        first = self.published()
+        self.collect(101.0)
+        self.assertEqual(self.published(), first)
+        self.collect(105.0)
+
+        summary = self.published()
+        self.assertEqual(summary["cycles_total"], 2)
+        self.assertEqual(summary["interval_seconds"], 1)
+        self.assertIn("cycle_duration_ms", summary["metrics"])
+        self.assertIn("redis_snapshot_duration_ms", summary["metrics"])
+
+    def test_failed_cycles_are_counted_and_published(self):
+        self.client.get_json = mock.Mock(
+            side_effect=mediamtx_collector.MediaMTXError("down")
+        )
+
+        self.collect(200.0)
+
+        self.assertEqual(self.published()["cycles_total"], 1)
+
+    def test_interval_loop_records_missed_intervals(self):
+        clock = FakeClock()
+        calls = 0
+
+        def slow_job():
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise KeyboardInterrupt
+            clock.now += 12.0
+
+        with (
+            mock.patch.object(mediamtx_collector.time, "monotonic", clock.monotonic),
+            mock.patch.object(mediamtx_collector.time, "sleep", clock.sleep),
+            mock.patch.object(mediamtx_collector.logging, "warning"),
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                mediamtx_collector._run_interval_loop(slow_job, 5.0)
+
+        window = mediamtx_collector.poll_cache.cycle_metrics
+        self.assertEqual(window.missed_interval_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
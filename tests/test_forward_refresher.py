@@ -0,0 +1,111 @@
+import threading
+import unittest
+
+from bin.forward_refresher import ForwardDestinationRefresher
+
+
+class RecordingFetch:
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, name):
+        with self.lock:
+            self.calls.append(name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            return [{"path": name, "url": f"srt://target/{name}"}]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class ForwardDestinationRefresherTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.fetch = RecordingFetch()
+        self.destinations = {}
+        self.refresher = ForwardDestinationRefresher(
+            self.fetch,
+            self.destinations,
+            workers=2,
+            min_interval_seconds=5,
+            revalidate_seconds=60,
+            clock=lambda: self.now,
+        )
+        self.addCleanup(self.refresher.stop)
+
+    def test_new_paths_are_polled_once_and_unchanged_paths_are_not_repolled(self):
+        self.refresher.observe({"a": 1, "b": 1})
+
+        self.assertEqual(self.refresher.refresh_due(), 2)
+        self.now += 1
+        self.refresher.observe({"a": 1, "b": 1})
+
+        self.assertEqual(self.refresher.refresh_due(), 0)
+        self.assertEqual(sorted(self.fetch.calls), ["a", "b"])
+        self.assertEqual(
+            self.destinations["a"], [{"path": "a", "url": "srt://target/a"}]
+        )
+
+    def test_changed_path_is_repolled_no_faster_than_min_interval(self):
+        self.refresher.observe({"a": 1})
+        self.refresher.refresh_due()
+
+        self.now += 2
+        self.refresher.observe({"a": 2})
+        self.assertEqual(self.refresher.refresh_due(), 0)
+        self.now += 3
+        self.assertEqual(self.refresher.refresh_due(), 1)
+
+    def test_removed_paths_are_dropped(self):
+        self.refresher.observe({"a": 1, "b": 1})
+        self.refresher.refresh_due()
+
+        self.refresher.observe({"b": 1})
+
+        self.assertEqual(list(self.destinations), ["b"])
+
+    def test_unchanged_paths_are_revalidated_spread_across_window(self):
+        names = [f"path-{index}" for index in range(400)]
+        self.refresher.observe(dict.fromkeys(names, 1))
+        self.refresher.refresh_due()
+        self.fetch.calls.clear()
+
+        per_second = []
+        for _second in range(65):
+            self.now += 1
+            per_second.append(self.refresher.refresh_due())
+
+        self.assertEqual(set(self.fetch.calls), set(names))
+        self.assertLessEqual(max(per_second), 25)
+        self.assertLessEqual(self.fetch.max_active, 2)
+
+    def test_background_loop_refreshes_without_blocking_observe(self):
+        refresher = ForwardDestinationRefresher(
+            self.fetch, self.destinations, workers=2
+        )
+        self.addCleanup(refresher.stop)
+        refreshed = threading.Event()
+        original = self.fetch.__call__
+
+        def fetch_and_signal(name):
+            result = original(name)
+            refreshed.set()
+            return result
+
+        refresher._fetch = fetch_and_signal
+        refresher.start()
+        refresher.observe({"live": 1})
+
+        self.assertTrue(refreshed.wait(2))
+        refresher.stop(timeout=2)
+        self.assertFalse(refresher.running)
+        self.assertIn("live", self.destinations)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from bin.history_buffer import HistoryBuffers, HistoryRing, history_capacity
+
+
+def timestamps(samples):
+    return [sample["timestamp"] for sample in samples]
+
+
+class HistoryRingTests(unittest.TestCase):
+    def test_full_ring_overwrites_the_oldest_sample(self):
+        ring = HistoryRing(3)
+        for timestamp in (1.0, 2.0, 3.0, 4.0):
+            ring.append({"timestamp": timestamp}, timestamp)
+
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(timestamps(ring), [2.0, 3.0, 4.0])
+
+    def test_identical_newest_sample_is_not_repeated(self):
+        ring = HistoryRing(4)
+        ring.append({"timestamp": 1.0, "v": 1}, 1.0)
+        ring.append({"timestamp": 1.0, "v": 1}, 1.0)
+
+        self.assertEqual(len(ring), 1)
+
+    def test_clock_step_back_keeps_timestamp_order(self):
+        ring = HistoryRing(4)
+        for timestamp in (10.0, 12.0, 11.0):
+            ring.append({"timestamp": timestamp}, timestamp)
+
+        self.assertEqual(timestamps(ring), [10.0, 11.0, 12.0])
+        self.assertEqual(timestamps(ring.window(0.0, 11.0)), [10.0, 11.0])
+
+
+class HistoryBuffersTests(unittest.TestCase):
+    def setUp(self):
+        self.buffers = HistoryBuffers(capacity=8, span_seconds=3)
+
+    def test_unknown_connection_has_no_window(self):
+        self.assertIsNone(self.buffers.append("a", {"timestamp": 1.0}, 1.0))
+
+    def test_window_matches_the_inclusive_read_range(self):
+        self.buffers.seed("a", [{"timestamp": 1.0}, {"timestamp": 2.0}])
+
+        window = self.buffers.append("a", {"timestamp": 4.0}, 4.0)
+        window = self.buffers.append("a", {"timestamp": 5.0}, 5.0)
+
+        self.assertEqual(timestamps(window), [2.0, 4.0, 5.0])
+
+    def test_retain_drops_ended_connections(self):
+        self.buffers.seed("a", [])
+        self.buffers.seed("b", [])
+
+        self.buffers.retain(["b"])
+
+        self.assertNotIn("a", self.buffers)
+        self.assertIn("b", self.buffers)
+        self.assertEqual(len(self.buffers), 1)
+
+    def test_capacity_covers_the_span_twice(self):
+        self.assertEqual(history_capacity(60, 1), 122)
+        self.assertEqual(history_capacity(60, 5), 26)
+
+
+if __name__ == "__main__":
+    unittest.main()
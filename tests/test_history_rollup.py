@@ -0,0 +1,141 @@
+import unittest
+
+from bin.history_rollup import (
+    ConnectionRollup,
+    HistoryRollups,
+    RollupTier,
+    expand_rollups,
+)
+
+
+def closed_by_tier(closed):
+    return [(tier.name, record["start"]) for tier, record in closed]
+
+
+class ConnectionRollupTests(unittest.TestCase):
+    def setUp(self):
+        self.rollup = ConnectionRollup()
+
+    def feed(self, timestamps, **fields):
+        closed = []
+        for timestamp in timestamps:
+            closed.extend(self.rollup.add(
+                {"timestamp": timestamp, **fields}, timestamp
+            ))
+        return closed
+
+    def test_ten_second_bucket_closes_when_the_next_one_starts(self):
+        self.assertEqual(self.feed([0.0, 4.0, 9.5], rx_mbps=2.0), [])
+
+        closed = self.feed([10.0], rx_mbps=4.0)
+
+        self.assertEqual(closed_by_tier(closed), [("10s", 0.0)])
+        self.assertEqual(closed[0][1]["fields"], {"rx_mbps": [2.0, 2.0, 6.0, 3]})
+
+    def test_minute_bucket_closes_with_its_last_ten_second_bucket(self):
+        closed = self.feed(range(0, 61), rx_mbps=1.0)
+
+        self.assertEqual(closed_by_tier(closed)[-2:], [("10s", 50.0), ("1m", 0.0)])
+
+    def test_minute_bucket_merges_ten_second_aggregates(self):
+        closed = []
+        for timestamp, value in ((5.0, 1.0), (15.0, 7.0), (25.0, 4.0), (60.0, 0.0)):
+            closed.extend(self.rollup.add({"loss_packets": value}, timestamp))
+
+        minute = dict(closed_by_tier(closed))
+        self.assertNotIn("1m", minute)
+        closed.extend(self.rollup.close())
+        records = {
+            (tier.name, record["start"]): record["fields"] for tier, record in closed
+        }
+        self.assertEqual(records[("1m", 0.0)], {"loss_packets": [1.0, 7.0, 12.0, 3]})
+        self.assertEqual(records[("1m", 60.0)], {"loss_packets": [0.0, 0.0, 0.0, 1]})
+
+    def test_gap_closes_the_open_minute_before_opening_the_next(self):
+        self.feed([5.0], rx_mbps=1.0)
+        closed = self.feed([125.0], rx_mbps=1.0)
+
+        self.assertEqual(closed_by_tier(closed), [("10s", 0.0)])
+        closed = self.feed([135.0], rx_mbps=1.0)
+
+        self.assertEqual(closed_by_tier(closed), [("10s", 120.0), ("1m", 0.0)])
+        self.assertEqual(
+            closed_by_tier(self.rollup.close()), [("10s", 130.0), ("1m", 120.0)]
+        )
+
+    def test_only_finite_numbers_are_rolled_up(self):
+        self.rollup.add({
+            "timestamp": 1.0,
+            "rx_mbps": float("nan"),
+            "event": True,
+            "state": "publish",
+            "jitter_ms": 3,
+        }, 1.0)
+
+        closed = self.rollup.close()
+
+        self.assertEqual(closed[0][1]["fields"], {"jitter_ms": [3.0, 3.0, 3.0, 1]})
+
+    def test_clock_step_back_keeps_the_open_bucket(self):
+        self.feed([25.0, 18.0, 29.0], rx_mbps=1.0)
+
+        closed = self.rollup.close()
+
+        self.assertEqual(closed_by_tier(closed), [("10s", 20.0), ("1m", 0.0)])
+        self.assertEqual(closed[0][1]["fields"]["rx_mbps"][3], 3)
+
+    def test_custom_tiers_cascade(self):
+        rollup = ConnectionRollup((
+            RollupTier("1s", 1, 60),
+            RollupTier("2s", 2, 60),
+            RollupTier("4s", 4, 60),
+        ))
+
+        closed = []
+        for timestamp in (0.0, 1.0, 2.0, 3.0):
+            closed.extend(rollup.add({"v": timestamp}, timestamp))
+
+        self.assertEqual(
+            closed_by_tier(closed),
+            [("1s", 0.0), ("1s", 1.0), ("2s", 0.0), ("1s", 2.0)],
+        )
+        self.assertEqual(
+            closed_by_tier(rollup.close()), [("1s", 3.0), ("2s", 2.0), ("4s", 0.0)]
+        )
+
+
+class HistoryRollupsTests(unittest.TestCase):
+    def test_connections_missing_from_a_cycle_are_closed(self):
+        rollups = HistoryRollups()
+        rollups.add("a", {"rx_mbps": 1.0}, 1.0)
+        rollups.add("b", {"rx_mbps": 2.0}, 1.0)
+        self.assertEqual(rollups.close_unseen(), [])
+
+        rollups.add("b", {"rx_mbps": 2.0}, 2.0)
+        closed = rollups.close_unseen()
+
+        self.assertEqual(
+            [(key, tier.name) for key, tier, _record in closed],
+            [("a", "10s"), ("a", "1m")],
+        )
+        self.assertEqual(len(rollups), 1)
+
+
+class ExpandRollupsTests(unittest.TestCase):
+    def test_records_of_one_bucket_are_merged_in_start_order(self):
+        buckets = expand_rollups([
+            {"start": 20.0, "fields": {"v": [4.0, 4.0, 4.0, 1]}},
+            {"start": 10.0, "fields": {"v": [1.0, 2.0, 3.0, 2]}},
+            {"start": 10.0, "fields": {"v": [0.0, 0.0, 0.0, 1]}},
+            {"start": "bad"},
+        ])
+
+        self.assertEqual([bucket["start"] for bucket in buckets], [10.0, 20.0])
+        self.assertEqual(
+            buckets[0]["fields"]["v"],
+            {"min": 0.0, "max": 2.0, "mean": 1.0, "sum": 3.0, "count": 3},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import assert from "node:assert/strict";
+import test from "node:test";
+
+import {
+  attachHistories,
+  refreshHistories,
+  resetHistories,
+} from "../static/js/history-store.js";
+
+function historyFetch(replies, urls) {
+  return async url => {
+    urls.push(url);
+    return {ok: true, json: async () => replies.shift()};
+  };
+}
+
+function camera() {
+  return {
+    name: "live/cam",
+    source: {type: "rtmpConn", id: "a", history_id: "pub:live/cam:rtmpConn:a"},
+    readers: [{type: "hlsSession", id: "b"}],
+  };
+}
+
+test("only visible streams fetch their history", async () => {
+  resetHistories();
+  const urls = [];
+  const hidden = {...camera(), name: "hidden"};
+  hidden.source = {...hidden.source, history_id: "pub:hidden:rtmpConn:a"};
+
+  await refreshHistories(
+    [camera(), hidden],
+    stream => stream.name === "live/cam",
+    historyFetch([{rate: [], jitter: [], until: null}], urls),
+  );
+
+  assert.deepEqual(urls, ["/api/history/pub%3Alive%2Fcam%3ArtmpConn%3Aa"]);
+});
+
+test("new points are appended after the last received timestamp", async () => {
+  resetHistories();
+  const urls = [];
+  const fetchImpl = historyFetch([
+    {rate: [{timestamp: 10, mbps: 1}], jitter: [], until: 10},
+    {rate: [{timestamp: 80, mbps: 2}], jitter: [{timestamp: 80, ms: 3}], until: 80},
+  ], urls);
+
+  assert.equal(await refreshHistories([camera()], () => true, fetchImpl), true);
+  assert.equal(await refreshHistories([camera()], () => true, fetchImpl), true);
+  const streams = [camera()];
+  attachHistories(streams);
+
+  assert.equal(urls[1], "/api/history/pub%3Alive%2Fcam%3ArtmpConn%3Aa?since=10");
+  // Punkte außerhalb des 60-Sekunden-Fensters fallen weg.
+  assert.deepEqual(streams[0].source.rate_history, [{timestamp: 80, mbps: 2}]);
+  assert.deepEqual(streams[0].source.jitter_history, [{timestamp: 80, ms: 3}]);
+  assert.equal(streams[0].readers[0].rate_history, undefined);
+});
+
+test("connections missing from the snapshot are forgotten", async () => {
+  resetHistories();
+  const urls = [];
+  const fetchImpl = historyFetch([
+    {rate: [{timestamp: 10, mbps: 1}], jitter: [], until: 10},
+    {rate: [], jitter: [], until: null},
+  ], urls);
+
+  await refreshHistories([camera()], () => true, fetchImpl);
+  await refreshHistories([], () => true, fetchImpl);
+  await refreshHistories([camera()], () => true, fetchImpl);
+
+  assert.deepEqual(urls, [
+    "/api/history/pub%3Alive%2Fcam%3ArtmpConn%3Aa",
+    "/api/history/pub%3Alive%2Fcam%3ArtmpConn%3Aa",
+  ]);
+});
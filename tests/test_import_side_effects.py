@@ -44,11 +44,23 @@ class ProductModuleImportTests(unittest.TestCase):
 
             fastapi_module = types.ModuleType("fastapi")
             fastapi_module.FastAPI = FakeFastAPI
+            fastapi_module.Request = object
+            fastapi_module.Header = lambda default=None, **kwargs: default
             responses_module = types.ModuleType("fastapi.responses")
-            responses_module.JSONResponse = lambda *args, **kwargs: None
+            class FakeJSONResponse:
+                def __init__(self, *args, **kwargs):
+                    pass
+
+            responses_module.JSONResponse = FakeJSONResponse
             responses_module.FileResponse = lambda *args, **kwargs: None
+            responses_module.StreamingResponse = lambda *args, **kwargs: None
+            responses_module.Response = FakeJSONResponse
             staticfiles_module = types.ModuleType("fastapi.staticfiles")
-            staticfiles_module.StaticFiles = lambda *args, **kwargs: object()
+            class FakeStaticFiles:
+                def __init__(self, *args, **kwargs):
+                    pass
+
+            staticfiles_module.StaticFiles = FakeStaticFiles
 
             with (
                 mock.patch("builtins.open", side_effect=guarded_open),
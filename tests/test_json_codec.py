@@ -0,0 +1,49 @@
+import json
+import unittest
+
+from bin import json_codec
+
+
+class JSONCodecTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(json_codec.select_codec, json_codec.codec_name())
+
+    def test_fastest_installed_codec_is_active_by_default(self):
+        preferred = next(
+            name for name in ("orjson", "msgspec", "stdlib")
+            if name in json_codec.CODECS
+        )
+        self.assertEqual(json_codec.codec_name(), preferred)
+
+    def test_every_installed_codec_produces_the_same_compact_text(self):
+        value = {"b": [1, 2.5, None], "a": {"name": "kamera/ö", "ok": True}}
+        expected = '{"a":{"name":"kamera/ö","ok":true},"b":[1,2.5,null]}'
+
+        for name in json_codec.CODECS:
+            with self.subTest(codec=name):
+                json_codec.select_codec(name)
+                self.assertEqual(json_codec.dumps(value, sort_keys=True), expected)
+                self.assertEqual(json_codec.loads(expected), value)
+                self.assertEqual(
+                    json.loads(json_codec.dumps(value, indent=True)), value
+                )
+
+    def test_invalid_payloads_raise_one_decode_error_type(self):
+        for name in json_codec.CODECS:
+            with self.subTest(codec=name):
+                json_codec.select_codec(name)
+                for payload in ("not-json", "", None):
+                    with self.assertRaises(json_codec.DecodeError):
+                        json_codec.loads(payload)
+
+    def test_unserializable_values_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            json_codec.dumps({"value": object()})
+
+    def test_unknown_codec_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "nicht verfügbar"):
+            json_codec.select_codec("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 from unittest import mock
 
@@ -72,6 +74,17 @@ class MediaMTXClientTests(unittest.TestCase):
 
         self.assertEqual(session.calls[0][2], 1.5)
 
+    def test_request_timeout_only_shortens_the_configured_timeout(self):
+        session = FakeSession(FakeResponse({"version": "1.20.0"}))
+        client = MediaMTXClient(
+            "http://media.example:9997", timeout=1.5, session=session
+        )
+
+        client.get_json("v3/info", timeout=0.4)
+        client.get_json("v3/info", timeout=5.0)
+
+        self.assertEqual([call[2] for call in session.calls], [0.4, 1.5])
+
     def test_http_error_exposes_status_for_optional_endpoint_decision(self):
         client = MediaMTXClient(
             "http://localhost:9997", session=FakeSession(FakeResponse(status_code=404))
@@ -127,5 +140,125 @@ class CollectorClientBoundaryTests(unittest.TestCase):
         warning.assert_not_called()
 
 
+class ConcurrentDetailFetchTests(unittest.TestCase):
+    def setUp(self):
+        import bin.mediamtx_collector as collector
+
+        self.collector = collector
+        self.addCleanup(collector.shutdown_fetch_executor)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def client(self, get_json):
+        client = mock.Mock()
+        client.build_url.side_effect = lambda endpoint: (
+            f"http://localhost:9997{endpoint}"
+        )
+        client.get_json.side_effect = get_json
+        return client
+
+    def fetch_all(self, client, endpoints, **settings):
+        settings.setdefault("detail_fetch_workers", 4)
+        settings.setdefault("detail_fetch_deadline_seconds", 2.0)
+        with (
+            mock.patch.object(self.collector, "mediamtx_client", client),
+            mock.patch.dict(self.collector.COLLECTOR_CFG, settings),
+            mock.patch.object(self.collector.logging, "warning") as warning,
+        ):
+            return self.collector.fetch_all(endpoints), warning
+
+    def test_detail_lists_are_fetched_in_parallel(self):
+        endpoints = [
+            "/v3/srtconns/list", "/v3/rtmpconns/list", "/v3/hlsmuxers/list"
+        ]
+        barrier = threading.Barrier(len(endpoints), timeout=2)
+
+        def get_json(endpoint, params=None, timeout=None):
+            barrier.wait()
+            return {"items": [endpoint]}
+
+        results, warning = self.fetch_all(self.client(get_json), endpoints)
+
+        self.assertEqual(
+            results, {endpoint: {"items": [endpoint]} for endpoint in endpoints}
+        )
+        warning.assert_not_called()
+
+    def test_slow_endpoint_degrades_to_empty_after_cycle_deadline(self):
+        def get_json(endpoint, params=None, timeout=None):
+            if endpoint == "/v3/webrtcsessions/list":
+                self.release.wait(2)
+            return {"items": [endpoint]}
+
+        results, warning = self.fetch_all(
+            self.client(get_json),
+            ["/v3/srtconns/list", "/v3/webrtcsessions/list"],
+            detail_fetch_deadline_seconds=0.05,
+        )
+
+        self.assertEqual(
+            results["/v3/srtconns/list"], {"items": ["/v3/srtconns/list"]}
+        )
+        self.assertEqual(results["/v3/webrtcsessions/list"], {"items": []})
+        warning.assert_called_once()
+
+    def test_detail_requests_time_out_at_the_cycle_deadline(self):
+        timeouts = []
+
+        def get_json(endpoint, params=None, timeout=None):
+            timeouts.append(timeout)
+            return {"items": []}
+
+        self.fetch_all(
+            self.client(get_json),
+            ["/v3/srtconns/list", "/v3/webrtcsessions/list"],
+            detail_fetch_deadline_seconds=0.5,
+        )
+
+        self.assertEqual(len(timeouts), 2)
+        self.assertTrue(all(0 < timeout <= 0.5 for timeout in timeouts))
+
+    def test_request_started_after_the_deadline_is_skipped(self):
+        get_json = mock.Mock(return_value={"items": ["late"]})
+
+        client = self.client(get_json)
+        with mock.patch.object(self.collector, "mediamtx_client", client):
+            result = self.collector._fetch_before(
+                time.monotonic() - 1, "/v3/srtconns/list"
+            )
+
+        self.assertEqual(result, {"items": []})
+        get_json.assert_not_called()
+
+    def test_optional_failure_policy_applies_to_parallel_fetches(self):
+        def get_json(endpoint, params=None, timeout=None):
+            raise MediaMTXHTTPError(f"http://localhost:9997{endpoint}", 404)
+
+        results, warning = self.fetch_all(
+            self.client(get_json), ["/v3/rtspsconns/list", "/v3/srtconns/list"]
+        )
+
+        self.assertEqual(
+            results,
+            {"/v3/rtspsconns/list": {"items": []}, "/v3/srtconns/list": {"items": []}},
+        )
+        self.assertEqual(warning.call_count, 1)
+
+    def test_single_worker_keeps_serial_fetching(self):
+        threads = []
+
+        def get_json(endpoint, params=None, timeout=None):
+            threads.append(threading.current_thread())
+            return {"items": []}
+
+        self.fetch_all(
+            self.client(get_json),
+            ["/v3/srtconns/list", "/v3/rtmpconns/list"],
+            detail_fetch_workers=1,
+        )
+
+        self.assertEqual(threads, [threading.current_thread()] * 2)
+
+
 if __name__ == "__main__":
     unittest.main()
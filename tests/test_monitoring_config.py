@@ -58,6 +58,7 @@ class MonitoringConfigTests(unittest.TestCase):
             "port": 6379,
             "namespace": "mediamtx-monitor:",
             "key": "streams:latest",
+            "snapshot_layout": "both",
         })
         self.assertEqual(resolved["node"], {"id": "local"})
         self.assertEqual(resolved["collector"]["interval_seconds"], 7)
@@ -153,6 +154,10 @@ class MonitoringConfigTests(unittest.TestCase):
                 })
                 self.assertEqual(resolved["namespace"], expected)
 
+    def test_unknown_snapshot_layout_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "redis.snapshot_layout"):
+            resolve_redis_config({"redis": {"snapshot_layout": "rows"}})
+
     def test_explicit_invalid_namespace_is_rejected(self):
         for namespace in ("", "   ", ":", ":::", None, 42):
             with self.subTest(namespace=namespace):
@@ -182,6 +187,57 @@ class MonitoringConfigTests(unittest.TestCase):
                 with self.assertRaisesRegex(ValueError, "node.id"):
                     resolve_node_config({"node": {"id": node_id}})
 
+    def test_collector_runtime_is_validated(self):
+        self.assertEqual(
+            resolve_collector_config({"collector": {"runtime": "asyncio"}})["runtime"],
+            "asyncio",
+        )
+        with self.assertRaisesRegex(ValueError, "collector.runtime"):
+            resolve_collector_config({"collector": {"runtime": "trio"}})
+
+    def test_collector_nodes_are_resolved_and_validated(self):
+        resolved = resolve_collector_config({"collector": {
+            "interval_seconds": 2,
+            "nodes": [
+                {"id": " edge-01 ", "api_base_url": "http://10.0.0.11:9997"},
+                {
+                    "id": "edge-02",
+                    "api_base_url": "http://10.0.0.12:9997",
+                    "interval_seconds": 5,
+                },
+            ],
+        }})
+
+        self.assertEqual(resolved["nodes"], [
+            {
+                "id": "edge-01",
+                "api_base_url": "http://10.0.0.11:9997",
+                "interval_seconds": 2,
+            },
+            {
+                "id": "edge-02",
+                "api_base_url": "http://10.0.0.12:9997",
+                "interval_seconds": 5,
+            },
+        ])
+        self.assertEqual(resolve_collector_config({})["nodes"], [])
+        for nodes, message in (
+            ({"id": "edge-01"}, "collector.nodes"),
+            ([{"api_base_url": "http://edge:9997"}], "id"),
+            ([{"id": "edge-01"}], "api_base_url"),
+            ([{"id": "edge:01", "api_base_url": "http://edge:9997"}], "node.id"),
+            (
+                [
+                    {"id": "edge-01", "api_base_url": "http://a:9997"},
+                    {"id": "edge-01", "api_base_url": "http://b:9997"},
+                ],
+                "mehrfach",
+            ),
+        ):
+            with self.subTest(nodes=nodes):
+                with self.assertRaisesRegex(ValueError, message):
+                    resolve_collector_config({"collector": {"nodes": nodes}})
+
     def test_invalid_optional_blocks_fall_back_to_defaults(self):
         config = {
             "redis": [],
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bin import mediamtx_collector
+from bin.redis_store import NamespacedRedis, RedisStore
+from tests.test_async_collector import AsyncFakeRedis, SlowAsyncClient
+from tests.test_collector_state import ReaderFanoutClient
+from tests.test_srt_health import FakeRedis
+
+
+class RecordingFanoutClient(ReaderFanoutClient):
+    """Fan-out client that records the endpoints it served."""
+
+    def __init__(self, reader_count, base_url):
+        super().__init__(reader_count)
+        self.base_url = base_url
+        self.endpoints = []
+        self.lock = threading.Lock()
+
+    def build_url(self, endpoint):
+        return f"{self.base_url}{endpoint}"
+
+    def get_json(self, endpoint, params=None, timeout=None):
+        with self.lock:
+            self.endpoints.append(endpoint)
+        return super().get_json(endpoint, params=params)
+
+
+class MultiNodeCollectorTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.clients = {
+            "edge-01": RecordingFanoutClient(1, "http://edge-01:9997"),
+            "edge-02": RecordingFanoutClient(3, "http://edge-02:9997"),
+        }
+        self.nodes = []
+        for node_id, client in self.clients.items():
+            node_redis = NamespacedRedis(self.redis, "mediamtx-monitor:", node_id)
+            self.nodes.append(mediamtx_collector.CollectorNode(
+                node_id=node_id,
+                api_base_url=client.base_url,
+                interval_seconds=1,
+                output_json_path=f"/tmp/streams.{node_id}.json",
+                r=node_redis,
+                snapshot_store=RedisStore(node_redis),
+                mediamtx_client=client,
+            ))
+        # The module-level node must stay untouched by fleet cycles.
+        mediamtx_collector.r = None
+        mediamtx_collector.mediamtx_client = None
+        mediamtx_collector.reset_poll_cache()
+        mediamtx_collector.collector_nodes[:] = self.nodes
+        self.addCleanup(mediamtx_collector.collector_nodes.clear)
+        for node in self.nodes:
+            self.addCleanup(mediamtx_collector._run_in_node, node,
+                            mediamtx_collector._release_node)
+
+    def snapshot(self, node_id):
+        key = f"mediamtx-monitor:node:{node_id}:{mediamtx_collector.REDIS_KEY}"
+        return json.loads(self.redis.values[key])
+
+    def assert_nodes_collected_separately(self):
+        self.assertEqual(len(self.snapshot("edge-01")[0]["readers"]), 2)
+        self.assertEqual(len(self.snapshot("edge-02")[0]["readers"]), 6)
+        for node in self.nodes:
+            self.assertIn("/v3/srtconns/list", self.clients[node.node_id].endpoints)
+            self.assertEqual(node.poll_cache.mediamtx_version, "1.20.0")
+        self.assertIsNone(mediamtx_collector.poll_cache.mediamtx_version)
+
+    def test_threaded_fleet_gives_each_node_its_own_client_cache_and_prefix(self):
+        with (
+            mock.patch.object(Path, "write_text") as write_text,
+            mock.patch.object(mediamtx_collector.time, "time", return_value=100.0),
+        ):
+            mediamtx_collector._run_node_threads(
+                run_once=True, stop=threading.Event()
+            )
+
+        self.assert_nodes_collected_separately()
+        self.assertEqual(write_text.call_count, 2)
+
+    def test_async_fleet_runs_nodes_concurrently(self):
+        delay = 0.05
+        for node in self.nodes:
+            node.async_redis = AsyncFakeRedis(node.r)
+            node.async_snapshot_store = mediamtx_collector.AsyncRedisStore(
+                node.async_redis
+            )
+            node.async_mediamtx_client = SlowAsyncClient(node.mediamtx_client, delay)
+
+        async def run_fleet():
+            await asyncio.gather(*(
+                mediamtx_collector._run_node_async(node, True, 0.0)
+                for node in self.nodes
+            ))
+
+        with (
+            mock.patch.object(Path, "write_text"),
+            mock.patch.object(mediamtx_collector.time, "time", return_value=200.0),
+        ):
+            started = time.perf_counter()
+            asyncio.run(run_fleet())
+            elapsed = time.perf_counter() - started
+
+        self.assert_nodes_collected_separately()
+        # Four request rounds per node; nodes polled one after another would
+        # need eight.
+        self.assertLess(elapsed, 6 * delay)
+
+    def test_first_cycles_are_spread_across_one_interval(self):
+        offsets = [
+            mediamtx_collector._run_in_node(
+                node, mediamtx_collector._start_offset, index, len(self.nodes)
+            )
+            for index, node in enumerate(self.nodes)
+        ]
+
+        self.assertEqual(offsets, [1.0, 1.5])
+
+    def test_node_output_file_gets_node_suffix(self):
+        self.assertEqual(
+            mediamtx_collector.node_output_json_path(
+                "/tmp/mediamtx_streams.json", "edge-01"
+            ),
+            "/tmp/mediamtx_streams.edge-01.json",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
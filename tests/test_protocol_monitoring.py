@@ -84,7 +84,7 @@ class ProtocolClient:
     def build_url(self, endpoint):
         return f"http://localhost:9997{endpoint}"
 
-    def get_json(self, endpoint, params=None):
+    def get_json(self, endpoint, params=None, timeout=None):
         if endpoint == "/v3/info":
             return {"version": "1.20.0"}
         if endpoint == "/v3/paths/list":
@@ -163,7 +163,8 @@ class ProtocolCollectorTests(unittest.TestCase):
         self.assertEqual(rtsp["source"]["protocol_metrics"]["gauges"], {
             "jitter_ms": 4.5,
         })
-        self.assertEqual(rtsp["source"]["jitter_history"][-1]["ms"], 4.5)
+        self.assertEqual(rtsp["source"]["history_id"], "pub:rtsp:rtspSession:rtsp-pub")
+        self.assertNotIn("jitter_history", rtsp["source"])
         self.assertEqual(
             rtsp["readers"][0]["window_metrics"]["protocol_counters"]["10s"],
             {"discard": 1, "reported_loss": 3},
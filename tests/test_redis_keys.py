@@ -7,6 +7,7 @@ from bin.redis_keys import (
     connection_counter_key,
     connection_lifecycle_key,
     connection_history_key,
+    connection_rollup_key,
     hls_muxer_metric_key,
     path_metric_key,
     publisher_connection_key,
@@ -15,7 +16,12 @@ from bin.redis_keys import (
     reader_srt_health_key,
     rtmp_frame_discard_key,
     srt_counter_key,
+    stream_snapshot_channel_key,
+    stream_snapshot_delta_key,
     stream_snapshot_freshness_key,
+    stream_snapshot_index_key,
+    stream_snapshot_paths_key,
+    stream_snapshot_sequence_key,
 )
 
 
@@ -30,6 +36,27 @@ class SnapshotKeyTests(unittest.TestCase):
             "streams:latest:collected_at",
         )
 
+    def test_stream_sequence_and_delta_log_are_snapshot_sidecars(self):
+        self.assertEqual(
+            stream_snapshot_sequence_key("streams:latest"), "streams:latest:seq"
+        )
+        self.assertEqual(
+            stream_snapshot_delta_key("streams:latest"), "streams:latest:deltas"
+        )
+
+    def test_per_path_layout_keys_are_snapshot_sidecars(self):
+        self.assertEqual(
+            stream_snapshot_paths_key("streams:latest"), "streams:latest:paths"
+        )
+        self.assertEqual(
+            stream_snapshot_index_key("streams:latest"), "streams:latest:index"
+        )
+
+    def test_change_notifications_use_a_snapshot_channel(self):
+        self.assertEqual(
+            stream_snapshot_channel_key("streams:latest"), "streams:latest:events"
+        )
+
 
 class ConnectionStateKeyTests(unittest.TestCase):
     def test_history_wraps_existing_publisher_and_reader_identity(self):
@@ -45,6 +72,14 @@ class ConnectionStateKeyTests(unittest.TestCase):
             "history:rd:stream:srtConn:reader-id",
         )
 
+    def test_connection_rollup_keys_name_tier_and_identity(self):
+        publisher = publisher_connection_key("stream", "srtConn", "pub-id")
+
+        self.assertEqual(
+            connection_rollup_key(publisher, "10s"),
+            "rollup:10s:pub:stream:srtConn:pub-id",
+        )
+
     def test_publisher_bitrate_keys_match_existing_schema(self):
         base_key = publisher_connection_key("stream", "srtConn", "123")
         self.assertEqual(base_key, "pub:stream:srtConn:123")
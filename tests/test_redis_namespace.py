@@ -24,6 +24,10 @@ class RecordingRedis:
         self.calls.append(("get", (key,), kwargs))
         return "get-result"
 
+    def mget(self, keys):
+        self.calls.append(("mget", (keys,), {}))
+        return ["get-result" for _key in keys]
+
     def set(self, key, value, **kwargs):
         self.calls.append(("set", (key, value), kwargs))
         return "set-result"
@@ -66,6 +70,22 @@ class RecordingPipeline:
         return [True]
 
 
+class GenericRecordingPipeline:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((f"pipeline.{name}", args, kwargs))
+            return self
+
+        return record
+
+    def execute(self):
+        self.calls.append(("pipeline.execute", (), {}))
+        return []
+
+
 class RedisNamespaceTests(unittest.TestCase):
     def test_all_functional_key_families_receive_one_central_prefix(self):
         raw = RecordingRedis()
@@ -149,6 +169,39 @@ class RedisNamespaceTests(unittest.TestCase):
         ])
         self.assertEqual(raw.calls[-2][1][0].count(prefix), 1)
 
+    def test_pipeline_state_and_history_commands_are_namespaced(self):
+        raw = RecordingRedis()
+        raw.pipeline_instance = GenericRecordingPipeline(raw.calls)
+        client = NamespacedRedis(raw, "mediamtx-monitor:", "local")
+        prefix = "mediamtx-monitor:node:local:"
+
+        self.assertEqual(client.mget(["a", "b"]), ["get-result", "get-result"])
+        pipeline = client.pipeline()
+        for command in (
+            lambda: pipeline.get("state"),
+            lambda: pipeline.mget(["first", "second"]),
+            lambda: pipeline.delete("old"),
+            lambda: pipeline.zadd("history", {"sample": 1.0}),
+            lambda: pipeline.zremrangebyscore("history", "-inf", 0.5),
+            lambda: pipeline.expire("history", 120),
+            lambda: pipeline.zrangebyscore("history", 0, 10),
+        ):
+            self.assertIs(command(), pipeline)
+        pipeline.execute()
+
+        self.assertEqual(raw.calls, [
+            ("mget", ([f"{prefix}a", f"{prefix}b"],), {}),
+            ("pipeline", (), {}),
+            ("pipeline.get", (f"{prefix}state",), {}),
+            ("pipeline.mget", ([f"{prefix}first", f"{prefix}second"],), {}),
+            ("pipeline.delete", (f"{prefix}old",), {}),
+            ("pipeline.zadd", (f"{prefix}history", {"sample": 1.0}), {}),
+            ("pipeline.zremrangebyscore", (f"{prefix}history", "-inf", 0.5), {}),
+            ("pipeline.expire", (f"{prefix}history", 120), {}),
+            ("pipeline.zrangebyscore", (f"{prefix}history", 0, 10), {}),
+            ("pipeline.execute", (), {}),
+        ])
+
     def test_productive_redis_connections_are_immediately_namespaced(self):
         repository = Path(__file__).resolve().parents[1]
         for relative_path in (
@@ -2,12 +2,16 @@ import copy
 import json
 import unittest
 
+from bin import json_codec
 from bin.redis_store import (
     NamespacedRedis,
     RedisStore,
     SnapshotDecodeError,
     redis_key_prefix,
 )
+from bin.snapshot_delta import diff_snapshots, index_paths
+from tests.test_bitrate import FakePipeline
+from tests import test_srt_health
 
 
 class FakeRedis:
@@ -20,10 +24,16 @@ class FakeRedis:
     def get(self, key):
         return self.values.get(key)
 
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
     def set(self, key, value):
         self.set_calls.append((key, value))
         self.values[key] = value
 
+    def pipeline(self):
+        return FakePipeline(self)
+
     def zadd(self, key, members):
         values = self.sorted_sets.setdefault(key, {})
         values.update(members)
@@ -78,8 +88,9 @@ class RedisStoreTests(unittest.TestCase):
 
         self.assertEqual(self.redis.set_calls, [(
             "streams:latest",
-            json.dumps(snapshot),
+            json_codec.dumps(snapshot),
         )])
+        self.assertEqual(json.loads(self.redis.set_calls[0][1]), snapshot)
 
     def test_read_decodes_snapshot(self):
         self.redis.values["system:latest"] = json.dumps({
@@ -122,14 +133,28 @@ class RedisStoreTests(unittest.TestCase):
 
         self.assertEqual(snapshot, before)
 
+    def append(self, samples, *, timestamp, read_from=None):
+        """Write samples the way the collector's cycle pipeline does."""
+        pipeline = self.redis.pipeline()
+        read_keys = RedisStore.queue_history_samples(
+            pipeline,
+            samples,
+            timestamp=timestamp,
+            retention_seconds=65,
+            ttl_seconds=120,
+            read_keys=[key for key, _sample in samples],
+            read_from=read_from,
+        )
+        return RedisStore.decode_history_windows(read_keys, pipeline.execute())
+
     def test_history_is_ordered_time_trimmed_and_expires(self):
         for timestamp in (100.0, 130.0, 166.0):
-            self.store.append_history_sample(
-                "history:pub:stream:srtConn:id",
-                {"timestamp": timestamp, "transport_rtt_ms": timestamp},
+            self.append(
+                [(
+                    "history:pub:stream:srtConn:id",
+                    {"timestamp": timestamp, "transport_rtt_ms": timestamp},
+                )],
                 timestamp=timestamp,
-                retention_seconds=65,
-                ttl_seconds=120,
             )
 
         self.assertEqual(
@@ -147,24 +172,187 @@ class RedisStoreTests(unittest.TestCase):
             self.redis.expirations["history:pub:stream:srtConn:id"], 120
         )
 
+    def test_cycle_state_and_histories_are_read_in_one_pipeline(self):
+        self.redis.values["rd:x:prev_bytes"] = "10"
+        self.append(
+            [("history:rd:x", {"timestamp": 99.0, "tx_mbps": 1.0})],
+            timestamp=99.0,
+        )
+        self.redis.sorted_sets["history:broken"] = {"not-json": 99.0}
+
+        values, histories = self.store.read_cycle_state(
+            ["rd:x:prev_bytes", "rd:x:prev_ts"],
+            ["history:rd:x", "history:empty", "history:broken"],
+            from_timestamp=40.0,
+            to_timestamp=100.0,
+        )
+
+        self.assertEqual(values, ["10", None])
+        self.assertEqual(histories, {
+            "history:rd:x": [{"timestamp": 99.0, "tx_mbps": 1.0}],
+            "history:empty": [],
+        })
+
+    def test_append_reads_back_the_trimmed_window_in_the_same_pipeline(self):
+        self.append(
+            [("history:rd:x", {"timestamp": 10.0, "tx_mbps": 1.0})],
+            timestamp=10.0,
+        )
+
+        windows = self.append(
+            [("history:rd:x", {"timestamp": 80.0, "tx_mbps": 2.0})],
+            timestamp=80.0,
+            read_from=20.0,
+        )
+
+        self.assertEqual(windows, {
+            "history:rd:x": [{"timestamp": 80.0, "tx_mbps": 2.0}],
+        })
+        self.assertEqual(self.redis.expirations["history:rd:x"], 120)
+
+    def test_queued_appends_return_every_window_from_one_execute(self):
+        executions = []
+        original = self.redis.pipeline
+
+        def pipeline():
+            queued = original()
+            execute = queued.execute
+            queued.execute = lambda: executions.append(1) or execute()
+            return queued
+
+        self.redis.pipeline = pipeline
+        self.redis.sorted_sets["history:broken"] = {"not-json": 9.0}
+
+        windows = self.append(
+            [
+                ("history:a", {"timestamp": 10.0, "v": 1}),
+                ("history:b", {"timestamp": 10.0, "v": 2}),
+                ("history:broken", {"timestamp": 10.0, "v": 3}),
+            ],
+            timestamp=10.0,
+            read_from=0.0,
+        )
+
+        self.assertEqual(executions, [1])
+        self.assertEqual(windows, {
+            "history:a": [{"timestamp": 10.0, "v": 1}],
+            "history:b": [{"timestamp": 10.0, "v": 2}],
+        })
+
     def test_separate_history_keys_do_not_mix_samples(self):
-        self.store.append_history_sample(
-            "history:pub:stream:srtConn:first",
-            {"timestamp": 10.0, "transport_rtt_ms": 20},
+        self.append(
+            [(
+                "history:pub:stream:srtConn:first",
+                {"timestamp": 10.0, "transport_rtt_ms": 20},
+            )],
             timestamp=10.0,
-            retention_seconds=65,
-            ttl_seconds=120,
         )
-        self.store.append_history_sample(
-            "history:pub:stream:srtConn:second",
-            {"timestamp": 10.0, "transport_rtt_ms": 30},
+        self.append(
+            [(
+                "history:pub:stream:srtConn:second",
+                {"timestamp": 10.0, "transport_rtt_ms": 30},
+            )],
             timestamp=10.0,
-            retention_seconds=65,
-            ttl_seconds=120,
         )
 
         self.assertEqual(len(self.redis.sorted_sets), 2)
 
 
+class RecordingHashRedis(test_srt_health.FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.written_fields = []
+
+    def hset(self, key, mapping):
+        self.written_fields.extend(mapping)
+        super().hset(key, mapping)
+
+
+class PerPathSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = RecordingHashRedis()
+        self.store = RedisStore(self.redis)
+        self.published = None
+
+    def publish(self, snapshot):
+        current = index_paths(snapshot)
+        delta = diff_snapshots(self.published, current)
+        pipeline = self.redis.pipeline()
+        RedisStore.queue_path_changes(
+            pipeline,
+            "streams:latest:paths",
+            "streams:latest:index",
+            delta,
+            RedisStore.encode_paths(delta["upserted"]),
+        )
+        pipeline.execute()
+        self.published = current
+
+    def read(self, names=None):
+        _values, payloads, _deltas = self.store.read_stream_view(
+            [],
+            paths=("streams:latest:paths", "streams:latest:index"),
+            names=names,
+        )
+        return [json.loads(payload) for payload in payloads]
+
+    def test_only_changed_paths_are_rewritten(self):
+        self.publish([{"name": "a", "v": 1}, {"name": "b", "v": 1}])
+        self.redis.written_fields.clear()
+
+        self.publish([{"name": "b", "v": 2}, {"name": "a", "v": 1}])
+
+        self.assertEqual(self.redis.written_fields, ["b"])
+        self.assertEqual(self.read(), [{"name": "b", "v": 2}, {"name": "a", "v": 1}])
+
+    def test_removed_paths_leave_hash_and_index(self):
+        self.publish([{"name": "a"}, {"name": "b"}])
+        self.publish([{"name": "b"}])
+
+        self.assertEqual(list(self.redis.hashes["streams:latest:paths"]), ["b"])
+        self.assertEqual(self.read(), [{"name": "b"}])
+
+    def test_named_paths_are_read_without_the_rest(self):
+        self.publish([{"name": "a"}, {"name": "b"}, {"name": "c"}])
+
+        self.assertEqual(self.read(["c", "missing", "a"]), [
+            {"name": "c"}, {"name": "a"},
+        ])
+        self.assertEqual(self.read([]), [])
+
+    def test_delta_splices_the_encoded_paths(self):
+        snapshot = [{"name": "a", "v": 1}, {"name": "b", "v": "ä"}]
+        delta = {
+            "seq": 3,
+            **diff_snapshots(None, index_paths(snapshot)),
+        }
+        pipeline = self.redis.pipeline()
+        RedisStore.queue_delta(
+            pipeline,
+            "streams:latest:deltas",
+            delta,
+            RedisStore.encode_paths(snapshot),
+            max_length=5,
+        )
+        RedisStore.queue_path_document(
+            pipeline,
+            "streams:latest",
+            list(RedisStore.encode_paths(snapshot).values()),
+        )
+        pipeline.execute()
+
+        self.assertEqual(
+            json.loads(self.redis.lists["streams:latest:deltas"][0]), delta
+        )
+        self.assertEqual(json.loads(self.redis.values["streams:latest"]), snapshot)
+
+    def test_reset_replaces_stale_fields(self):
+        self.redis.hashes["streams:latest:paths"] = {"stale": "{}"}
+
+        self.publish([{"name": "a"}])
+
+        self.assertEqual(list(self.redis.hashes["streams:latest:paths"]), ["a"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+import threading
+import unittest
+
+from bin.reply_cache import ReplyCache
+
+
+class ReplyCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = ReplyCache()
+        self.loads = 0
+
+    def load(self, value="reply"):
+        def run():
+            self.loads += 1
+            return value
+
+        return run
+
+    def test_reply_is_reused_until_the_generation_changes(self):
+        self.assertEqual(self.cache.get(1, None, self.load("a")), "a")
+        self.assertEqual(self.cache.get(1, None, self.load("b")), "a")
+        self.assertEqual(self.cache.get(2, None, self.load("c")), "c")
+        self.assertEqual(self.loads, 2)
+
+    def test_keys_are_cached_separately_within_one_generation(self):
+        self.cache.get(1, None, self.load("full"))
+        self.assertEqual(self.cache.get(1, 7, self.load("delta")), "delta")
+        self.assertEqual(self.cache.get(1, None, self.load()), "full")
+
+    def test_late_load_of_an_older_generation_is_not_cached(self):
+        self.cache.get(2, None, self.load("new"))
+        self.cache.get(1, None, self.load("old"))
+
+        self.assertEqual(self.cache.get(2, None, self.load()), "new")
+        self.assertEqual(self.loads, 2)
+
+    def test_full_cache_evicts_the_least_recently_used_reply(self):
+        cache = ReplyCache(max_entries=2)
+        cache.get(1, "a", self.load("a"))
+        cache.get(1, "b", self.load("b"))
+        cache.get(1, "a", self.load())
+
+        self.assertEqual(cache.get(1, "c", self.load("c")), "c")
+        self.assertEqual(cache.get(1, "a", self.load()), "a")
+        self.assertEqual(cache.get(1, "b", self.load("b2")), "b2")
+        self.assertEqual(self.loads, 4)
+
+    def test_unknown_generation_is_never_cached(self):
+        self.cache.get(None, None, self.load())
+        self.cache.get(None, None, self.load())
+
+        self.assertEqual(self.loads, 2)
+
+    def test_concurrent_misses_share_one_load(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_load():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "reply"
+
+        results = []
+        owner = threading.Thread(
+            target=lambda: results.append(self.cache.get(None, None, slow_load))
+        )
+        owner.start()
+        started.wait(5)
+        waiters = [
+            threading.Thread(
+                target=lambda: results.append(self.cache.get(None, None, slow_load))
+            )
+            for _ in range(5)
+        ]
+        for thread in waiters:
+            thread.start()
+        release.set()
+        for thread in (owner, *waiters):
+            thread.join(5)
+
+        self.assertEqual(results, ["reply"] * 6)
+        self.assertEqual(len(calls), 1)
+
+    def test_failed_load_is_raised_and_not_cached(self):
+        def fail():
+            raise ConnectionError("redis down")
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get(1, None, fail)
+        self.assertEqual(self.cache.get(1, None, self.load("ok")), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import gzip
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+from bin import response_compression
+from bin.response_compression import (
+    CompressedBody,
+    CompressedFileCache,
+    negotiate_encoding,
+    variant_etag,
+)
+
+
+class NegotiationTests(unittest.TestCase):
+    def test_gzip_is_chosen_when_it_is_the_only_shared_coding(self):
+        with mock.patch.object(response_compression, "ENCODINGS", ("gzip",)):
+            self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+            self.assertEqual(negotiate_encoding("*"), "gzip")
+            self.assertIsNone(negotiate_encoding("deflate"))
+            self.assertIsNone(negotiate_encoding("gzip;q=0"))
+            self.assertIsNone(negotiate_encoding("identity, *;q=0"))
+            self.assertIsNone(negotiate_encoding(None))
+
+    def test_client_quality_wins_over_server_preference(self):
+        with mock.patch.object(response_compression, "ENCODINGS", ("br", "gzip")):
+            self.assertEqual(negotiate_encoding("gzip, br"), "br")
+            self.assertEqual(negotiate_encoding("gzip;q=1.0, br;q=0.5"), "gzip")
+            self.assertEqual(negotiate_encoding("GZIP;q=bad, br"), "br")
+
+    def test_each_coding_gets_its_own_etag(self):
+        self.assertEqual(variant_etag('"abc"', "gzip"), '"abc-gzip"')
+        self.assertEqual(variant_etag('W/"abc"', "br"), 'W/"abc-br"')
+        self.assertEqual(variant_etag('"abc"', None), '"abc"')
+
+
+class CompressedBodyTests(unittest.TestCase):
+    def test_variant_is_compressed_once_and_shared(self):
+        body = CompressedBody(b"x" * 4096)
+        calls = []
+        compressors = {"gzip": lambda data: calls.append(data) or gzip.compress(data)}
+
+        with mock.patch.dict(response_compression.COMPRESSORS, compressors):
+            first, encoding = body.encoded("gzip")
+            second, _ = body.encoded("gzip")
+
+        self.assertEqual(encoding, "gzip")
+        self.assertIs(first, second)
+        self.assertEqual(gzip.decompress(first), body.body)
+        self.assertEqual(len(calls), 1)
+
+    def test_small_or_unaccepted_bodies_stay_uncompressed(self):
+        self.assertEqual(CompressedBody(b"{}").encoded("gzip"), (b"{}", None))
+        self.assertEqual(CompressedBody(b"x" * 4096).encoded(None)[1], None)
+
+
+class CompressedFileCacheTests(unittest.TestCase):
+    def test_file_is_compressed_again_only_for_a_new_version(self):
+        cache = CompressedFileCache()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "main.js"
+            path.write_text("a" * 2048, encoding="utf-8")
+            first = cache.get(str(path), 1, 2048, "gzip")
+            path.write_text("b" * 2048, encoding="utf-8")
+            unchanged = cache.get(str(path), 1, 2048, "gzip")
+            updated = cache.get(str(path), 2, 2048, "gzip")
+
+        self.assertIs(first, unchanged)
+        self.assertEqual(gzip.decompress(updated), b"b" * 2048)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from unittest import mock
 
 from bin import mediamtx_collector
 from bin.redis_store import RedisStore
+from tests.test_collector_state import stored_rate_history
 from tests.test_srt_health import FakeRedis
 from tests.test_bitrate import FakePipeline
 
@@ -41,7 +42,7 @@ class RTMPPhaseClient:
     def build_url(self, endpoint):
         return f"http://localhost:9997{endpoint}"
 
-    def get_json(self, endpoint, params=None):
+    def get_json(self, endpoint, params=None, timeout=None):
         if endpoint == "/v3/info":
             return {"version": "1.20.0"}
         if endpoint == "/v3/paths/list":
@@ -105,13 +106,18 @@ class CollectorRTMPPhaseTests(unittest.TestCase):
 
         snapshot = self.collect(101.0)
         plain, secure = snapshot
-        self.assertEqual(plain["source"]["rate_history"], [
+        self.assertEqual(stored_rate_history(self.redis, plain["source"]), [
             {"timestamp": 100.0, "mbps": None},
             {"timestamp": 101.0, "mbps": 8.0},
         ])
-        self.assertEqual(plain["readers"][0]["rate_history"][-1]["mbps"], 4.0)
-        self.assertEqual(secure["source"]["rate_history"][-1]["mbps"], 16.0)
-        self.assertEqual(secure["readers"][0]["rate_history"][-1]["mbps"], 2.0)
+        for connection, mbps in (
+            (plain["readers"][0], 4.0),
+            (secure["source"], 16.0),
+            (secure["readers"][0], 2.0),
+        ):
+            self.assertEqual(
+                stored_rate_history(self.redis, connection)[-1]["mbps"], mbps
+            )
 
     def test_discard_deltas_are_reader_local_and_publisher_is_excluded(self):
         self.collect(200.0)
@@ -152,7 +158,10 @@ class CollectorRTMPPhaseTests(unittest.TestCase):
 
         reader = self.collect(302.0)[0]["readers"][0]
         self.assertEqual(reader["id"], "rtmp-reader-new")
-        self.assertEqual(reader["rate_history"], [{"timestamp": 302.0, "mbps": None}])
+        self.assertEqual(
+            stored_rate_history(self.redis, reader),
+            [{"timestamp": 302.0, "mbps": None}],
+        )
         self.assertEqual(reader["connection_stability"]["changes_60s"], 1)
         self.assertEqual(reader["connection_stability"]["seconds_since_last_change"], 0)
         self.assertIn("history:rd:plain:rtmpConn:rtmp-reader-a", self.redis.sorted_sets)
@@ -0,0 +1,266 @@
+import json
+from pathlib import Path
+import unittest
+from unittest import mock
+
+from bin import mediamtx_collector
+from bin.redis_keys import (
+    stream_snapshot_channel_key,
+    stream_snapshot_delta_key,
+    stream_snapshot_freshness_key,
+    stream_snapshot_paths_key,
+    stream_snapshot_sequence_key,
+)
+from bin.redis_store import RedisStore
+from bin.snapshot_delta import diff_snapshots, index_paths, merge_deltas
+from tests.test_collector_state import ReaderFanoutClient
+from tests.test_srt_health import FakeRedis
+
+
+def delta(seq, previous, current, *, reset=False):
+    return {
+        "seq": seq,
+        **diff_snapshots(
+            None if reset else index_paths(previous), index_paths(current)
+        ),
+    }
+
+
+class SnapshotDiffTests(unittest.TestCase):
+    def test_diff_reports_added_changed_and_removed_paths(self):
+        previous = [{"name": "a", "v": 1}, {"name": "b", "v": 1}]
+        current = [{"name": "b", "v": 2}, {"name": "c", "v": 1}]
+
+        changes = diff_snapshots(index_paths(previous), index_paths(current))
+
+        self.assertFalse(changes["reset"])
+        self.assertEqual(changes["upserted"], current)
+        self.assertEqual(changes["removed"], ["a"])
+        self.assertEqual(changes["names"], ["b", "c"])
+
+    def test_unknown_base_is_a_reset_with_every_path(self):
+        current = [{"name": "a"}]
+
+        changes = diff_snapshots(None, index_paths(current))
+
+        self.assertTrue(changes["reset"])
+        self.assertEqual(changes["upserted"], current)
+
+
+class MergeDeltasTests(unittest.TestCase):
+    def setUp(self):
+        self.s0 = [{"name": "a", "v": 0}, {"name": "b", "v": 0}]
+        self.s1 = [{"name": "a", "v": 1}, {"name": "b", "v": 0}]
+        self.s2 = [{"name": "b", "v": 0}, {"name": "c", "v": 0}]
+        self.s3 = [{"name": "b", "v": 3}, {"name": "c", "v": 0}]
+        self.log = [
+            delta(13, self.s2, self.s3),
+            delta(12, self.s1, self.s2),
+            delta(11, self.s0, self.s1),
+            delta(10, [], self.s0, reset=True),
+        ]
+
+    def apply(self, snapshot, merged):
+        paths = index_paths(snapshot)
+        for name in merged["removed"]:
+            paths.pop(name, None)
+        paths.update(index_paths(merged["upserted"]))
+        return [paths[name] for name in merged["names"]]
+
+    def test_merged_changes_rebuild_the_newest_snapshot(self):
+        for since, snapshot in ((10, self.s0), (11, self.s1), (12, self.s2)):
+            merged = merge_deltas(self.log, since)
+
+            self.assertEqual(merged["seq"], 13)
+            self.assertEqual(self.apply(snapshot, merged), self.s3)
+
+    def test_path_removed_then_readded_is_an_upsert(self):
+        log = [
+            delta(3, self.s2, self.s0),
+            delta(2, self.s0, self.s2),
+        ]
+
+        merged = merge_deltas(log, 1)
+
+        self.assertEqual(merged["removed"], ["c"])
+        self.assertEqual(self.apply(self.s0, merged), self.s0)
+
+    def test_current_client_receives_no_changes(self):
+        merged = merge_deltas(self.log, 13)
+
+        self.assertEqual(merged["upserted"], [])
+        self.assertEqual(merged["removed"], [])
+
+    def test_ranges_the_log_cannot_describe_need_a_full_snapshot(self):
+        self.assertIsNone(merge_deltas([], 1))
+        # Trimmed, across a reset, from a later run, and with a gap.
+        self.assertIsNone(merge_deltas(self.log[:2], 10))
+        self.assertIsNone(merge_deltas(self.log, 9))
+        self.assertIsNone(merge_deltas(self.log, 14))
+        self.assertIsNone(merge_deltas([self.log[0], self.log[2]], 10))
+
+
+class IdleClient(ReaderFanoutClient):
+    def get_json(self, endpoint, params=None, timeout=None):
+        if endpoint == "/v3/paths/list":
+            return {"items": [{"name": "idle", "readers": []}]}
+        return super().get_json(endpoint, params=params)
+
+
+class CollectorDeltaTests(unittest.TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        mediamtx_collector.r = self.redis
+        mediamtx_collector.snapshot_store = RedisStore(self.redis)
+        mediamtx_collector.mediamtx_client = ReaderFanoutClient(2)
+        mediamtx_collector.reset_poll_cache()
+        self.store = RedisStore(self.redis)
+        self.delta_key = stream_snapshot_delta_key(mediamtx_collector.REDIS_KEY)
+        self.seq_key = stream_snapshot_sequence_key(mediamtx_collector.REDIS_KEY)
+
+    def read_deltas(self):
+        """Delta log as ``/api/streams?since=`` reads it, newest first."""
+        return self.store.read_stream_view([], delta_key=self.delta_key)[2]
+
+    def collect(self, timestamp):
+        with (
+            mock.patch.object(Path, "write_text"),
+            mock.patch.object(mediamtx_collector.time, "time", return_value=timestamp),
+        ):
+            mediamtx_collector.collect_and_store()
+        return json.loads(self.redis.values[mediamtx_collector.REDIS_KEY])
+
+    def test_changed_cycles_append_numbered_deltas(self):
+        client = mediamtx_collector.mediamtx_client
+        first = self.collect(100.0)
+        client.bytes = 1_000_000
+        current = self.collect(101.0)
+
+        deltas = self.read_deltas()
+        self.assertEqual([item["seq"] for item in deltas], [100_002, 100_001])
+        self.assertTrue(deltas[1]["reset"])
+        self.assertEqual(self.store.read_snapshot(self.seq_key), 100_002)
+
+        merged = merge_deltas(deltas, 100_001)
+        self.assertEqual(merged["upserted"], current)
+        self.assertNotEqual(first, current)
+
+    def test_changed_paths_are_encoded_once_for_document_hash_and_delta(self):
+        client = mediamtx_collector.mediamtx_client
+        self.collect(100.0)
+        client.bytes = 1_000_000
+        with mock.patch.object(
+            RedisStore, "encode_paths", wraps=RedisStore.encode_paths
+        ) as encode_paths:
+            self.collect(101.0)
+
+        (entries,), _kwargs = encode_paths.call_args_list[0]
+        texts = RedisStore.encode_paths(entries)
+        paths_key = stream_snapshot_paths_key(mediamtx_collector.REDIS_KEY)
+        self.assertEqual(encode_paths.call_count, 1)
+        self.assertEqual(self.redis.hashes[paths_key], texts)
+        self.assertEqual(
+            self.redis.values[mediamtx_collector.REDIS_KEY],
+            "[" + ",".join(texts.values()) + "]",
+        )
+        self.assertIn(
+            "[" + ",".join(texts.values()) + "]", self.redis.lists[self.delta_key][0]
+        )
+
+    def test_snapshot_and_freshness_are_written_in_one_transaction(self):
+        executed = []
+        pipeline = self.redis.pipeline
+
+        def recording_pipeline():
+            queued = pipeline()
+            execute = queued.execute
+
+            def record():
+                executed.append([args[0] for _name, args, _ in queued.operations])
+                return execute()
+
+            queued.execute = record
+            return queued
+
+        with mock.patch.object(self.redis, "pipeline", recording_pipeline):
+            self.collect(100.0)
+
+        key = mediamtx_collector.REDIS_KEY
+        writes = [keys for keys in executed if key in keys]
+        self.assertEqual(len(writes), 1)
+        self.assertIn(stream_snapshot_freshness_key(key), writes[0])
+        self.assertIn(self.seq_key, writes[0])
+        self.assertIn(stream_snapshot_channel_key(key), writes[0])
+
+    def test_every_write_is_announced_with_its_sequence(self):
+        mediamtx_collector.mediamtx_client = IdleClient(0)
+        for timestamp in (100.0, 101.0, 102.0):
+            self.collect(timestamp)
+
+        channel = stream_snapshot_channel_key(mediamtx_collector.REDIS_KEY)
+        self.assertEqual(
+            [(name, json.loads(message)) for name, message in self.redis.published],
+            [
+                (channel, {"seq": 100_001, "collected_at": 100.0}),
+                (channel, {"seq": 100_002, "collected_at": 101.0}),
+                (channel, {"seq": 100_002, "collected_at": 102.0}),
+            ],
+        )
+
+    def test_unchanged_cycle_keeps_the_sequence(self):
+        mediamtx_collector.mediamtx_client = IdleClient(0)
+        for timestamp in (100.0, 101.0, 102.0):
+            self.collect(timestamp)
+
+        # The first bitrate appears in cycle two; cycle three changes nothing.
+        self.assertEqual(len(self.read_deltas()), 2)
+        self.assertEqual(self.store.read_snapshot(self.seq_key), 100_002)
+
+    def test_restart_continues_the_stored_sequence_with_a_reset(self):
+        self.collect(100.0)
+        mediamtx_collector.reset_poll_cache()
+        self.collect(101.0)
+
+        newest = self.read_deltas()[0]
+        self.assertEqual(newest["seq"], 100_002)
+        self.assertTrue(newest["reset"])
+        self.assertIsNone(
+            merge_deltas(self.read_deltas(), 100_001)
+        )
+
+    def test_delta_log_is_bounded(self):
+        client = mediamtx_collector.mediamtx_client
+        with mock.patch.dict(mediamtx_collector.COLLECTOR_CFG, {"delta_log_length": 2}):
+            for offset in range(4):
+                client.bytes = offset * 1_000_000
+                self.collect(100.0 + offset)
+
+        self.assertEqual(
+            [item["seq"] for item in self.read_deltas()],
+            [100_004, 100_003],
+        )
+
+    def test_hash_layout_skips_the_single_key_and_unchanged_paths(self):
+        mediamtx_collector.mediamtx_client = IdleClient(0)
+        paths_key = stream_snapshot_paths_key(mediamtx_collector.REDIS_KEY)
+        with mock.patch.dict(
+            mediamtx_collector.REDIS_CFG, {"snapshot_layout": "hash"}
+        ):
+            for timestamp in (100.0, 101.0):
+                self.collect_without_key(timestamp)
+            self.redis.hashes[paths_key]["idle"] = "unchanged"
+            self.collect_without_key(102.0)
+
+        self.assertNotIn(mediamtx_collector.REDIS_KEY, self.redis.values)
+        self.assertEqual(self.redis.hashes[paths_key], {"idle": "unchanged"})
+
+    def collect_without_key(self, timestamp):
+        with (
+            mock.patch.object(Path, "write_text"),
+            mock.patch.object(mediamtx_collector.time, "time", return_value=timestamp),
+        ):
+            mediamtx_collector.collect_and_store()
+
+
+if __name__ == "__main__":
+    unittest.main()
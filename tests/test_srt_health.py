@@ -16,14 +16,25 @@ class FakeRedis:
         self.values = {}
         self.expirations = {}
         self.sorted_sets = {}
+        self.lists = {}
+        self.hashes = {}
+        self.published = []
 
     def get(self, key):
         return self.values.get(key)
 
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
     def set(self, key, value, ex=None):
         self.values[key] = str(value)
         self.expirations[key] = ex
 
+    def pipeline(self):
+        from tests.test_bitrate import FakePipeline
+
+        return FakePipeline(self)
+
     def ping(self):
         return True
 
@@ -47,10 +58,47 @@ class FakeRedis:
             if float(minimum) <= score <= float(maximum)
         ]
 
+    def lpush(self, key, *values):
+        self.lists.setdefault(key, [])[:0] = [str(value) for value in reversed(values)]
+
+    def ltrim(self, key, start, end):
+        values = self.lists.get(key, [])
+        self.lists[key] = values[start:None if end == -1 else end + 1]
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:None if end == -1 else end + 1]
+
+    def delete(self, *keys):
+        for key in keys:
+            for store in (self.values, self.sorted_sets, self.lists, self.hashes):
+                store.pop(key, None)
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(
+            {field: str(value) for field, value in mapping.items()}
+        )
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
 
 class FakeMediaMTXClient:
     def __init__(self, get_json):
-        self.get_json = get_json
+        self._get_json = get_json
+
+    def get_json(self, endpoint, params=None, timeout=None):
+        return self._get_json(endpoint, params)
 
     def build_url(self, endpoint):
         return f"http://localhost:9997{endpoint}"
@@ -247,7 +295,7 @@ class CollectorSrtHealthIntegrationTests(unittest.TestCase):
                         "direction": "IN",
                         "remoteAddr": "192.0.2.20:1935",
                     },
-                    "rate_history": [{"timestamp": mock.ANY, "mbps": None}],
+                    "history_id": "pub:rtmp-path:rtmpConn:rtmp-publisher",
                     "connection_stability": {
                         "changes_60s": 0,
                         "last_change_at": None,
@@ -275,7 +323,7 @@ class CollectorSrtHealthIntegrationTests(unittest.TestCase):
                             "direction": "OUT",
                             "remoteAddr": "192.0.2.21:1935",
                         },
-                        "rate_history": [{"timestamp": mock.ANY, "mbps": None}],
+                        "history_id": "rd:rtmp-path:rtmpConn:rtmp-reader",
                         "connection_stability": {
                             "changes_60s": 0,
                             "last_change_at": None,
@@ -407,15 +455,28 @@ class CollectorSrtHealthIntegrationTests(unittest.TestCase):
         )
 
     def test_history_write_failure_does_not_block_current_snapshot(self):
-        with mock.patch.object(
-            self.collector.snapshot_store,
-            "append_history_sample",
-            side_effect=ConnectionError("history unavailable"),
+        with (
+            mock.patch.object(
+                self.collector.snapshot_store,
+                "read_cycle_state",
+                side_effect=ConnectionError("history unavailable"),
+            ),
+            mock.patch.object(
+                RedisStore,
+                "queue_history_sample",
+                side_effect=ConnectionError("history unavailable"),
+            ) as queue_history_sample,
         ):
             snapshot = self.collect()
 
+        queue_history_sample.assert_called()
+        self.assertIn(self.collector.REDIS_KEY, self.redis.values)
+        self.assertFalse(
+            [key for key in self.redis.sorted_sets if key.startswith("history:")]
+        )
         self.assertEqual(snapshot[0]["name"], "srt-path")
         self.assertNotIn("window_metrics", snapshot[0]["source"])
+        self.assertEqual(snapshot[0]["source"]["srt_health"]["rx_mbps"], 4.0)
 
     def test_native_zero_rate_is_distinct_from_unavailable_rate(self):
         self.srt_details[0]["mbpsReceiveRate"] = 0
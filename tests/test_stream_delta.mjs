@@ -0,0 +1,34 @@
+import assert from "node:assert/strict";
+import test from "node:test";
+
+import {mergeStreamsReply} from "../static/js/stream-delta.js";
+
+const camera = {name: "camera", readers: []};
+const studio = {name: "studio", readers: []};
+
+test("full replies replace the stream list", () => {
+  assert.deepEqual(mergeStreamsReply([camera], {delta: false, streams: [studio]}), [studio]);
+  assert.deepEqual(mergeStreamsReply([camera], {streams: []}), []);
+});
+
+test("delta replies update, remove, and order streams by name list", () => {
+  const changed = {name: "camera", readers: [{id: "r1"}]};
+  const merged = mergeStreamsReply([camera, {name: "old"}, studio], {
+    delta: true,
+    upserted: [changed],
+    removed: ["old"],
+    names: ["studio", "camera"],
+  });
+
+  assert.deepEqual(merged, [studio, changed]);
+  assert.equal(merged[0], studio);
+});
+
+test("delta replies that do not fit the local list request a full reply", () => {
+  assert.equal(mergeStreamsReply([camera], {
+    delta: true,
+    upserted: [],
+    removed: [],
+    names: ["camera", "studio"],
+  }), null);
+});
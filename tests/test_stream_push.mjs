@@ -0,0 +1,146 @@
+import assert from "node:assert/strict";
+import test, {mock} from "node:test";
+
+import {fetchStreamsFromApi, subscribeToStreams} from "../static/js/api.js";
+
+class FakeEventSource {
+  static last = null;
+
+  constructor(url) {
+    this.url = url;
+    this.listeners = {};
+    this.closed = false;
+    FakeEventSource.last = this;
+  }
+
+  close() {
+    this.closed = true;
+  }
+
+  addEventListener(type, listener) {
+    this.listeners[type] = listener;
+  }
+
+  async emit(reply) {
+    await this.listeners.streams({data: JSON.stringify(reply)});
+  }
+}
+
+function okReply(body) {
+  return {ok: true, status: 200, headers: {get: () => null}, json: async () => body};
+}
+
+const camera = {name: "camera", readers: []};
+const studio = {name: "studio", readers: []};
+
+test("without EventSource support the caller keeps polling", () => {
+  delete globalThis.EventSource;
+  assert.equal(subscribeToStreams(() => {}, () => {}), null);
+});
+
+test("pushed deltas extend the list received by polling", async () => {
+  globalThis.fetch = async () => okReply({delta: false, seq: 4, streams: [camera]});
+  await fetchStreamsFromApi();
+
+  globalThis.EventSource = FakeEventSource;
+  const results = [];
+  let errors = 0;
+  subscribeToStreams(result => results.push(result), () => errors++);
+  const source = FakeEventSource.last;
+  assert.equal(source.url, "/api/streams/events?since=4");
+
+  await source.emit({
+    delta: true, seq: 5, since: 4, upserted: [studio], removed: [],
+    names: ["camera", "studio"], collected_at: 10,
+  });
+  assert.deepEqual(results[0], {delta: true, seq: 5, collected_at: 10, streams: [camera, studio]});
+
+  mock.timers.enable({apis: ["setTimeout"]});
+  try {
+    source.onerror();
+    assert.equal(errors, 1);
+    assert.ok(source.closed);
+    mock.timers.tick(2000);
+    assert.equal(FakeEventSource.last.url, "/api/streams/events?since=5");
+  } finally {
+    mock.timers.reset();
+  }
+});
+
+test("a stale stream is closed and resubscribed with a growing delay", async () => {
+  globalThis.fetch = async () => okReply({delta: false, seq: 7, streams: [camera]});
+  await fetchStreamsFromApi();
+  globalThis.EventSource = FakeEventSource;
+  let errors = 0;
+  mock.timers.enable({apis: ["setTimeout"]});
+  mock.method(Math, "random", () => 1);
+  try {
+    const subscription = subscribeToStreams(() => {}, () => errors++);
+    const first = FakeEventSource.last;
+    first.listeners.stale();
+    assert.ok(first.closed);
+
+    mock.timers.tick(1999);
+    assert.equal(FakeEventSource.last, first);
+    mock.timers.tick(1);
+    const second = FakeEventSource.last;
+    assert.notEqual(second, first);
+    assert.equal(second.url, "/api/streams/events?since=7");
+
+    second.listeners.stale();
+    mock.timers.tick(3999);
+    assert.equal(FakeEventSource.last, second);
+    mock.timers.tick(1);
+    assert.notEqual(FakeEventSource.last, second);
+    assert.equal(errors, 2);
+
+    subscription.close();
+    assert.ok(FakeEventSource.last.closed);
+  } finally {
+    mock.timers.reset();
+    mock.restoreAll();
+  }
+});
+
+test("a push delta that does not fit is replaced by a full reply", async () => {
+  globalThis.fetch = async () => okReply({delta: false, seq: 9, streams: [studio]});
+  globalThis.EventSource = FakeEventSource;
+  const results = [];
+  subscribeToStreams(result => results.push(result), () => {});
+
+  await FakeEventSource.last.emit({
+    delta: true, seq: 9, since: 8, upserted: [], removed: [], names: ["unknown"],
+  });
+  assert.deepEqual(results[0].streams, [studio]);
+});
+
+test("polling sends the last ETag and reports unchanged replies with their age", async () => {
+  const requests = [];
+  const replies = [
+    {status: 200, etag: '"full"', body: {delta: false, seq: 3, streams: [camera]}},
+    {status: 200, etag: '"d3"', body: {delta: true, seq: 3, since: 3, upserted: [], removed: [], names: ["camera"]}},
+    {status: 304, etag: '"d3"', collectedAt: "12.5"},
+  ];
+  globalThis.fetch = async (url, options) => {
+    requests.push({url, headers: options.headers, cache: options.cache});
+    const reply = replies.shift();
+    return {
+      ok: reply.status === 200,
+      status: reply.status,
+      headers: {get: name => (name === "ETag" ? reply.etag : reply.collectedAt ?? null)},
+      json: async () => reply.body,
+    };
+  };
+
+  const full = await fetchStreamsFromApi();
+  const unchangedDelta = await fetchStreamsFromApi();
+  const notModified = await fetchStreamsFromApi();
+
+  assert.deepEqual(full.streams, [camera]);
+  assert.deepEqual(unchangedDelta.streams, [camera]);
+  assert.deepEqual(notModified, {unchanged: true, collected_at: 12.5});
+  assert.equal(requests[1].url, "/api/streams?since=3");
+  assert.deepEqual(requests[1].headers, {});
+  assert.deepEqual(requests[2].headers, {"If-None-Match": '"d3"'});
+  assert.ok(requests.every(request => request.cache === "no-store"));
+});
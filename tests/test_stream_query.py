@@ -0,0 +1,129 @@
+import unittest
+
+from bin.mediamtx_model import connection_protocol
+from bin.stream_query import (
+    PROFILES,
+    StreamQuery,
+    compile_projection,
+    index_stream,
+    parse_fields,
+    project,
+    select_streams,
+)
+
+
+def stream(name, source=None, readers=()):
+    return index_stream(
+        {
+            "name": name,
+            "source": {"type": source, "id": "1" if source else None},
+            "readers": [
+                {"type": reader, "id": str(index)}
+                for index, reader in enumerate(readers)
+            ],
+        },
+        f'{{"name":"{name}"}}',
+    )
+
+
+class ConnectionProtocolTests(unittest.TestCase):
+    def test_connection_and_source_types_map_to_protocols(self):
+        self.assertEqual(connection_protocol("srtConn"), "srt")
+        self.assertEqual(connection_protocol("rtspsSession"), "rtsps")
+        self.assertEqual(connection_protocol("webRTCSession"), "webrtc")
+        self.assertEqual(connection_protocol("rtmpSource"), "rtmp")
+        self.assertIsNone(connection_protocol(None))
+
+
+class StreamQueryTests(unittest.TestCase):
+    def setUp(self):
+        self.streams = [
+            stream("live/cam1", "srtConn", ["webRTCSession"]),
+            stream("live/cam2", "rtmpConn", ["srtConn", "hlsSession"]),
+            stream("studio/main", "rtspSession"),
+            stream("idle"),
+        ]
+
+    def names(self, **query):
+        selected = select_streams(self.streams, StreamQuery(**query))
+        return [item.name for item in selected]
+
+    def test_empty_query_keeps_snapshot_order(self):
+        self.assertEqual(
+            self.names(), ["live/cam1", "live/cam2", "studio/main", "idle"]
+        )
+
+    def test_prefix_and_glob_filter_path_names(self):
+        self.assertEqual(self.names(prefix="live/"), ["live/cam1", "live/cam2"])
+        self.assertEqual(self.names(match="*/cam[2-9]"), ["live/cam2"])
+        self.assertEqual(self.names(match="Live/*"), [])
+
+    def test_protocols_match_any_connection_unless_a_role_is_given(self):
+        srt = frozenset({"srt"})
+        self.assertEqual(self.names(protocols=srt), ["live/cam1", "live/cam2"])
+        self.assertEqual(self.names(protocols=srt, role="publisher"), ["live/cam1"])
+        self.assertEqual(self.names(protocols=srt, role="reader"), ["live/cam2"])
+
+    def test_role_alone_requires_that_connection(self):
+        self.assertEqual(self.names(role="reader"), ["live/cam1", "live/cam2"])
+        self.assertEqual(
+            self.names(role="publisher"), ["live/cam1", "live/cam2", "studio/main"]
+        )
+
+
+class ProjectionTests(unittest.TestCase):
+    entry = {
+        "name": "live/cam1",
+        "tracks": ["H264"],
+        "tracks2": [{"codec": "H264"}],
+        "source": {
+            "type": "srtConn",
+            "id": "s1",
+            "bitrate_mbps": 4.2,
+            "details": {"bytesReceived": 1},
+            "srt_health": {"state": "ok"},
+        },
+        "readers": [
+            {"type": "webRTCSession", "id": "r1", "bitrate_mbps": 4.1,
+             "jitter_history": [1, 2]},
+            {"type": "srtConn", "id": "r2", "bitrate_mbps": 4.0},
+        ],
+    }
+
+    def test_dotted_fields_are_applied_to_objects_and_list_items(self):
+        plan = compile_projection(parse_fields("name, readers.id,source.type,"))
+
+        self.assertEqual(project(self.entry, plan), {
+            "name": "live/cam1",
+            "readers": [{"id": "r1"}, {"id": "r2"}],
+            "source": {"type": "srtConn"},
+        })
+
+    def test_whole_object_wins_over_deeper_fields_in_either_order(self):
+        for fields in (("source", "source.type"), ("source.type", "source")):
+            with self.subTest(fields=fields):
+                projected = project(self.entry, compile_projection(fields))
+                self.assertEqual(projected, {"source": self.entry["source"]})
+
+    def test_missing_fields_are_omitted_and_plans_are_reused(self):
+        fields = ("name", "hls_muxer.path")
+
+        self.assertEqual(project(self.entry, compile_projection(fields)), {
+            "name": "live/cam1",
+        })
+        self.assertIs(compile_projection(fields), compile_projection(fields))
+
+    def test_profiles_drop_raw_details_and_histories(self):
+        summary = project(self.entry, compile_projection(PROFILES["summary"]))
+        srt = project(self.entry, compile_projection(PROFILES["srt"]))
+
+        self.assertNotIn("details", summary["source"])
+        self.assertNotIn("jitter_history", summary["readers"][0])
+        self.assertEqual(summary["readers"][1]["bitrate_mbps"], 4.0)
+        self.assertEqual(srt["source"]["srt_health"], {"state": "ok"})
+        self.assertNotIn("tracks2", srt)
+        self.assertIsNone(PROFILES["full"])
+
+
+if __name__ == "__main__":
+    unittest.main()